@@ -0,0 +1,169 @@
+# required packages:
+# aiohttp
+
+import asyncio
+import aiohttp
+
+
+# LINE Notify APIのasyncio版クライアント(イベントループをブロックしない)
+class AsyncLineNotify(object):
+	# LINE Notify API URL
+	API_URL: str = "https://notify-api.line.me/api/notify"
+
+	def __init__(
+			self,
+			token: str = "",
+			debug: bool = False,
+			# 以下オプション(同時送信数・コネクションプール・タイムアウト)
+			max_concurrency: int = 10,
+			pool_size: int = 100,
+			connect_timeout: float = 5.0,
+			total_timeout: float = 15.0,
+			# APIのURL(省略時はAPI_URL、試験時はスタブサーバのURLを指定)
+			api_url: str | None = None
+	) -> None:
+		self.token: str = token
+		self.api_url: str = api_url if (isinstance(api_url, str) and len(api_url) > 0) else self.API_URL
+
+		# 入力チェック(debug)
+		self.debug: bool = False
+		if isinstance(debug, bool):
+			self.debug = debug
+
+		self.max_concurrency: int = max(1, max_concurrency)
+		self.pool_size: int = pool_size
+		self.timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+
+		# セッション・セマフォはイベントループ上で生成する
+		self.__session: aiohttp.ClientSession | None = None
+		self.__semaphore: asyncio.Semaphore | None = None
+
+	# async with文対応
+	async def __aenter__(self) -> "AsyncLineNotify":
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		await self.close()
+		return False
+
+	# セッション(プール中の接続)を閉じる
+	async def close(self) -> None:
+		if self.__session is not None:
+			await self.__session.close()
+			self.__session = None
+		self.__semaphore = None
+
+	def set_token(self, token: str) -> None:
+		# 入力チェック
+		if not isinstance(token, str):
+			print("Invalid Token.")
+			return
+		elif len(token) == 0:
+			print("Empty Token.")
+			return
+
+		self.token = token
+
+	# LINE notify APIを使って通知
+	async def send_message(
+			self,
+			message: str,
+			token: str | None = None,
+			timeout: float | None = None,
+			debug: bool | None = None
+	) -> aiohttp.ClientResponse | None:
+		# トークン取得
+		_token: str = self.__get_api_token(token=token)
+		if _token == "":
+			print("Invalid Token.")
+			return None
+
+		# 入力チェック
+		if (not isinstance(message, str)) or (message == ""):
+			print("Empty Message.")
+			return None
+
+		_session: aiohttp.ClientSession = self.__get_session()
+		# timeout=Noneを明示するとタイムアウトなしになるため、指定がない場合は渡さない(セッションの設定を使う)
+		_options: dict = {}
+		if timeout is not None:
+			# 接続のタイムアウトはセッションの設定を引き継ぐ
+			_options["timeout"] = aiohttp.ClientTimeout(total=timeout, connect=self.timeout.connect)
+
+		# 同時送信数を制限
+		async with self.__get_semaphore():
+			async with _session.post(
+					url=self.api_url,
+					headers={"Authorization": "Bearer" + " " + _token},
+					data={"message": message},
+					**_options
+			) as _response:
+				# 本文を読み込んでから接続をプールに戻す
+				await _response.read()
+
+		# debug
+		if self.__get_debug(debug=debug):
+			print("response : " + str(_response.status) + " " + await _response.text())
+
+		return _response
+
+	# 複数のトークンに同じメッセージを同時送信(結果はトークンの順番で返却、失敗時は例外オブジェクト)
+	async def broadcast(
+			self,
+			message: str,
+			tokens: list[str],
+			timeout: float | None = None
+	) -> list[aiohttp.ClientResponse | BaseException | None]:
+		return await asyncio.gather(
+			*[self.send_message(message=message, token=_token, timeout=timeout) for _token in tokens],
+			return_exceptions=True
+		)
+
+	# (トークン, メッセージ)の組を同時送信
+	async def send_messages(
+			self,
+			messages: list[tuple[str, str]],
+			timeout: float | None = None
+	) -> list[aiohttp.ClientResponse | BaseException | None]:
+		return await asyncio.gather(
+			*[
+				self.send_message(message=_message, token=_token, timeout=timeout)
+				for _token, _message in messages
+			],
+			return_exceptions=True
+		)
+
+	# セッション取得(初回のみ生成)
+	def __get_session(self) -> aiohttp.ClientSession:
+		if (self.__session is None) or self.__session.closed:
+			self.__session = aiohttp.ClientSession(
+				connector=aiohttp.TCPConnector(limit=self.pool_size),
+				timeout=self.timeout
+			)
+		return self.__session
+
+	# セマフォ取得(初回のみ生成)
+	def __get_semaphore(self) -> asyncio.Semaphore:
+		if self.__semaphore is None:
+			self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+		return self.__semaphore
+
+	# トークンを入力チェック(引数がなければメンバ変数を返す)
+	def __get_api_token(
+			self,
+			token: str | None = None
+	) -> str:
+		if isinstance(token, str) and len(token) > 0:
+			return token
+		elif isinstance(self.token, str) and len(self.token) > 0:
+			return self.token
+		return ""
+
+	# debugオンオフ取得
+	def __get_debug(
+			self,
+			debug: bool | None
+	) -> bool:
+		if isinstance(debug, bool):
+			return debug
+		return self.debug
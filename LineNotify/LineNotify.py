@@ -1,23 +1,258 @@
+# required packages:
+# requests
+# Pillow (画像の縮小・再エンコードを行う場合のみ)
+
 from requests import Response
-from requests import post
+from requests import Session
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+from typing import Iterator
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import stat
+import tempfile
+import threading
+import time
+import uuid
+
+
+# デバッグ用のトレース出力先(DEBUGレベル、debug=Trueの場合はINFOレベルで出力)
+_logger: logging.Logger = logging.getLogger("LineNotify")
+
+
+# ログ出力時に初めて文字列化する(ログが出力されない場合は整形しない)
+class TraceMessage(object):
+	def __init__(self, trace: dict):
+		self.trace: dict = trace
+
+	def __str__(self) -> str:
+		return "LineNotify trace " + json.dumps(self.trace, ensure_ascii=False, default=str)
+
+
+# 直近の遅延(最大max_samples件、単位ns)の集計
+class LatencySamples(object):
+	def __init__(self, max_samples: int = 10000):
+		self.__samples: deque = deque(maxlen=max(1, max_samples))
+		self.__lock: threading.Lock = threading.Lock()
+
+	# 計測値を記録
+	def record(self, value_ns: int) -> None:
+		with self.__lock:
+			self.__samples.append(max(0, value_ns))
+
+	# 記録した値(古い順)
+	def get_samples(self) -> list[int]:
+		with self.__lock:
+			return list(self.__samples)
+
+	# 集計(ミリ秒)
+	def get_summary(self) -> dict[str, float]:
+		_sorted: list[int] = sorted(self.get_samples())
+		if len(_sorted) == 0:
+			return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+		def _percentile(percentile: float) -> float:
+			return _sorted[min(len(_sorted) - 1, int(len(_sorted) * percentile / 100.0))] / 1_000_000
+
+		return {
+			"count": len(_sorted),
+			"mean_ms": sum(_sorted) / len(_sorted) / 1_000_000,
+			"p50_ms": _percentile(50),
+			"p90_ms": _percentile(90),
+			"p99_ms": _percentile(99),
+			"max_ms": _sorted[-1] / 1_000_000
+		}
+
+	def reset(self) -> None:
+		with self.__lock:
+			self.__samples.clear()
+
+
+# multipart/form-dataの本文をファイルから少しずつ読み出すストリーム
+# (画像全体をメモリに読み込まずに送信するため、requestsのdataに渡して使う)
+# Pushbullet/PushbulletWrapper.pyのMultipartUploadStreamと同じ形式(各ディレクトリを単体で使えるよう共有しない)
+# 本文の組み立て・read()を修正する場合は両方を合わせること
+class MultipartFileStream(object):
+	# 1回に読み込むサイズ
+	CHUNK_SIZE: int = 64 * 1024
+
+	def __init__(
+			self,
+			fields: dict[str, str],
+			file_field_name: str,
+			file_path: str,
+			file_name: str | None = None,
+			content_type: str = "application/octet-stream"
+	):
+		self.boundary: str = uuid.uuid4().hex
+		self.content_type: str = "multipart/form-data; boundary=" + self.boundary
+		self.__file_path: str = file_path
+
+		# ファイルより前の部分(テキスト項目とファイルのヘッダー)
+		_parts: list[bytes] = []
+		for _name, _value in fields.items():
+			_parts.append(
+				(
+					"--%s\r\n"
+					"Content-Disposition: form-data; name=\"%s\"\r\n\r\n"
+					"%s\r\n" % (self.boundary, _name, _value)
+				).encode("utf-8")
+			)
+		_parts.append(
+			(
+				"--%s\r\n"
+				"Content-Disposition: form-data; name=\"%s\"; filename=\"%s\"\r\n"
+				"Content-Type: %s\r\n\r\n" % (
+					self.boundary, file_field_name, file_name or os.path.basename(file_path), content_type
+				)
+			).encode("utf-8")
+		)
+		self.__head: bytes = b"".join(_parts)
+		# ファイルより後の部分
+		self.__tail: bytes = ("\r\n--%s--\r\n" % self.boundary).encode("utf-8")
+		self.__length: int = len(self.__head) + os.path.getsize(file_path) + len(self.__tail)
+
+		self.__file = None
+		self.__stage: int = 0
+		self.__buffer: bytes = b""
+
+	# Content-Lengthの計算用
+	def __len__(self) -> int:
+		return self.__length
+
+	def __iter__(self) -> Iterator[bytes]:
+		while True:
+			_chunk: bytes = self.read(self.CHUNK_SIZE)
+			if len(_chunk) == 0:
+				return
+			yield _chunk
+
+	# size分読み込み(ヘッダー→ファイル→終端の順)
+	def read(self, size: int = -1) -> bytes:
+		if (size is None) or (size < 0):
+			size = self.__length
+		_data: bytes = self.__buffer
+		self.__buffer = b""
+		while len(_data) < size:
+			_chunk: bytes = self.__next_chunk()
+			if len(_chunk) == 0:
+				break
+			_data += _chunk
+		if len(_data) > size:
+			self.__buffer = _data[size:]
+			_data = _data[:size]
+		return _data
+
+	def close(self) -> None:
+		if self.__file is not None:
+			self.__file.close()
+			self.__file = None
+
+	def __next_chunk(self) -> bytes:
+		if self.__stage == 0:
+			self.__stage = 1
+			self.__file = open(self.__file_path, "rb")
+			return self.__head
+		elif self.__stage == 1:
+			_chunk: bytes = self.__file.read(self.CHUNK_SIZE)
+			if len(_chunk) > 0:
+				return _chunk
+			self.close()
+			self.__stage = 2
+			return self.__tail
+		return b""
 
 
 class LineNotify(object):
 	# LINE Notify API URL
 	API_URL: str = "https://notify-api.line.me/api/notify"
+	# 1メッセージの最大文字数
+	MAX_MESSAGE_LENGTH: int = 1000
+	# 送信できる画像の最大サイズ(縦横のピクセル数・バイト数)
+	# これを超える画像はPillowで縮小・再エンコードしてから送信する
+	MAX_IMAGE_DIMENSION: int = 2048
+	MAX_IMAGE_BYTES: int = 10 * 1024 * 1024
+	# 縮小した画像の保存先(ファイルのハッシュ値で使い回す)
+	# ユーザー毎のキャッシュディレクトリ(本人のみ読み書きできる0o700)、他のユーザーに画像を読ませない・差し替えさせない
+	IMAGE_CACHE_DIRECTORY: str = os.path.join(
+		os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+		"LineNotify",
+		"image_cache"
+	)
+
+	# (ファイルパス, 更新日時, サイズ) -> 送信用の画像パス
+	__prepared_image_paths: dict[tuple, str] = {}
+	__prepared_image_lock: threading.Lock = threading.Lock()
+	# IMAGE_CACHE_DIRECTORYが使えない場合の保存先(プロセス毎にmkdtempで作成)
+	__fallback_image_cache_directory: str | None = None
 
 	def __init__(
 			self,
 			token: str,
-			debug: bool = False
+			debug: bool = False,
+			# 以下オプション(コネクションプール・タイムアウト)
+			pool_maxsize: int = 10,
+			connect_timeout: float = 5.0,
+			read_timeout: float = 10.0,
+			max_retries: int = 0,
+			# APIのURL(省略時はAPI_URL、試験時はスタブサーバのURLを指定)
+			api_url: str | None = None,
+			# 送信毎の各フェーズの時間を記録する
+			collect_latency: bool = False
 	) -> None:
 		self.token: str = token
+		self.api_url: str = api_url if (isinstance(api_url, str) and len(api_url) > 0) else self.API_URL
 
 		# 入力チェック(debug)
 		self.debug: bool = False
 		if isinstance(debug, bool):
 			self.debug: bool = debug
 
+		# フェーズ(ttfb/download/total) -> 直近の遅延
+		# 接続・TLSハンドシェイクは個別に計測せず、新しい接続の場合はttfbに含まれる
+		self.collect_latency: bool = collect_latency
+		self.__latencies: dict[str, LatencySamples] = {
+			_phase: LatencySamples() for _phase in ("ttfb", "download", "total")
+		}
+
+		# タイムアウト(接続, 読み込み)
+		self.timeout: tuple[float, float] = (connect_timeout, read_timeout)
+
+		# 接続を使い回すためのセッション(keep-alive)
+		self.__session: Session = Session()
+		_adapter: HTTPAdapter = HTTPAdapter(
+			pool_connections=1,
+			pool_maxsize=pool_maxsize,
+			max_retries=max_retries
+		)
+		self.__session.mount("https://", _adapter)
+		self.__session.mount("http://", _adapter)
+
+	# デストラクタ
+	def __del__(self):
+		try:
+			self.close()
+		except Exception:
+			pass
+
+	# with文対応
+	def __enter__(self) -> "LineNotify":
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.close()
+		return False
+
+	# セッション(プール中の接続)を閉じる
+	def close(self) -> None:
+		_session: Session | None = getattr(self, "_LineNotify__session", None)
+		if _session is not None:
+			_session.close()
+
 	def set_token(self, token: str) -> None:
 		# 入力チェック
 		if not isinstance(token, str):
@@ -47,55 +282,84 @@ class LineNotify(object):
 			print("Empty Message.")
 			return
 
-		_url: str = self.__get_api_url()
-		# debug
-		self.__print_debug_message(
-			debug_message="url : " + _url,
-			debug=debug
-		)
-
-		_header: dict | None = self.__get_api_header()
-		# debug
-		self.__print_debug_message(
-			debug_message="header : " + str(_header),
-			debug=debug
-		)
-
+		_header: dict | None = self.__get_api_header(token=_token)
 		_payload: dict | None = self.__get_api_payload(message=message)
-		# debug
-		self.__print_debug_message(
-			debug_message="payload : " + str(_payload),
-			debug=debug
-		)
-
-		_response: Response | None = None
-		if (_header is not None) and (_payload is not None):
-			# リクエスト送信
-			_response = post(
-				url=self.API_URL,
-				headers=self.__get_api_header(),
-				params=self.__get_api_payload(message=message)
-			)
-			# debug
-			self.__print_debug_message(
-				debug_message="response : " + _response.text,
-				debug=debug
-			)
-		else:
+		if (_header is None) or (_payload is None):
 			print("Invalid header or payload.")
 			return
 
-		return _response
+		# リクエスト送信(プール中の接続を再利用)
+		return self.__post(header=_header, data=_payload, payload=_payload, debug=debug)
+
+	# 複数のトークンに同じメッセージを同時送信
+	# 戻り値はトークン -> レスポンス(入力エラー時はNone、通信エラー等は例外オブジェクト)
+	# 同時送信数はmax_workersとコネクションプールの大きさ(pool_maxsize)の小さい方に抑えられる
+	def broadcast(
+			self,
+			message: str,
+			tokens: list[str],
+			max_workers: int = 8,
+			debug: bool | None = None
+	) -> dict[str, Response | Exception | None]:
+		# 重複したトークンには1度だけ送信(順番は維持)
+		_tokens: list[str] = list(dict.fromkeys(
+			_token for _token in tokens if isinstance(_token, str) and len(_token) > 0
+		))
+		_results: dict[str, Response | Exception | None] = {}
+		if len(_tokens) == 0:
+			return _results
+
+		_max_workers: int = max(1, min(max_workers, len(_tokens)))
+		with ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="LineNotify-broadcast") as _executor:
+			_futures: dict[str, Future] = {
+				_token: _executor.submit(self.send_message, message=message, token=_token, debug=debug)
+				for _token in _tokens
+			}
+			for _token, _future in _futures.items():
+				try:
+					_results[_token] = _future.result()
+				except Exception as e:
+					_results[_token] = e
 
-	# 画像送信
+		return _results
+
+	# 画像送信(ファイルは分割して読み込みながら送信)
 	def send_image(
 			self,
 			message: str,
 			image_file_path: str,
+			token: str | None = None,
 			debug: bool | None = None
 	) -> Response | None:
-		# TODO
-		return None
+		# トークン取得
+		_token: str = self.__get_api_token(token=token)
+		if _token == "":
+			print("Invalid Token.")
+			return
+
+		# 入力チェック
+		if message == "":
+			print("Empty Message.")
+			return
+
+		_payload: dict | None = self.__get_api_payload(message=message)
+		_file: dict | None = self.__get_api_file(file_path=image_file_path)
+		if (_payload is None) or (_file is None):
+			print("Invalid payload or image file.")
+			return
+
+		_stream: MultipartFileStream = MultipartFileStream(
+			fields=_payload,
+			file_field_name="imageFile",
+			file_path=_file["path"],
+			file_name=_file["name"],
+			content_type=_file["content_type"]
+		)
+		_header: dict | None = self.__get_api_header(token=_token, content_type=_stream.content_type)
+		try:
+			return self.__post(header=_header, data=_stream, payload=_payload, debug=debug, file=_file)
+		finally:
+			_stream.close()
 
 	# スタンプ送信
 	def send_sticker(
@@ -103,10 +367,117 @@ class LineNotify(object):
 			message: str,
 			sticker_package_id: int,
 			sticker_id: int,
+			token: str | None = None,
 			debug: bool | None = None
 	) -> Response | None:
-		# TODO
-		return None
+		# トークン取得
+		_token: str = self.__get_api_token(token=token)
+		if _token == "":
+			print("Invalid Token.")
+			return
+
+		_header: dict | None = self.__get_api_header(token=_token)
+		_payload: dict | None = self.__get_api_payload(
+			message=message,
+			sticker_package_id=sticker_package_id,
+			sticker_id=sticker_id
+		)
+		if (_header is None) or (_payload is None) or ("stickerId" not in _payload):
+			print("Invalid header or payload.")
+			return
+
+		return self.__post(header=_header, data=_payload, payload=_payload, debug=debug)
+
+	# 各フェーズの遅延の集計(ミリ秒、collect_latency=Trueまたはトレース出力時のみ記録)
+	def get_latency_summary(self, reset: bool = False) -> dict[str, dict[str, float]]:
+		_summary: dict[str, dict[str, float]] = {}
+		for _phase, _latency in self.__latencies.items():
+			_summary[_phase] = _latency.get_summary()
+			if reset:
+				_latency.reset()
+		return _summary
+
+	# フェーズ毎の直近の遅延(ns、古い順)
+	def get_latency_samples(self, phase: str) -> list[int]:
+		_latency: LatencySamples | None = self.__latencies.get(phase)
+		return _latency.get_samples() if _latency is not None else []
+
+	# リクエスト送信(トレースが無効な場合は送信のみ)
+	def __post(
+			self,
+			header: dict,
+			data: dict | MultipartFileStream,
+			payload: dict,
+			debug: bool | None,
+			file: dict | None = None
+	) -> Response:
+		_debug: bool = self.__get_debug(debug=debug)
+		if not (_debug or self.collect_latency or _logger.isEnabledFor(logging.DEBUG)):
+			return self.__session.post(url=self.__get_api_url(), headers=header, data=data, timeout=self.timeout)
+
+		_start_ns: int = time.perf_counter_ns()
+		_response: Response = self.__session.post(
+			url=self.__get_api_url(),
+			headers=header,
+			data=data,
+			timeout=self.timeout
+		)
+		_total_ns: int = time.perf_counter_ns() - _start_ns
+
+		# elapsedは送信開始からヘッダー受信まで(新しい接続の場合は接続・TLSハンドシェイクを含む)
+		_elapsed_ns: int = int(_response.elapsed.total_seconds() * 1_000_000_000)
+		_timings: dict[str, int] = {
+			"ttfb": _elapsed_ns,
+			"download": max(0, _total_ns - _elapsed_ns),
+			"total": _total_ns
+		}
+		for _phase, _value_ns in _timings.items():
+			self.__latencies[_phase].record(_value_ns)
+
+		_level: int = logging.INFO if _debug else logging.DEBUG
+		# ロギングが未設定でdebug=Trueの場合は標準出力へ
+		_print: bool = _debug and (not _logger.hasHandlers())
+		if _print or _logger.isEnabledFor(_level):
+			_trace: dict = {
+				"url": self.__get_api_url(),
+				"status": _response.status_code,
+				"timings_ms": {
+					_phase: _value_ns / 1_000_000
+					for _phase, _value_ns in _timings.items()
+				},
+				"rate_limit": {
+					_name: _response.headers.get(_name)
+					for _name in (
+						"X-RateLimit-Limit", "X-RateLimit-Remaining",
+						"X-RateLimit-ImageLimit", "X-RateLimit-ImageRemaining", "X-RateLimit-Reset"
+					)
+					if _name in _response.headers
+				},
+				"request_headers": self.__redact_headers(header),
+				# 本文はメッセージの長さのみ
+				"payload": {
+					_key: (len(_value) if _key == "message" else _value) for _key, _value in payload.items()
+				},
+				"response": _response.text[:200]
+			}
+			if file is not None:
+				_trace["file"] = {"name": file["name"], "content_type": file["content_type"]}
+			if _print:
+				print(TraceMessage(_trace))
+			else:
+				_logger.log(_level, "%s", TraceMessage(_trace), extra={"line_notify_trace": _trace})
+
+		return _response
+
+	# ヘッダーの秘密情報を伏せる
+	@staticmethod
+	def __redact_headers(headers: dict | None) -> dict:
+		_headers: dict = {}
+		for _name, _value in (headers or {}).items():
+			if _name.lower() in ("authorization", "proxy-authorization", "cookie"):
+				_value = str(_value).split(" ", 1)[0] + " <redacted>" if " " in str(_value) else "<redacted>"
+			_headers[_name] = _value
+		return _headers
 
 	# トークンを入力チェック(引数がなければメンバ変数を返す)
 	def __get_api_token(
@@ -129,14 +500,14 @@ class LineNotify(object):
 
 	# API引数取得用メソッド
 	# APIのURL
-	@classmethod
-	def __get_api_url(cls) -> str:
-		return cls.API_URL
+	def __get_api_url(self) -> str:
+		return self.api_url
 
 	# ヘッダー
 	def __get_api_header(
 			self,
-			token: str | None = None
+			token: str | None = None,
+			content_type: str = "application/x-www-form-urlencoded"
 	) -> dict | None:
 		# トークン取得
 		_token: str = self.__get_api_token(token=token)
@@ -146,7 +517,7 @@ class LineNotify(object):
 			return
 
 		# content type
-		_content_type: str = "application/x-www-form-urlencoded"
+		_content_type: str = content_type
 
 		# authorization
 		authorization: str = "Bearer" + " " + _token
@@ -192,11 +563,129 @@ class LineNotify(object):
 
 		return _payload
 
-	# ファイル
-	@staticmethod
-	def __get_api_file(file_path: str) -> dict | None:
-		# TODO
-		return None
+	# ファイル(送信する画像のパス・ファイル名・Content-Type)
+	# 上限を超える画像は縮小・再エンコードしたものを返す
+	@classmethod
+	def __get_api_file(cls, file_path: str) -> dict | None:
+		# 入力チェック
+		if (not isinstance(file_path, str)) or (not os.path.isfile(file_path)):
+			return
+
+		_path: str | None = cls.__get_prepared_image_path(file_path=file_path)
+		if _path is None:
+			return
+
+		_content_type: str | None = mimetypes.guess_type(_path)[0]
+		if _content_type not in ("image/png", "image/jpeg"):
+			return
+
+		return {
+			"path": _path,
+			"name": os.path.splitext(os.path.basename(file_path))[0] + os.path.splitext(_path)[1],
+			"content_type": _content_type
+		}
+
+	# 送信用の画像パス取得(縮小済みの画像があれば使い回す)
+	@classmethod
+	def __get_prepared_image_path(cls, file_path: str) -> str | None:
+		_stat: os.stat_result = os.stat(file_path)
+		_key: tuple = (os.path.abspath(file_path), _stat.st_mtime_ns, _stat.st_size)
+		with cls.__prepared_image_lock:
+			_path: str | None = cls.__prepared_image_paths.get(_key)
+		if (_path is not None) and os.path.isfile(_path):
+			return _path
+
+		_path = cls.__prepare_image(file_path=file_path, file_size=_stat.st_size)
+		if _path is not None:
+			with cls.__prepared_image_lock:
+				cls.__prepared_image_paths[_key] = _path
+		return _path
+
+	# 上限を超える画像を縮小・再エンコード(上限以内ならそのまま)
+	@classmethod
+	def __prepare_image(cls, file_path: str, file_size: int) -> str | None:
+		try:
+			from PIL import Image
+		except ImportError:
+			# Pillowがない場合は上限以内の画像だけ送信する
+			if file_size <= cls.MAX_IMAGE_BYTES:
+				return file_path
+			print("Image is too large and Pillow is not installed.")
+			return
+
+		# 画像として読み込めないファイル(UnidentifiedImageErrorを含む)は送信しない
+		try:
+			with Image.open(file_path) as _image:
+				_format: str = (_image.format or "").upper()
+				if (
+						(file_size <= cls.MAX_IMAGE_BYTES)
+						and (max(_image.size) <= cls.MAX_IMAGE_DIMENSION)
+						and (_format in ("PNG", "JPEG"))
+				):
+					return file_path
+
+				# 縮小済みの画像はファイルの内容のハッシュ値で保存
+				_hash = hashlib.sha256()
+				with open(file_path, "rb") as _file:
+					for _chunk in iter(lambda: _file.read(1024 * 1024), b""):
+						_hash.update(_chunk)
+				_hash.update(("%d:%d" % (cls.MAX_IMAGE_DIMENSION, cls.MAX_IMAGE_BYTES)).encode("utf-8"))
+				_cache_directory: str = cls.__get_image_cache_directory()
+				for _extension in (".png", ".jpg"):
+					_cache_path: str = os.path.join(_cache_directory, _hash.hexdigest() + _extension)
+					if os.path.isfile(_cache_path):
+						return _cache_path
+
+				_resized: Image.Image = _image.copy()
+				_resized.thumbnail((cls.MAX_IMAGE_DIMENSION, cls.MAX_IMAGE_DIMENSION))
+		except OSError:
+			print("Invalid image file.")
+			return
+
+		# PNGのまま上限以内に収まらなければJPEGで画質を下げながら保存
+		# 本人のみ読み書きできる一時ファイル(0o600)に保存してから置き換える
+		_fd, _temp_path = tempfile.mkstemp(prefix=_hash.hexdigest() + ".", suffix=".tmp", dir=_cache_directory)
+		os.close(_fd)
+		_extension: str = ".png"
+		if _format == "PNG":
+			_resized.save(_temp_path, format="PNG", optimize=True)
+		if (_format != "PNG") or (os.path.getsize(_temp_path) > cls.MAX_IMAGE_BYTES):
+			_extension = ".jpg"
+			_rgb: Image.Image = _resized.convert("RGB")
+			for _quality in (90, 80, 70, 60, 50):
+				_rgb.save(_temp_path, format="JPEG", quality=_quality, optimize=True)
+				if os.path.getsize(_temp_path) <= cls.MAX_IMAGE_BYTES:
+					break
+			else:
+				os.remove(_temp_path)
+				print("Image could not be reduced below the size limit.")
+				return
+
+		_cache_path = os.path.join(_cache_directory, _hash.hexdigest() + _extension)
+		os.replace(_temp_path, _cache_path)
+		return _cache_path
+
+	# 縮小した画像の保存先を取得(本人所有・0o700のディレクトリのみ使う)
+	# 既存のディレクトリが他のユーザーの所有・シンボリックリンクの場合は、プロセス毎の一時ディレクトリを使う
+	@classmethod
+	def __get_image_cache_directory(cls) -> str:
+		_directory: str = cls.IMAGE_CACHE_DIRECTORY
+		try:
+			os.makedirs(_directory, mode=0o700, exist_ok=True)
+			_stat: os.stat_result = os.lstat(_directory)
+			if stat.S_ISDIR(_stat.st_mode) and ((not hasattr(os, "getuid")) or (_stat.st_uid == os.getuid())):
+				# umask等でグループ・他のユーザーに権限がある場合は本人のみに戻す
+				if stat.S_IMODE(_stat.st_mode) & 0o077:
+					os.chmod(_directory, 0o700)
+				return _directory
+		except OSError:
+			pass
+
+		with cls.__prepared_image_lock:
+			if cls.__fallback_image_cache_directory is None:
+				print("Image cache directory is not private, using a temporary directory.")
+				cls.__fallback_image_cache_directory = tempfile.mkdtemp(prefix="LineNotify_image_cache_")
+			return cls.__fallback_image_cache_directory
 
 	# debugオンオフ取得
 	def __get_debug(
@@ -211,22 +700,3 @@ class LineNotify(object):
 			_debug = self.debug
 
 		return _debug
-
-	# デバッグ用メッセージ表示
-	def __print_debug_message(
-			self,
-			debug_message: str,
-			debug: bool | None
-	) -> None:
-		# 入力チェック
-		if not isinstance(debug_message, str):
-			return
-		elif len(debug_message) == 0:
-			return
-
-		# デバッグオンオフ取得
-		_debug: bool = self.__get_debug(debug=debug)
-
-		# デバッグ用メッセージ表示処理
-		if _debug:
-			print(debug_message)
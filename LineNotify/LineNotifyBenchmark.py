@@ -0,0 +1,104 @@
+# LineNotifyの送信遅延ベンチマーク(ローカルのスタブサーバに対して実行)
+# 毎回接続するrequests.postと、接続を使い回すLineNotifyのセッションを比較する
+# 実行例:
+#   python LineNotify/LineNotifyBenchmark.py --requests 500 --output line_notify_benchmark.json
+
+from LineNotify import LineNotify
+from LineNotifyStubServer import LineNotifyStubServer
+from datetime import datetime
+import argparse
+import json
+import platform
+import sys
+import time
+
+import requests
+
+
+# 遅延の集計
+def summarize_latencies(latencies_ns: list[int]) -> dict:
+	_sorted: list[int] = sorted(latencies_ns)
+
+	def _percentile(percentile: float) -> float:
+		_index: int = min(len(_sorted) - 1, int(len(_sorted) * percentile / 100.0))
+		return _sorted[_index] / 1_000_000
+
+	_total_ns: int = sum(_sorted)
+	return {
+		"requests": len(_sorted),
+		"requests_per_sec": len(_sorted) / (_total_ns / 1_000_000_000) if _total_ns > 0 else 0.0,
+		"latency_ms": {
+			"mean": _total_ns / len(_sorted) / 1_000_000,
+			"p50": _percentile(50),
+			"p90": _percentile(90),
+			"p99": _percentile(99),
+			"max": _sorted[-1] / 1_000_000
+		}
+	}
+
+
+# 毎回新しい接続で送信(従来の実装相当)
+def run_without_pool(api_url: str, token: str, message: str, count: int) -> list[int]:
+	_latencies_ns: list[int] = []
+	for _ in range(count):
+		_start_ns: int = time.perf_counter_ns()
+		requests.post(
+			url=api_url,
+			headers={"Authorization": "Bearer " + token},
+			data={"message": message}
+		)
+		_latencies_ns.append(time.perf_counter_ns() - _start_ns)
+	return _latencies_ns
+
+
+# セッションの接続を使い回して送信
+def run_with_pool(api_url: str, token: str, message: str, count: int) -> list[int]:
+	_latencies_ns: list[int] = []
+	with LineNotify(token=token, api_url=api_url) as _line_notify:
+		for _ in range(count):
+			_start_ns: int = time.perf_counter_ns()
+			_line_notify.send_message(message=message)
+			_latencies_ns.append(time.perf_counter_ns() - _start_ns)
+	return _latencies_ns
+
+
+def main(argv: list[str] | None = None) -> int:
+	_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="LineNotify benchmark")
+	_parser.add_argument("--requests", type=int, default=500)
+	_parser.add_argument("--message", type=str, default="benchmark message")
+	_parser.add_argument("--output", type=str, default="line_notify_benchmark.json")
+	_args: argparse.Namespace = _parser.parse_args(argv)
+
+	_token: str = "benchmark-token"
+	with LineNotifyStubServer() as _server:
+		# ウォームアップ
+		run_with_pool(_server.api_url, _token, _args.message, 10)
+
+		_results: list[dict] = []
+		_result: dict = {"mode": "requests.post (new connection per call)"}
+		_result.update(summarize_latencies(run_without_pool(_server.api_url, _token, _args.message, _args.requests)))
+		_results.append(_result)
+
+		_result = {"mode": "LineNotify session (pooled keep-alive)"}
+		_result.update(summarize_latencies(run_with_pool(_server.api_url, _token, _args.message, _args.requests)))
+		_results.append(_result)
+
+	_report: dict = {
+		"meta": {
+			"timestamp": datetime.now().isoformat(),
+			"python": sys.version,
+			"platform": platform.platform(),
+			"args": vars(_args)
+		},
+		"results": _results
+	}
+	with open(_args.output, "w", encoding="utf-8") as _file:
+		json.dump(_report, _file, indent=2)
+
+	for _result in _results:
+		print(json.dumps(_result, ensure_ascii=False))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,174 @@
+from LineNotify import LineNotify
+from requests import Response
+import atexit
+import threading
+import time
+import traceback
+
+
+# 短時間に連続するメッセージをトークン毎にまとめて送信する
+# 集計期間(window_seconds)が過ぎるか、1000文字に達した時点で1通にまとめて送る
+# 例:
+#   with LineNotifyCoalescer(line_notify=LineNotify(token="...")) as coalescer:
+#       coalescer.send_message(message="...")
+class LineNotifyCoalescer(object):
+	def __init__(
+			self,
+			line_notify: LineNotify,
+			window_seconds: float = 5.0,
+			max_message_length: int = LineNotify.MAX_MESSAGE_LENGTH,
+			separator: str = "\n"
+	):
+		self.line_notify: LineNotify = line_notify
+		self.window_seconds: float = window_seconds
+		self.max_message_length: int = max_message_length
+		self.separator: str = separator
+
+		self.__condition: threading.Condition = threading.Condition()
+		# トークン -> [メッセージ一覧, 文字数, 送信期限]
+		self.__buffers: dict[str, list] = {}
+		# 文字数の上限に達して送信待ちのもの((トークン, メッセージ))
+		self.__ready: list[tuple[str, str]] = []
+		self.__stats: dict[str, int] = {"received": 0, "sent": 0, "failed": 0}
+		self.__closed: bool = False
+
+		self.__thread: threading.Thread = threading.Thread(
+			target=self.__run,
+			name="LineNotifyCoalescer",
+			daemon=True
+		)
+		self.__thread.start()
+		# 終了時に残りを送信
+		atexit.register(self.close)
+
+	# with文対応
+	def __enter__(self) -> "LineNotifyCoalescer":
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.close()
+		return False
+
+	# メッセージを溜める(送信はバックグラウンドで行う)
+	def send_message(
+			self,
+			message: str,
+			token: str | None = None
+	) -> None:
+		if (not isinstance(message, str)) or (message == ""):
+			print("Empty Message.")
+			return
+		_token: str = token if (isinstance(token, str) and len(token) > 0) else self.line_notify.token
+
+		with self.__condition:
+			if self.__closed:
+				print("LineNotifyCoalescer is closed.")
+				return
+			self.__stats["received"] += 1
+
+			for _chunk in self.split_message(message=message, max_length=self.max_message_length):
+				_buffer: list | None = self.__buffers.get(_token)
+				if (_buffer is not None) and (
+						_buffer[1] + len(self.separator) + len(_chunk) > self.max_message_length
+				):
+					# 入りきらない場合は溜まっている分を先に送る
+					self.__ready.append((_token, self.separator.join(_buffer[0])))
+					del self.__buffers[_token]
+					_buffer = None
+				if _buffer is None:
+					self.__buffers[_token] = [[_chunk], len(_chunk), time.monotonic() + self.window_seconds]
+				else:
+					_buffer[0].append(_chunk)
+					_buffer[1] += len(self.separator) + len(_chunk)
+			self.__condition.notify()
+
+	# 溜まっている分をすぐに送信
+	def flush(self) -> None:
+		with self.__condition:
+			self.__move_to_ready(force=True)
+			self.__condition.notify()
+		self.__send_ready()
+
+	# 停止(残りは送信してから終了)
+	def close(self) -> None:
+		with self.__condition:
+			if self.__closed:
+				return
+			self.__closed = True
+			self.__condition.notify()
+		atexit.unregister(self.close)
+		if self.__thread is not threading.current_thread():
+			self.__thread.join()
+		self.flush()
+
+	# 送信件数等の統計
+	def get_stats(self) -> dict[str, int]:
+		with self.__condition:
+			_stats: dict[str, int] = dict(self.__stats)
+			_stats["pending"] = sum(len(_buffer[0]) for _buffer in self.__buffers.values())
+			return _stats
+
+	# 最大文字数以内に分割(改行→空白の順に区切りを探し、なければ文字数で切る)
+	@staticmethod
+	def split_message(message: str, max_length: int = LineNotify.MAX_MESSAGE_LENGTH) -> list[str]:
+		_chunks: list[str] = []
+		_rest: str = message
+		while len(_rest) > max_length:
+			_index: int = _rest.rfind("\n", 0, max_length + 1)
+			if _index <= 0:
+				_index = max(_rest.rfind(" ", 0, max_length + 1), _rest.rfind("\t", 0, max_length + 1))
+			if _index <= 0:
+				_chunks.append(_rest[:max_length])
+				_rest = _rest[max_length:]
+				continue
+			_chunks.append(_rest[:_index])
+			_rest = _rest[_index + 1:]
+		if len(_rest) > 0:
+			_chunks.append(_rest)
+		return _chunks
+
+	# 送信期限を過ぎたもの(force=Trueなら全て)を送信待ちへ移す
+	def __move_to_ready(self, force: bool) -> None:
+		_now: float = time.monotonic()
+		for _token in list(self.__buffers.keys()):
+			_messages, _length, _deadline = self.__buffers[_token]
+			if force or (_deadline <= _now):
+				self.__ready.append((_token, self.separator.join(_messages)))
+				del self.__buffers[_token]
+
+	# 送信スレッド
+	def __run(self) -> None:
+		while True:
+			with self.__condition:
+				while (len(self.__ready) == 0) and (not self.__closed):
+					self.__move_to_ready(force=False)
+					if len(self.__ready) > 0:
+						break
+					_timeout: float | None = None
+					if len(self.__buffers) > 0:
+						_timeout = max(0.0, min(_buffer[2] for _buffer in self.__buffers.values()) - time.monotonic())
+					self.__condition.wait(timeout=_timeout)
+				_closed: bool = self.__closed
+			self.__send_ready()
+			if _closed:
+				return
+
+	# 送信待ちを送信
+	def __send_ready(self) -> None:
+		while True:
+			with self.__condition:
+				if len(self.__ready) == 0:
+					return
+				_token, _message = self.__ready.pop(0)
+
+			_response: Response | None = None
+			try:
+				_response = self.line_notify.send_message(message=_message, token=_token)
+			except Exception:
+				traceback.print_exc()
+
+			with self.__condition:
+				if (_response is not None) and (_response.status_code == 200):
+					self.__stats["sent"] += 1
+				else:
+					self.__stats["failed"] += 1
@@ -0,0 +1,277 @@
+from LineNotify import LineNotify
+from requests import Response, RequestException
+from concurrent.futures import Future, InvalidStateError
+from collections import deque
+import heapq
+import random
+import threading
+import time
+
+
+# LINE Notifyへの送信をバックグラウンドで行うディスパッチャ
+# トークン毎にレスポンスヘッダー(X-RateLimit-*)から残り回数を把握し、上限を超えないよう送信間隔を調整する
+# pacing="spread": 残り回数をリセット時刻までに均等に使う / "burst": 上限に達するまで即座に送信し、達したらリセット時刻まで待つ
+# 例:
+#   dispatcher = LineNotifyDispatcher(line_notify=LineNotify(token="..."))
+#   future = dispatcher.send_message(message="...")  # すぐに返る
+#   response = future.result()
+class LineNotifyDispatcher(object):
+	# 再送対象のステータスコード
+	RETRY_STATUS_CODES: tuple[int, ...] = (429, 500, 502, 503, 504)
+	# 送信間隔の調整方法
+	PACING_SPREAD: str = "spread"
+	PACING_BURST: str = "burst"
+
+	def __init__(
+			self,
+			line_notify: LineNotify,
+			workers: int = 1,
+			max_retries: int = 5,
+			backoff_base: float = 1.0,
+			backoff_max: float = 60.0,
+			quota_reserve: int = 0,
+			pacing: str = "spread"
+	):
+		if pacing not in (self.PACING_SPREAD, self.PACING_BURST):
+			raise ValueError("pacing must be 'spread' or 'burst'.")
+
+		self.line_notify: LineNotify = line_notify
+		self.max_retries: int = max_retries
+		# 再送間隔(指数バックオフ + ジッター)
+		self.backoff_base: float = backoff_base
+		self.backoff_max: float = backoff_max
+		# 他の送信元のために残しておく回数
+		self.quota_reserve: int = max(0, quota_reserve)
+		self.pacing: str = pacing
+
+		self.__condition: threading.Condition = threading.Condition()
+		# トークン -> 送信待ち([メッセージ, Future, 試行回数])
+		self.__queues: dict[str, deque] = {}
+		# 次に送信可能になる時刻順のトークン((時刻, 連番, トークン))
+		self.__ready_heap: list[tuple[float, int, str]] = []
+		self.__sequence: int = 0
+		# ヒープに登録済み・送信中のトークン
+		self.__scheduled_tokens: set[str] = set()
+		self.__in_flight_tokens: set[str] = set()
+		# トークン -> {"limit", "remaining", "reset"}
+		self.__quotas: dict[str, dict[str, int]] = {}
+		self.__stats: dict[str, int] = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "throttled": 0}
+		self.__closed: bool = False
+
+		self.__threads: list[threading.Thread] = [
+			threading.Thread(target=self.__run, name="LineNotifyDispatcher-" + str(_index), daemon=True)
+			for _index in range(max(1, workers))
+		]
+		for _thread in self.__threads:
+			_thread.start()
+
+	# with文対応
+	def __enter__(self) -> "LineNotifyDispatcher":
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.close()
+		return False
+
+	# 送信予約(送信結果はFutureで受け取る)
+	def send_message(
+			self,
+			message: str,
+			token: str | None = None
+	) -> Future:
+		_future: Future = Future()
+		_token: str = token if (isinstance(token, str) and len(token) > 0) else self.line_notify.token
+
+		with self.__condition:
+			if self.__closed:
+				_future.set_exception(RuntimeError("LineNotifyDispatcher is closed."))
+				return _future
+			self.__queues.setdefault(_token, deque()).append([message, _future, 0])
+			self.__stats["queued"] += 1
+			if (_token not in self.__scheduled_tokens) and (_token not in self.__in_flight_tokens):
+				self.__schedule(token=_token, ready_time=time.monotonic())
+			self.__condition.notify()
+		return _future
+
+	# 停止(wait=Trueの場合は送信待ちを全て処理してから停止)
+	def close(self, wait: bool = True) -> None:
+		with self.__condition:
+			self.__closed = True
+			if not wait:
+				# 未送信分はキャンセル
+				for _queue in self.__queues.values():
+					for _message, _future, _attempts in _queue:
+						_future.cancel()
+					_queue.clear()
+			self.__condition.notify_all()
+		for _thread in self.__threads:
+			if _thread is not threading.current_thread():
+				_thread.join()
+
+	# トークン毎の残り回数(最後に受信したヘッダーの値)
+	def get_quota(self, token: str | None = None) -> dict[str, int] | None:
+		_token: str = token if (isinstance(token, str) and len(token) > 0) else self.line_notify.token
+		with self.__condition:
+			_quota: dict[str, int] | None = self.__quotas.get(_token)
+			return dict(_quota) if _quota is not None else None
+
+	# 送信件数等の統計
+	def get_stats(self) -> dict[str, int]:
+		with self.__condition:
+			_stats: dict[str, int] = dict(self.__stats)
+			_stats["pending"] = sum(len(_queue) for _queue in self.__queues.values())
+			return _stats
+
+	# トークンを送信可能時刻に登録
+	def __schedule(self, token: str, ready_time: float) -> None:
+		self.__sequence += 1
+		heapq.heappush(self.__ready_heap, (ready_time, self.__sequence, token))
+		self.__scheduled_tokens.add(token)
+
+	# 送信スレッド
+	def __run(self) -> None:
+		while True:
+			with self.__condition:
+				# 送信可能なトークンを待つ
+				while True:
+					if len(self.__ready_heap) == 0:
+						if self.__closed and (len(self.__in_flight_tokens) == 0):
+							return
+						self.__condition.wait(timeout=1.0)
+						continue
+					_ready_time, _, _token = self.__ready_heap[0]
+					_wait_time: float = _ready_time - time.monotonic()
+					if _wait_time > 0:
+						self.__condition.wait(timeout=_wait_time)
+						continue
+					heapq.heappop(self.__ready_heap)
+					self.__scheduled_tokens.discard(_token)
+					_queue: deque | None = self.__queues.get(_token)
+					if (_queue is None) or (len(_queue) == 0):
+						continue
+					_job: list = _queue.popleft()
+					self.__in_flight_tokens.add(_token)
+					break
+
+			_next_ready_time: float = self.__send(token=_token, job=_job)
+
+			with self.__condition:
+				self.__in_flight_tokens.discard(_token)
+				_queue = self.__queues.get(_token)
+				if (_queue is not None) and (len(_queue) > 0):
+					self.__schedule(token=_token, ready_time=_next_ready_time)
+				elif _queue is not None:
+					del self.__queues[_token]
+				self.__condition.notify_all()
+
+	# 1件送信(戻り値はこのトークンで次に送信してよい時刻)
+	def __send(self, token: str, job: list) -> float:
+		_message, _future, _attempts = job
+		# 送信前にキャンセルされていれば送信しない
+		if _future.cancelled():
+			return time.monotonic()
+
+		_response: Response | None = None
+		_error: BaseException | None = None
+		try:
+			_response = self.line_notify.send_message(message=_message, token=token)
+		except RequestException as e:
+			# 通信エラーは再送対象
+			_error = e
+		except BaseException as e:
+			self.__count("failed")
+			self.__set_exception(future=_future, error=e)
+			return time.monotonic()
+
+		if _response is not None:
+			self.__update_quota(token=token, response=_response)
+
+		# 再送
+		_retry: bool = (_error is not None) or (
+			(_response is not None) and (_response.status_code in self.RETRY_STATUS_CODES)
+		)
+		if _retry and (_attempts < self.max_retries):
+			_delay: float = self.__get_retry_delay(attempts=_attempts, response=_response)
+			self.__count("retries")
+			with self.__condition:
+				job[2] = _attempts + 1
+				# 失敗したメッセージを先頭に戻して順序を保つ
+				self.__queues.setdefault(token, deque()).appendleft(job)
+			return time.monotonic() + _delay
+
+		if _error is not None:
+			self.__count("failed")
+			self.__set_exception(future=_future, error=_error)
+		else:
+			self.__count("sent" if (_response is not None) and (_response.status_code == 200) else "failed")
+			self.__set_result(future=_future, response=_response)
+		return self.__get_next_ready_time(token=token)
+
+	# 結果を設定(送信中にキャンセルされた場合は無視)
+	@staticmethod
+	def __set_result(future: Future, response: Response | None) -> None:
+		try:
+			future.set_result(response)
+		except InvalidStateError:
+			pass
+
+	@staticmethod
+	def __set_exception(future: Future, error: BaseException) -> None:
+		try:
+			future.set_exception(error)
+		except InvalidStateError:
+			pass
+
+	# レスポンスヘッダーから残り回数を記録
+	def __update_quota(self, token: str, response: Response) -> None:
+		_quota: dict[str, int] = {}
+		for _key, _header in (
+				("limit", "X-RateLimit-Limit"),
+				("remaining", "X-RateLimit-Remaining"),
+				("reset", "X-RateLimit-Reset")
+		):
+			_value: str | None = response.headers.get(_header)
+			if (_value is not None) and _value.strip().isdigit():
+				_quota[_key] = int(_value)
+		if len(_quota) > 0:
+			with self.__condition:
+				self.__quotas.setdefault(token, {}).update(_quota)
+
+	# 次に送信してよい時刻(残り回数がquota_reserve以下になったらリセット時刻まで待つ)
+	# spreadの場合は残り回数をリセット時刻までに均等に使う間隔を空ける
+	def __get_next_ready_time(self, token: str) -> float:
+		_now: float = time.monotonic()
+		with self.__condition:
+			_quota: dict[str, int] | None = self.__quotas.get(token)
+		if (_quota is None) or ("remaining" not in _quota) or ("reset" not in _quota):
+			return _now
+
+		_seconds_to_reset: float = max(0.0, _quota["reset"] - time.time())
+		_available: int = _quota["remaining"] - self.quota_reserve
+		if _available <= 0:
+			# 上限に達した場合はリセットまで待つ
+			self.__count("throttled")
+			return _now + _seconds_to_reset
+		if self.pacing == self.PACING_SPREAD:
+			return _now + _seconds_to_reset / _available
+		return _now
+
+	# 再送までの待ち時間
+	def __get_retry_delay(self, attempts: int, response: Response | None) -> float:
+		if response is not None:
+			# Retry-Afterの指定があれば従う
+			_retry_after: str | None = response.headers.get("Retry-After")
+			if (_retry_after is not None) and _retry_after.strip().isdigit():
+				return float(_retry_after)
+			# 429の場合はリセット時刻まで待つ
+			if response.status_code == 429:
+				_reset: str | None = response.headers.get("X-RateLimit-Reset")
+				if (_reset is not None) and _reset.strip().isdigit():
+					return max(0.0, int(_reset) - time.time())
+		# 指数バックオフ(フルジッター気味に上限の半分～上限)
+		_delay: float = min(self.backoff_max, self.backoff_base * (2 ** attempts))
+		return _delay * random.uniform(0.5, 1.0)
+
+	def __count(self, key: str) -> None:
+		with self.__condition:
+			self.__stats[key] += 1
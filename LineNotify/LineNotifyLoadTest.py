@@ -0,0 +1,176 @@
+# LineNotifyの負荷試験(ローカルのスタブサーバに対して一定のレートで送信)
+# direct: スレッドプールから直接send_message / dispatcher: LineNotifyDispatcher経由(再送あり)
+# 実行例:
+#   python LineNotify/LineNotifyLoadTest.py --rate 200 --duration 10 --error-rate 0.05 --output line_notify_load_test.json
+
+from LineNotify import LineNotify
+from LineNotifyDispatcher import LineNotifyDispatcher
+from LineNotifyStubServer import LineNotifyStubServer
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+
+
+# 遅延の集計(送信予定時刻からの遅延)
+def summarize(latencies_ns: list[int], statuses: dict[str, int], elapsed: float) -> dict:
+	_sorted: list[int] = sorted(latencies_ns)
+
+	def _percentile(percentile: float) -> float:
+		if len(_sorted) == 0:
+			return 0.0
+		_index: int = min(len(_sorted) - 1, int(len(_sorted) * percentile / 100.0))
+		return _sorted[_index] / 1_000_000
+
+	return {
+		"completed": len(_sorted),
+		"elapsed_sec": elapsed,
+		"throughput_per_sec": len(_sorted) / elapsed if elapsed > 0 else 0.0,
+		"statuses": statuses,
+		"latency_ms": {
+			"mean": (sum(_sorted) / len(_sorted) / 1_000_000) if len(_sorted) > 0 else 0.0,
+			"p50": _percentile(50),
+			"p90": _percentile(90),
+			"p99": _percentile(99),
+			"p999": _percentile(99.9),
+			"max": (_sorted[-1] / 1_000_000) if len(_sorted) > 0 else 0.0
+		}
+	}
+
+
+# rate件/秒でduration秒間送信(送信が遅れても予定時刻は後ろにずらさない)
+def run_load(
+		line_notify: LineNotify,
+		mode: str,
+		rate: float,
+		duration: float,
+		tokens: list[str],
+		workers: int,
+		max_retries: int,
+		pacing: str = "burst"
+) -> dict:
+	_lock: threading.Lock = threading.Lock()
+	_latencies_ns: list[int] = []
+	_statuses: dict[str, int] = {}
+
+	def _record(scheduled_ns: int, future: Future) -> None:
+		_latency_ns: int = time.perf_counter_ns() - scheduled_ns
+		try:
+			_response = future.result()
+			_status: str = str(_response.status_code) if _response is not None else "none"
+		except Exception as e:
+			_status = type(e).__name__
+		with _lock:
+			_latencies_ns.append(_latency_ns)
+			_statuses[_status] = _statuses.get(_status, 0) + 1
+
+	_total: int = int(rate * duration)
+	_interval_ns: int = int(1_000_000_000 / rate)
+	_dispatcher: LineNotifyDispatcher | None = None
+	_executor: ThreadPoolExecutor | None = None
+	if mode == "dispatcher":
+		_dispatcher = LineNotifyDispatcher(
+			line_notify=line_notify,
+			workers=workers,
+			max_retries=max_retries,
+			backoff_base=0.05,
+			backoff_max=1.0,
+			pacing=pacing
+		)
+	else:
+		_executor = ThreadPoolExecutor(max_workers=workers)
+
+	_start_ns: int = time.perf_counter_ns()
+	for _index in range(_total):
+		_scheduled_ns: int = _start_ns + _index * _interval_ns
+		_wait_ns: int = _scheduled_ns - time.perf_counter_ns()
+		if _wait_ns > 0:
+			time.sleep(_wait_ns / 1_000_000_000)
+
+		_message: str = "load test %d" % _index
+		_token: str = tokens[_index % len(tokens)]
+		if _dispatcher is not None:
+			_future: Future = _dispatcher.send_message(message=_message, token=_token)
+		else:
+			_future = _executor.submit(line_notify.send_message, message=_message, token=_token)
+		_future.add_done_callback(lambda _done, _scheduled_ns=_scheduled_ns: _record(_scheduled_ns, _done))
+
+	_stats: dict[str, int] = {}
+	if _dispatcher is not None:
+		_dispatcher.close()
+		_stats = _dispatcher.get_stats()
+	else:
+		_executor.shutdown(wait=True)
+	_elapsed: float = (time.perf_counter_ns() - _start_ns) / 1_000_000_000
+
+	_result: dict = {"mode": mode, "target_rate_per_sec": rate, "sent": _total}
+	_result.update(summarize(latencies_ns=_latencies_ns, statuses=_statuses, elapsed=_elapsed))
+	if _dispatcher is not None:
+		_result["retries"] = _stats.get("retries", 0)
+		_result["throttled"] = _stats.get("throttled", 0)
+	return _result
+
+
+def main(argv: list[str] | None = None) -> int:
+	_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="LineNotify load test")
+	_parser.add_argument("--rate", type=float, default=100.0, help="messages per second")
+	_parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+	_parser.add_argument("--tokens", type=int, default=4, help="number of tokens")
+	_parser.add_argument("--workers", type=int, default=8)
+	_parser.add_argument("--mode", type=str, choices=["direct", "dispatcher", "both"], default="both")
+	_parser.add_argument("--max-retries", type=int, default=3)
+	# spreadは1時間分の上限を均等に使うため、短時間の負荷試験ではburstで上限までの処理能力を測る
+	_parser.add_argument("--pacing", type=str, choices=["burst", "spread"], default="burst", help="dispatcher pacing")
+	_parser.add_argument("--error-rate", type=float, default=0.0, help="probability of 500 from the stub server")
+	_parser.add_argument("--latency", type=float, default=0.0, help="stub server latency in seconds")
+	_parser.add_argument("--rate-limit", type=int, default=1000, help="per-token quota of the stub server")
+	_parser.add_argument("--output", type=str, default="line_notify_load_test.json")
+	_args: argparse.Namespace = _parser.parse_args(argv)
+
+	_tokens: list[str] = ["load-test-token-%d" % _index for _index in range(max(1, _args.tokens))]
+	_modes: list[str] = ["direct", "dispatcher"] if _args.mode == "both" else [_args.mode]
+	_results: list[dict] = []
+	for _mode in _modes:
+		# モード毎に送信回数の上限をリセットするため、サーバを起動し直す
+		with LineNotifyStubServer(
+				rate_limit=_args.rate_limit,
+				error_rate=_args.error_rate,
+				latency=_args.latency
+		) as _server:
+			with LineNotify(token=_tokens[0], api_url=_server.api_url, pool_maxsize=_args.workers) as _line_notify:
+				_result: dict = run_load(
+					line_notify=_line_notify,
+					mode=_mode,
+					rate=_args.rate,
+					duration=_args.duration,
+					tokens=_tokens,
+					workers=_args.workers,
+					max_retries=_args.max_retries,
+					pacing=_args.pacing
+				)
+			_result["server_statuses"] = {str(_status): _count for _status, _count in _server.status_counts.items()}
+			_results.append(_result)
+
+	_report: dict = {
+		"meta": {
+			"timestamp": datetime.now().isoformat(),
+			"python": sys.version,
+			"platform": platform.platform(),
+			"args": vars(_args)
+		},
+		"results": _results
+	}
+	with open(_args.output, "w", encoding="utf-8") as _file:
+		json.dump(_report, _file, indent=2)
+
+	for _result in _results:
+		print(json.dumps(_result, ensure_ascii=False))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,341 @@
+from LineNotify import LineNotify
+from requests import Response
+import queue
+import random
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+
+# 送信前の通知をSQLiteに保存してから送信する(プロセスが落ちても再起動後に未送信分を送り直す)
+# 書き込みは専用スレッドでまとめてコミットし(fsyncはコミット毎)、送信は別スレッドで再送付きで行う
+# 同じmessage_idの通知は1度だけ保存・送信する
+# 例:
+#   with LineNotifyOutbox(line_notify=LineNotify(token="..."), database_path="outbox.sqlite3") as outbox:
+#       outbox.send_message(message="...", message_id="job-1234-finished")
+class LineNotifyOutbox(object):
+	# 再送対象のステータスコード
+	RETRY_STATUS_CODES: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+	def __init__(
+			self,
+			line_notify: LineNotify,
+			database_path: str = "line_notify_outbox.sqlite3",
+			# まとめてコミットする件数・待ち時間
+			commit_batch_size: int = 100,
+			commit_interval: float = 0.05,
+			max_retries: int = 10,
+			backoff_base: float = 1.0,
+			backoff_max: float = 300.0,
+			# FULL: コミット毎にfsync / NORMAL: チェックポイント時のみ(電源断で直近の分を失う可能性あり)
+			synchronous: str = "FULL"
+	):
+		self.line_notify: LineNotify = line_notify
+		self.database_path: str = database_path
+		self.commit_batch_size: int = max(1, commit_batch_size)
+		self.commit_interval: float = commit_interval
+		self.max_retries: int = max_retries
+		self.backoff_base: float = backoff_base
+		self.backoff_max: float = backoff_max
+		self.synchronous: str = synchronous
+
+		# テーブル作成
+		_connection: sqlite3.Connection = self.__connect()
+		try:
+			_connection.executescript(
+				"CREATE TABLE IF NOT EXISTS outbox ("
+				" id INTEGER PRIMARY KEY AUTOINCREMENT,"
+				" message_id TEXT NOT NULL UNIQUE,"
+				" token TEXT NOT NULL,"
+				" message TEXT NOT NULL,"
+				" created_at REAL NOT NULL,"
+				" attempts INTEGER NOT NULL DEFAULT 0,"
+				" next_attempt_at REAL NOT NULL,"
+				" sent_at REAL,"
+				" failed INTEGER NOT NULL DEFAULT 0,"
+				" status_code INTEGER"
+				");"
+				# 未送信分だけの部分インデックス(再起動時に履歴全体を読まない)
+				"CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (next_attempt_at)"
+				" WHERE sent_at IS NULL AND failed = 0;"
+			)
+		finally:
+			_connection.close()
+
+		# 書き込み待ち((message_id, トークン, メッセージ, 作成日時, 完了通知))
+		# 完了通知は{"event": Event, "committed": bool}で、コミットに失敗した場合はcommitted=Falseのままeventを立てる
+		self.__write_queue: queue.Queue = queue.Queue()
+		# 新しい通知を保存したことを送信スレッドへ知らせる
+		self.__wake_event: threading.Event = threading.Event()
+		self.__stop_event: threading.Event = threading.Event()
+		# 停止の判定と書き込み待ちへの追加を一度に行うためのロック(停止後に受け付けない)
+		self.__accept_lock: threading.Lock = threading.Lock()
+
+		self.__writer_thread: threading.Thread = threading.Thread(
+			target=self.__run_writer,
+			name="LineNotifyOutbox-writer",
+			daemon=True
+		)
+		self.__drainer_thread: threading.Thread = threading.Thread(
+			target=self.__run_drainer,
+			name="LineNotifyOutbox-drainer",
+			daemon=True
+		)
+		self.__writer_thread.start()
+		self.__drainer_thread.start()
+
+	# with文対応
+	def __enter__(self) -> "LineNotifyOutbox":
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.close()
+		return False
+
+	# 通知を保存(送信はバックグラウンド)
+	# wait_durable=Trueの場合はディスクへのコミットが終わるまで待ち、コミットに失敗した場合はNoneを返す
+	# 戻り値はmessage_id(省略時は自動生成)
+	def send_message(
+			self,
+			message: str,
+			token: str | None = None,
+			message_id: str | None = None,
+			wait_durable: bool = False
+	) -> str | None:
+		if (not isinstance(message, str)) or (message == ""):
+			print("Empty Message.")
+			return None
+
+		_token: str = token if (isinstance(token, str) and len(token) > 0) else self.line_notify.token
+		_message_id: str = message_id if (isinstance(message_id, str) and len(message_id) > 0) else uuid.uuid4().hex
+		_waiter: dict | None = {"event": threading.Event(), "committed": False} if wait_durable else None
+		with self.__accept_lock:
+			if self.__stop_event.is_set():
+				print("LineNotifyOutbox is closed.")
+				return None
+			self.__write_queue.put((_message_id, _token, message, time.time(), _waiter))
+		if _waiter is not None:
+			_waiter["event"].wait()
+			if not _waiter["committed"]:
+				print("Failed to save message.")
+				return None
+		return _message_id
+
+	# ここまでに受け付けた通知をコミットするまで待つ(コミットに失敗した場合はFalse)
+	def flush(self) -> bool:
+		_waiter: dict = {"event": threading.Event(), "committed": False}
+		with self.__accept_lock:
+			if self.__stop_event.is_set():
+				# 停止時に受け付け済みの通知は全てコミット済み
+				return True
+			self.__write_queue.put((None, None, None, None, _waiter))
+		_waiter["event"].wait()
+		return _waiter["committed"]
+
+	# 停止(受け付け済みの通知はコミットしてから終了、未送信分は次回起動時に送信)
+	def close(self) -> None:
+		with self.__accept_lock:
+			if self.__stop_event.is_set():
+				return
+			self.__stop_event.set()
+			# 書き込みスレッドは受け付け済みの通知を全てコミットしてから終了する
+			self.__write_queue.put(None)
+		self.__wake_event.set()
+		for _thread in (self.__writer_thread, self.__drainer_thread):
+			if _thread is not threading.current_thread():
+				_thread.join()
+
+	# 未送信件数
+	def get_pending_count(self) -> int:
+		_connection: sqlite3.Connection = self.__connect()
+		try:
+			return _connection.execute(
+				"SELECT COUNT(*) FROM outbox WHERE sent_at IS NULL AND failed = 0"
+			).fetchone()[0]
+		finally:
+			_connection.close()
+
+	# 状態別の件数
+	def get_stats(self) -> dict[str, int]:
+		_connection: sqlite3.Connection = self.__connect()
+		try:
+			_sent, _failed, _pending = _connection.execute(
+				"SELECT"
+				" COALESCE(SUM(sent_at IS NOT NULL), 0),"
+				" COALESCE(SUM(failed = 1), 0),"
+				" COALESCE(SUM(sent_at IS NULL AND failed = 0), 0)"
+				" FROM outbox"
+			).fetchone()
+			return {"sent": _sent, "failed": _failed, "pending": _pending}
+		finally:
+			_connection.close()
+
+	# 送信済み・失敗した古い記録を削除(message_idによる重複除外はこの期間内のみになる)
+	def purge(self, older_than_seconds: float = 7 * 24 * 3600.0) -> int:
+		_connection: sqlite3.Connection = self.__connect()
+		try:
+			with _connection:
+				_cursor: sqlite3.Cursor = _connection.execute(
+					"DELETE FROM outbox WHERE (sent_at IS NOT NULL OR failed = 1) AND created_at < ?",
+					(time.time() - older_than_seconds,)
+				)
+			return _cursor.rowcount
+		finally:
+			_connection.close()
+
+	def __connect(self) -> sqlite3.Connection:
+		_connection: sqlite3.Connection = sqlite3.connect(self.database_path, timeout=30.0)
+		_connection.execute("PRAGMA journal_mode=WAL")
+		_connection.execute("PRAGMA synchronous=" + self.synchronous)
+		return _connection
+
+	# 書き込みスレッド(commit_interval秒またはcommit_batch_size件毎にまとめてコミット)
+	def __run_writer(self) -> None:
+		_connection: sqlite3.Connection | None = None
+		try:
+			_connection = self.__connect()
+			_stopping: bool = False
+			while not _stopping:
+				_item: tuple | None = self.__write_queue.get()
+				if _item is None:
+					break
+				_items: list[tuple] = [_item]
+				_deadline: float = time.monotonic() + self.commit_interval
+				while len(_items) < self.commit_batch_size:
+					_remaining: float = _deadline - time.monotonic()
+					try:
+						_item = self.__write_queue.get(timeout=_remaining) if _remaining > 0 else \
+							self.__write_queue.get_nowait()
+					except queue.Empty:
+						break
+					if _item is None:
+						_stopping = True
+						break
+					_items.append(_item)
+
+				_rows: list[tuple] = [
+					(_message_id, _token, _message, _created_at, _created_at)
+					for _message_id, _token, _message, _created_at, _waiter in _items
+					if _message_id is not None
+				]
+				_committed: bool = False
+				try:
+					if len(_rows) > 0:
+						with _connection:
+							# 同じmessage_idは無視(重複除外)
+							_connection.executemany(
+								"INSERT OR IGNORE INTO outbox (message_id, token, message, created_at, next_attempt_at)"
+								" VALUES (?, ?, ?, ?, ?)",
+								_rows
+							)
+						self.__wake_event.set()
+					_committed = True
+				except sqlite3.Error:
+					traceback.print_exc()
+				finally:
+					self.__notify_waiters(items=_items, committed=_committed)
+		finally:
+			if _connection is not None:
+				_connection.close()
+			# 異常終了した場合は以降の通知を受け付けず、待っている呼び出し元を解放する(コミットされていない)
+			with self.__accept_lock:
+				self.__stop_event.set()
+			while True:
+				try:
+					_item = self.__write_queue.get_nowait()
+				except queue.Empty:
+					break
+				if _item is not None:
+					self.__notify_waiters(items=[_item], committed=False)
+
+	# コミットを待っている呼び出し元へ結果を知らせる
+	@staticmethod
+	def __notify_waiters(items: list[tuple], committed: bool) -> None:
+		for _message_id, _token, _message, _created_at, _waiter in items:
+			if _waiter is not None:
+				_waiter["committed"] = committed
+				_waiter["event"].set()
+
+	# 送信スレッド(送信時刻になった未送信分を古い順に送る)
+	def __run_drainer(self) -> None:
+		_connection: sqlite3.Connection = self.__connect()
+		try:
+			while not self.__stop_event.is_set():
+				_now: float = time.time()
+				try:
+					_rows: list[tuple] = _connection.execute(
+						"SELECT id, token, message, attempts FROM outbox"
+						" WHERE sent_at IS NULL AND failed = 0 AND next_attempt_at <= ?"
+						" ORDER BY next_attempt_at LIMIT 100",
+						(_now,)
+					).fetchall()
+				except sqlite3.Error:
+					traceback.print_exc()
+					_rows = []
+
+				for _id, _token, _message, _attempts in _rows:
+					if self.__stop_event.is_set():
+						return
+					self.__send(connection=_connection, row_id=_id, token=_token, message=_message, attempts=_attempts)
+
+				if len(_rows) > 0:
+					continue
+
+				# 次の送信時刻か新しい通知の保存まで待つ
+				_timeout: float = 60.0
+				try:
+					_next: tuple = _connection.execute(
+						"SELECT MIN(next_attempt_at) FROM outbox WHERE sent_at IS NULL AND failed = 0"
+					).fetchone()
+					if _next[0] is not None:
+						_timeout = min(_timeout, max(0.0, _next[0] - time.time()))
+				except sqlite3.Error:
+					traceback.print_exc()
+				self.__wake_event.wait(timeout=_timeout)
+				self.__wake_event.clear()
+		finally:
+			_connection.close()
+
+	# 1件送信して結果を記録
+	def __send(self, connection: sqlite3.Connection, row_id: int, token: str, message: str, attempts: int) -> None:
+		_response: Response | None = None
+		_retry: bool = False
+		try:
+			_response = self.line_notify.send_message(message=message, token=token)
+			_retry = (_response is not None) and (_response.status_code in self.RETRY_STATUS_CODES)
+		except Exception:
+			# 通信エラーは再送
+			_retry = True
+
+		_status_code: int | None = _response.status_code if _response is not None else None
+		try:
+			with connection:
+				if (_response is not None) and (_status_code == 200):
+					connection.execute(
+						"UPDATE outbox SET sent_at = ?, attempts = ?, status_code = ? WHERE id = ?",
+						(time.time(), attempts + 1, _status_code, row_id)
+					)
+				elif _retry and (attempts < self.max_retries):
+					connection.execute(
+						"UPDATE outbox SET attempts = ?, next_attempt_at = ?, status_code = ? WHERE id = ?",
+						(attempts + 1, time.time() + self.__get_retry_delay(attempts, _response), _status_code, row_id)
+					)
+				else:
+					# 400/401等や再送回数の上限に達したものは送信しない
+					connection.execute(
+						"UPDATE outbox SET failed = 1, attempts = ?, status_code = ? WHERE id = ?",
+						(attempts + 1, _status_code, row_id)
+					)
+		except sqlite3.Error:
+			traceback.print_exc()
+
+	# 再送までの待ち時間(Retry-Afterがあれば従い、なければ指数バックオフ + ジッター)
+	def __get_retry_delay(self, attempts: int, response: Response | None) -> float:
+		if response is not None:
+			_retry_after: str | None = response.headers.get("Retry-After")
+			if (_retry_after is not None) and _retry_after.strip().isdigit():
+				return float(_retry_after)
+		_delay: float = min(self.backoff_max, self.backoff_base * (2 ** attempts))
+		return _delay * random.uniform(0.5, 1.0)
@@ -0,0 +1,199 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import json
+import random
+import threading
+import time
+
+
+# LINE Notify APIを模したローカルサーバ(ベンチマーク・試験用)
+# トークン毎の送信回数の上限とX-RateLimit-*ヘッダー、各種エラー(401/400/429/500)を再現する
+class LineNotifyStubServer(object):
+	# APIのパス
+	API_PATH: str = "/api/notify"
+	STATUS_PATH: str = "/api/status"
+
+	# コンストラクタ(port=0で空きポートを自動割り当て)
+	def __init__(
+			self,
+			host: str = "127.0.0.1",
+			port: int = 0,
+			# トークン毎の送信回数の上限(rate_limit_window秒毎にリセット)
+			rate_limit: int = 1000,
+			image_rate_limit: int = 50,
+			rate_limit_window: float = 3600.0,
+			# 500エラーを返す確率
+			error_rate: float = 0.0,
+			# 応答までの遅延(秒)
+			latency: float = 0.0,
+			# 401を返すトークン(Noneなら全て有効)
+			valid_tokens: set[str] | None = None
+	):
+		_stub: LineNotifyStubServer = self
+
+		# リクエスト処理
+		class _RequestHandler(BaseHTTPRequestHandler):
+			# keep-aliveを有効にする
+			protocol_version: str = "HTTP/1.1"
+			# ヘッダーと本文の書き込みが分かれるため、Nagleによる遅延を避ける
+			disable_nagle_algorithm: bool = True
+
+			def do_GET(self) -> None:
+				if self.path.split("?")[0] != _stub.STATUS_PATH:
+					self.__send_json(status=404, body={"status": 404, "message": "Not Found"})
+					return
+				self.__handle(body=None)
+
+			def do_POST(self) -> None:
+				_length: int = int(self.headers.get("Content-Length", "0"))
+				_body: bytes = b""
+				if _length > 0:
+					_body = self.rfile.read(_length)
+
+				if self.path.split("?")[0] != _stub.API_PATH:
+					self.__send_json(status=404, body={"status": 404, "message": "Not Found"})
+					return
+				self.__handle(body=_body)
+
+			# 認証・上限・エラーの判定(bodyがNoneの場合は/api/status)
+			def __handle(self, body: bytes | None) -> None:
+				if _stub.latency > 0:
+					time.sleep(_stub.latency)
+
+				_authorization: str = self.headers.get("Authorization", "")
+				_token: str = _authorization[len("Bearer "):] if _authorization.startswith("Bearer ") else ""
+				if (_token == "") or ((_stub.valid_tokens is not None) and (_token not in _stub.valid_tokens)):
+					_stub.count(status=401)
+					self.__send_json(status=401, body={"status": 401, "message": "Invalid access token"})
+					return
+
+				if body is None:
+					_stub.count(status=200)
+					self.__send_json(
+						status=200,
+						body={"status": 200, "message": "ok", "targetType": "USER", "target": "stub"}
+					)
+					return
+
+				_has_image: bool = b'name="imageFile"' in body
+				if not self.__has_message(body=body):
+					_stub.count(status=400)
+					self.__send_json(status=400, body={"status": 400, "message": "message: must not be empty"})
+					return
+
+				_quota: dict[str, float] = _stub.consume(token=_token, image=_has_image)
+				_headers: dict[str, str] = {
+					"X-RateLimit-Limit": str(_stub.rate_limit),
+					"X-RateLimit-Remaining": str(int(_quota["remaining"])),
+					"X-RateLimit-ImageLimit": str(_stub.image_rate_limit),
+					"X-RateLimit-ImageRemaining": str(int(_quota["image_remaining"])),
+					"X-RateLimit-Reset": str(int(_quota["reset"]))
+				}
+				if not _quota["accepted"]:
+					_stub.count(status=429)
+					_headers["Retry-After"] = str(max(0, int(_quota["reset"] - time.time())))
+					self.__send_json(status=429, body={"status": 429, "message": "Too Many Requests"}, headers=_headers)
+					return
+
+				if (_stub.error_rate > 0) and (random.random() < _stub.error_rate):
+					_stub.count(status=500)
+					self.__send_json(status=500, body={"status": 500, "message": "Internal Server Error"}, headers=_headers)
+					return
+
+				_stub.count(status=200)
+				self.__send_json(status=200, body={"status": 200, "message": "ok"}, headers=_headers)
+
+			def __has_message(self, body: bytes) -> bool:
+				_content_type: str = self.headers.get("Content-Type", "")
+				if _content_type.startswith("multipart/form-data"):
+					return b'name="message"' in body
+				_fields: dict[str, list[str]] = parse_qs(body.decode("utf-8", errors="replace"))
+				return len(_fields.get("message", [""])[0]) > 0
+
+			def __send_json(self, status: int, body: dict, headers: dict[str, str] | None = None) -> None:
+				_data: bytes = json.dumps(body).encode("utf-8")
+				self.send_response(status)
+				self.send_header("Content-Type", "application/json;charset=UTF-8")
+				self.send_header("Content-Length", str(len(_data)))
+				for _name, _value in (headers or {}).items():
+					self.send_header(_name, _value)
+				self.end_headers()
+				self.wfile.write(_data)
+
+			# アクセスログは出力しない
+			def log_message(self, format: str, *args) -> None:
+				return
+
+		self.rate_limit: int = rate_limit
+		self.image_rate_limit: int = image_rate_limit
+		self.rate_limit_window: float = rate_limit_window
+		self.error_rate: float = error_rate
+		self.latency: float = latency
+		self.valid_tokens: set[str] | None = valid_tokens
+
+		self.__lock: threading.Lock = threading.Lock()
+		# 受信したリクエスト数(ステータスコード別)
+		self.request_count: int = 0
+		self.status_counts: dict[int, int] = {}
+		# トークン -> [残り回数, 画像の残り回数, リセット時刻]
+		self.__quotas: dict[str, list] = {}
+
+		self.__server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), _RequestHandler)
+		self.__server.daemon_threads = True
+		self.__thread: threading.Thread | None = None
+
+	# APIのURL(LineNotify(api_url=...)に渡す)
+	@property
+	def api_url(self) -> str:
+		_host, _port = self.__server.server_address[:2]
+		return "http://%s:%d%s" % (_host, _port, self.API_PATH)
+
+	# バックグラウンドで起動
+	def start(self) -> "LineNotifyStubServer":
+		self.__thread = threading.Thread(target=self.__server.serve_forever, name="LineNotifyStubServer", daemon=True)
+		self.__thread.start()
+		return self
+
+	# 停止
+	def stop(self) -> None:
+		self.__server.shutdown()
+		self.__server.server_close()
+		if self.__thread is not None:
+			self.__thread.join()
+			self.__thread = None
+
+	# with文対応
+	def __enter__(self) -> "LineNotifyStubServer":
+		return self.start()
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.stop()
+		return False
+
+	# ステータスコード別に集計
+	def count(self, status: int) -> None:
+		with self.__lock:
+			self.request_count += 1
+			self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+	# 送信回数を1回消費(上限に達していればaccepted=False)
+	def consume(self, token: str, image: bool = False) -> dict[str, float]:
+		_now: float = time.time()
+		with self.__lock:
+			_quota: list | None = self.__quotas.get(token)
+			if (_quota is None) or (_quota[2] <= _now):
+				_quota = [self.rate_limit, self.image_rate_limit, _now + self.rate_limit_window]
+				self.__quotas[token] = _quota
+			_accepted: bool = (_quota[0] > 0) and ((not image) or (_quota[1] > 0))
+			if _accepted:
+				_quota[0] -= 1
+				if image:
+					_quota[1] -= 1
+			return {"accepted": _accepted, "remaining": _quota[0], "image_remaining": _quota[1], "reset": _quota[2]}
+
+	# 集計と送信回数をリセット
+	def reset(self) -> None:
+		with self.__lock:
+			self.request_count = 0
+			self.status_counts = {}
+			self.__quotas = {}
@@ -0,0 +1,147 @@
+from logging import Handler, LogRecord, ERROR
+from typing import Any
+import queue
+import threading
+import time
+import traceback
+
+
+# ERROR/CRITICALのレコードを一定時間毎にまとめて通知するハンドラ
+# 通知先はLineNotify(send_message)またはPushbulletWrapper(push_note)のインスタンス
+# 例: logger.add_handler(AlertDigestHandler(notifier=LineNotify(token="...")))
+class AlertDigestHandler(Handler):
+	# コンストラクタ
+	def __init__(
+			self,
+			notifier: Any,
+			window_seconds: float = 60.0,
+			queue_size: int = 1000,
+			level: int = ERROR,
+			title: str = "Log alert",
+			max_message_length: int = 1000,
+			max_groups: int = 20
+	):
+		super().__init__(level=level)
+		self.notifier: Any = notifier
+		self.window_seconds: float = window_seconds
+		self.title: str = title
+		# 1通あたりの最大文字数(LINE Notifyは1000文字)
+		self.max_message_length: int = max_message_length
+		# 1通に含める種類数の上限
+		self.max_groups: int = max_groups
+
+		# キューが一杯で破棄したレコード数(ロギング側は待たせない)
+		self.dropped_count: int = 0
+		self.__queue: queue.Queue = queue.Queue(maxsize=queue_size)
+
+		# 送信用スレッド
+		self.__stop_event: threading.Event = threading.Event()
+		self.__thread: threading.Thread = threading.Thread(
+			target=self.__run,
+			name="AlertDigestHandler",
+			daemon=True
+		)
+		self.__thread.start()
+
+	# ロギング側の処理(キューに積むだけ)
+	def emit(self, record: LogRecord) -> None:
+		try:
+			self.__queue.put_nowait(record)
+		except queue.Full:
+			# handle()経由では取得済みだが、emitを直接呼ばれた場合に備えてハンドラのロックで保護
+			self.acquire()
+			try:
+				self.dropped_count += 1
+			finally:
+				self.release()
+
+	# 送信スレッドを停止(残りのレコードは送信してから終了)
+	def close(self) -> None:
+		self.__stop_event.set()
+		if self.__thread.is_alive() and (self.__thread is not threading.current_thread()):
+			self.__thread.join(timeout=self.window_seconds + 10.0)
+		super().close()
+
+	# 送信スレッド
+	def __run(self) -> None:
+		while True:
+			# 最初のレコードを待つ
+			try:
+				_first_record: LogRecord = self.__queue.get(timeout=0.5)
+			except queue.Empty:
+				if self.__stop_event.is_set():
+					return
+				continue
+
+			# 集計期間中のレコードをまとめる
+			_records: list[LogRecord] = [_first_record]
+			_deadline: float = time.monotonic() + self.window_seconds
+			while not self.__stop_event.is_set():
+				_remaining: float = _deadline - time.monotonic()
+				if _remaining <= 0:
+					break
+				try:
+					_records.append(self.__queue.get(timeout=min(_remaining, 0.5)))
+				except queue.Empty:
+					continue
+
+			# 停止時は残りも取り出す
+			if self.__stop_event.is_set():
+				while True:
+					try:
+						_records.append(self.__queue.get_nowait())
+					except queue.Empty:
+						break
+
+			self.__send_digest(records=_records)
+
+	# まとめた内容を通知
+	def __send_digest(self, records: list[LogRecord]) -> None:
+		# 同じ箇所・同じメッセージテンプレートのレコードをまとめる
+		_groups: dict[tuple, list] = {}
+		for _record in records:
+			_key: tuple = (_record.levelno, _record.name, _record.pathname, _record.lineno, str(_record.msg))
+			_group: list | None = _groups.get(_key)
+			if _group is None:
+				_groups[_key] = [1, _record]
+			else:
+				_group[0] += 1
+
+		# 読み出しと初期化の間にemitで加算された分を失わないよう、ハンドラのロックで保護
+		self.acquire()
+		try:
+			_dropped_count: int = self.dropped_count
+			self.dropped_count = 0
+		finally:
+			self.release()
+
+		_lines: list[str] = [
+			"%s: %d records (%d kinds)" % (self.title, len(records), len(_groups))
+		]
+		for _count, _record in sorted(_groups.values(), key=lambda _group: -_group[0])[:self.max_groups]:
+			try:
+				_message: str = _record.getMessage()
+			except Exception:
+				_message = str(_record.msg)
+			_lines.append(
+				"x%d %s %s: %s (%s:%d)" % (
+					_count, _record.levelname, _record.name, _message, _record.filename, _record.lineno
+				)
+			)
+		if len(_groups) > self.max_groups:
+			_lines.append("... %d more kinds" % (len(_groups) - self.max_groups))
+		if _dropped_count > 0:
+			_lines.append("(%d records dropped)" % _dropped_count)
+
+		_body: str = "\n".join(_lines)
+		if len(_body) > self.max_message_length:
+			_body = _body[:self.max_message_length - 3] + "..."
+
+		# 通知(失敗してもロギングには影響させない)
+		try:
+			if hasattr(self.notifier, "push_note"):
+				self.notifier.push_note(title=self.title, body=_body, catch_exception=True)
+			elif hasattr(self.notifier, "send_message"):
+				self.notifier.send_message(message=_body)
+		except Exception:
+			traceback.print_exc()
@@ -0,0 +1,532 @@
+import os
+import io
+import json
+import mmap
+import time
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterator
+
+
+# LoggerWrapperの出力ファイル(ローテーション済みファイル含む)の検索用インデックス
+# デフォルトのフォーマット("%(asctime)s: %(levelname)s: ...")を前提とする
+# DateRollingFileHandlerの出力はdate_formatを指定すると、同じディレクトリの全日付のファイルを対象にする
+#   例: LogIndexer(logfile_path="logs/20261017_app.log", date_format="%Y%m%d")
+class LogIndexer(object):
+	# タイムスタンプ(asctime)の文字数 ("2026-10-17 10:00:00,123")
+	TIMESTAMP_LENGTH: int = 23
+
+	# インデックス保存先ディレクトリ名(ログファイルと同じディレクトリ内)
+	INDEX_DIRECTORY_NAME: str = ".index"
+
+	# コンストラクタ
+	def __init__(
+			self,
+			logfile_path: str,
+			sparse_interval_bytes: int = 64 * 1024,
+			indexed_levels: tuple[str, ...] = ("WARNING", "ERROR", "CRITICAL"),
+			encoding: str = "utf-8",
+			save_index: bool = True,
+			# 日付毎のファイル名の日付部分の書式(DateRollingFileHandlerのdate_format、Noneの場合は日付切り替えなし)
+			date_format: str | None = None
+	):
+		# 対象ログファイル(ローテーション前のファイル名)
+		self.logfile_path: str = os.path.abspath(logfile_path)
+		self.encoding: str = encoding
+		self.date_format: str | None = date_format
+		# 日付部分より後ろ(footer + 拡張子)
+		self.__date_length: int = len(datetime.now().strftime(date_format)) if date_format else 0
+		self.__date_suffix: str = os.path.basename(self.logfile_path)[self.__date_length:]
+
+		# タイムスタンプ→オフセットを記録する間隔(バイト数)
+		self.sparse_interval_bytes: int = max(1, sparse_interval_bytes)
+		# オフセットを記録するログレベル
+		self.indexed_levels: tuple[str, ...] = tuple(indexed_levels)
+
+		# インデックスのファイル保存有無
+		self.save_index: bool = save_index
+		self.__index_file_path: str = os.path.join(
+			os.path.dirname(self.logfile_path),
+			self.INDEX_DIRECTORY_NAME,
+			os.path.basename(self.logfile_path) + ".json"
+		)
+
+		# ファイル識別子(inode) -> セグメント毎のインデックス
+		self.__segments: dict[str, dict] = {}
+		# ファイルパス -> 古い順の番号
+		self.__segment_orders: dict[str, int] = {}
+		self.__lock: threading.Lock = threading.Lock()
+		self.__load_index()
+
+	# インデックス更新(追記分のみ走査、ローテーションで名前が変わったファイルは再利用)
+	def refresh(self) -> None:
+		with self.__lock:
+			_changed: bool = False
+			_alive_keys: set[str] = set()
+
+			_segment_paths: list[str] = self.get_segment_paths()
+			self.__segment_orders = {_path: _index for _index, _path in enumerate(_segment_paths)}
+			for _segment_path in _segment_paths:
+				try:
+					_stat: os.stat_result = os.stat(_segment_path)
+				except OSError:
+					continue
+				_key: str = self.__get_segment_key(segment_path=_segment_path, stat=_stat)
+				_alive_keys.add(_key)
+
+				_segment: dict | None = self.__segments.get(_key)
+				_fingerprint: str = self.__get_fingerprint(segment_path=_segment_path)
+				if (
+						(_segment is None)
+						or (not _fingerprint.startswith(_segment["fingerprint"]))
+						or (_stat.st_size < _segment["size"])
+				):
+					# 新規ファイル または 別ファイルに置き換わった場合は最初から作成
+					_segment = self.__get_empty_segment(fingerprint=_fingerprint)
+					self.__segments[_key] = _segment
+					_changed = True
+
+				# 前回の続きから追記分のみ走査
+				_segment["path"] = _segment_path
+				_segment["fingerprint"] = _fingerprint
+				if _stat.st_size > _segment["size"]:
+					self.__scan_segment(segment_path=_segment_path, segment=_segment)
+					_changed = True
+
+			# 削除されたファイルのインデックスを破棄
+			for _key in list(self.__segments.keys()):
+				if _key not in _alive_keys:
+					del self.__segments[_key]
+					_changed = True
+
+			if _changed:
+				self.__save_index()
+
+	# ローテーション済みファイルを含むファイル一覧(古い順)
+	def get_segment_paths(self) -> list[str]:
+		_directory_path: str = os.path.dirname(self.logfile_path)
+		if not os.path.exists(_directory_path):
+			return []
+		_names: list[str] = os.listdir(_directory_path)
+
+		_segment_paths: list[str] = []
+		for _base_path in self.__get_base_paths(names=_names):
+			_base_name: str = os.path.basename(_base_path)
+
+			# RotatingFileHandlerのバックアップ(xxx.log.1, xxx.log.2, ...)を抽出
+			_backup_numbers: list[int] = []
+			for _name in _names:
+				if _name.startswith(_base_name + "."):
+					_suffix: str = _name[len(_base_name) + 1:]
+					if _suffix.isdigit():
+						_backup_numbers.append(int(_suffix))
+
+			# 番号が大きいほど古い
+			_segment_paths.extend(
+				_base_path + "." + str(_number) for _number in sorted(_backup_numbers, reverse=True)
+			)
+			if os.path.isfile(_base_path):
+				_segment_paths.append(_base_path)
+		return _segment_paths
+
+	# ローテーション前のファイル名の一覧(古い順、日付毎のファイルの場合は日付順)
+	def __get_base_paths(self, names: list[str]) -> list[str]:
+		if self.date_format is None:
+			return [self.logfile_path]
+
+		_directory_path: str = os.path.dirname(self.logfile_path)
+		_dated_paths: list[tuple[datetime, str]] = []
+		for _name in names:
+			if _name[self.__date_length:] != self.__date_suffix:
+				continue
+			try:
+				_date: datetime = datetime.strptime(_name[:self.__date_length], self.date_format)
+			except ValueError:
+				continue
+			_dated_paths.append((_date, os.path.join(_directory_path, _name)))
+		_base_paths: list[str] = [_path for _date, _path in sorted(_dated_paths)]
+		if self.logfile_path not in _base_paths:
+			# 指定したファイルがまだ作成されていない場合
+			_base_paths.append(self.logfile_path)
+		return _base_paths
+
+	# 書き込み中のファイル(日付毎のファイルの場合は最新の日付のファイル)
+	def __get_current_path(self) -> str:
+		if self.date_format is None:
+			return self.logfile_path
+		_directory_path: str = os.path.dirname(self.logfile_path)
+		try:
+			_names: list[str] = os.listdir(_directory_path)
+		except OSError:
+			return self.logfile_path
+		_base_paths: list[str] = [_path for _path in self.__get_base_paths(names=_names) if os.path.isfile(_path)]
+		return _base_paths[-1] if len(_base_paths) > 0 else self.logfile_path
+
+	# ローテーション前に読んでいたファイルより後、書き込み中のファイルより前のバックアップ(古い順)
+	# 旧ファイルが既に削除されている場合は、旧ファイルの最終更新以降に更新されたバックアップを対象にする
+	def __get_rotated_paths(self, after_inode: int, after_mtime: float, until_inode: int) -> list[str]:
+		_segments: list[tuple[str, os.stat_result]] = []
+		for _segment_path in self.get_segment_paths():
+			try:
+				_segments.append((_segment_path, os.stat(_segment_path)))
+			except OSError:
+				continue
+
+		_start: int | None = None
+		if after_inode != 0:
+			for _index, (_segment_path, _stat) in enumerate(_segments):
+				if _stat.st_ino == after_inode:
+					_start = _index + 1
+					break
+		if _start is None:
+			_start = next(
+				(_index for _index, (_, _stat) in enumerate(_segments) if _stat.st_mtime >= after_mtime),
+				len(_segments)
+			)
+
+		_rotated_paths: list[str] = []
+		for _segment_path, _stat in _segments[_start:]:
+			if (until_inode != 0) and (_stat.st_ino == until_inode):
+				break
+			_rotated_paths.append(_segment_path)
+		return _rotated_paths
+
+	# 期間・ログレベル・キーワードでレコードを検索
+	def search(
+			self,
+			start: datetime | None = None,
+			end: datetime | None = None,
+			levels: list[str] | tuple[str, ...] | None = None,
+			keyword: str | None = None
+	) -> Iterator[str]:
+		self.refresh()
+
+		_start_key: int | None = self.get_timestamp_key(start) if start is not None else None
+		_end_key: int | None = self.get_timestamp_key(end) if end is not None else None
+		_levels: set[str] | None = set(levels) if levels else None
+		_keyword: bytes | None = keyword.encode(self.encoding) if keyword else None
+
+		with self.__lock:
+			_segments: list[dict] = sorted(
+				[
+					_segment for _segment in self.__segments.values()
+					if (_segment["size"] > 0) and (_segment["first"] is not None)
+				],
+				key=lambda _segment: self.__get_segment_order(_segment["path"])
+			)
+
+		for _segment in _segments:
+			# 期間外のファイルは読まない
+			if (_start_key is not None) and (_segment["last"] < _start_key):
+				continue
+			if (_end_key is not None) and (_segment["first"] > _end_key):
+				continue
+
+			for _record in self.__search_segment(
+					segment=_segment,
+					start_key=_start_key,
+					end_key=_end_key,
+					levels=_levels,
+					keyword=_keyword
+			):
+				yield _record.decode(self.encoding, errors="replace")
+
+	# tail -f 相当(ローテーション・日付の切り替えを跨いで追従)
+	def follow(
+			self,
+			from_end: bool = True,
+			poll_interval: float = 0.5,
+			stop_event: threading.Event | None = None
+	) -> Iterator[str]:
+		_file: io.BufferedReader | None = None
+		_inode: int | None = None
+		_pending: bytes = b""
+		_first_open: bool = True
+		# ローテーション前に読んでいたファイル(inode, 更新日時)、切り替え後にその間のバックアップを読む
+		_rotated_from: tuple[int, float] | None = None
+
+		try:
+			while (stop_event is None) or (not stop_event.is_set()):
+				# ファイルを開く(ローテーション直後は存在しない場合がある)
+				if _file is None:
+					try:
+						_file = open(self.__get_current_path(), "rb")
+					except OSError:
+						time.sleep(poll_interval)
+						continue
+					_inode = os.fstat(_file.fileno()).st_ino
+					if from_end and _first_open:
+						_file.seek(0, os.SEEK_END)
+					_first_open = False
+
+					# 読み取り間に複数回ローテーションされた場合、旧ファイルと新ファイルの間のバックアップを古い順に読む
+					if _rotated_from is not None:
+						for _backup_path in self.__get_rotated_paths(
+								after_inode=_rotated_from[0],
+								after_mtime=_rotated_from[1],
+								until_inode=_inode
+						):
+							try:
+								_backup_file: io.BufferedReader = open(_backup_path, "rb")
+							except OSError:
+								continue
+							with _backup_file:
+								for _line in _backup_file:
+									_pending += _line
+									if _pending.endswith(b"\n"):
+										yield _pending.rstrip(b"\r\n").decode(self.encoding, errors="replace")
+										_pending = b""
+						_rotated_from = None
+
+				_line: bytes = _file.readline()
+				if _line:
+					_pending += _line
+					if _pending.endswith(b"\n"):
+						yield _pending.rstrip(b"\r\n").decode(self.encoding, errors="replace")
+						_pending = b""
+					continue
+
+				# 追記がない場合はローテーション有無を確認
+				try:
+					_stat: os.stat_result | None = os.stat(self.__get_current_path())
+				except OSError:
+					_stat = None
+				_rotated: bool = (
+					(_stat is not None)
+					and ((_stat.st_ino != _inode) or (_stat.st_size < _file.tell()))
+				)
+				if _rotated:
+					# 旧ファイルの残りを読み切ってから新ファイルへ切り替え
+					for _line in _file.readlines():
+						_pending += _line
+						if _pending.endswith(b"\n"):
+							yield _pending.rstrip(b"\r\n").decode(self.encoding, errors="replace")
+							_pending = b""
+					_rotated_from = (_inode, os.fstat(_file.fileno()).st_mtime)
+					_file.close()
+					_file = None
+					continue
+
+				time.sleep(poll_interval)
+		finally:
+			if _file is not None:
+				_file.close()
+
+	# datetime -> 比較用の整数キー(YYYYMMDDhhmmssfff)
+	@staticmethod
+	def get_timestamp_key(timestamp: datetime) -> int:
+		return int(timestamp.strftime("%Y%m%d%H%M%S")) * 1000 + timestamp.microsecond // 1000
+
+	# 行頭のタイムスタンプ -> 比較用の整数キー(レコード先頭行でなければNone)
+	@classmethod
+	def __parse_timestamp_key(cls, line: bytes) -> int | None:
+		if (
+				(len(line) < cls.TIMESTAMP_LENGTH)
+				or (line[4:5] != b"-")
+				or (line[10:11] != b" ")
+				or (line[19:20] != b",")
+		):
+			return None
+		try:
+			return int(
+				line[0:4] + line[5:7] + line[8:10] + line[11:13] + line[14:16] + line[17:19] + line[20:23]
+			)
+		except ValueError:
+			return None
+
+	# レコード先頭行からログレベルを取得
+	@classmethod
+	def __parse_level(cls, line: bytes) -> str:
+		_start: int = cls.TIMESTAMP_LENGTH + 2
+		_end: int = line.find(b":", _start)
+		if _end < 0:
+			return ""
+		return line[_start:_end].decode("ascii", errors="replace")
+
+	# セグメントの追記分を走査してインデックスに反映
+	def __scan_segment(self, segment_path: str, segment: dict) -> None:
+		_offset: int = segment["size"]
+		_sparse: list[list[int]] = segment["sparse"]
+		_levels: dict[str, list[int]] = segment["levels"]
+		_last_sparse_offset: int = _sparse[-1][1] if len(_sparse) > 0 else -self.sparse_interval_bytes
+
+		with open(segment_path, "rb") as _file:
+			_file.seek(_offset)
+			for _line in _file:
+				# 書き込み途中の行は次回に持ち越し
+				if not _line.endswith(b"\n"):
+					break
+
+				_key: int | None = self.__parse_timestamp_key(_line)
+				if _key is not None:
+					if segment["first"] is None:
+						segment["first"] = _key
+					segment["last"] = max(segment["last"] or _key, _key)
+
+					# 一定間隔毎にタイムスタンプ→オフセットを記録
+					if _offset - _last_sparse_offset >= self.sparse_interval_bytes:
+						_sparse.append([_key, _offset])
+						_last_sparse_offset = _offset
+
+					# 指定レベルのレコードは全てのオフセットを記録
+					_level: str = self.__parse_level(_line)
+					if _level in self.indexed_levels:
+						_levels.setdefault(_level, []).append(_offset)
+
+				_offset += len(_line)
+
+		segment["size"] = _offset
+
+	# セグメント内の検索(二分探索で開始位置を決めてmmapで読む)
+	def __search_segment(
+			self,
+			segment: dict,
+			start_key: int | None,
+			end_key: int | None,
+			levels: set[str] | None,
+			keyword: bytes | None
+	) -> Iterator[bytes]:
+		try:
+			_file = open(segment["path"], "rb")
+		except OSError:
+			return
+
+		with _file:
+			try:
+				_mm: mmap.mmap = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+			except (OSError, ValueError):
+				return
+
+			with _mm:
+				_limit: int = min(segment["size"], len(_mm))
+
+				# 開始時刻より前の最後の目印から読み始める
+				_start_offset: int = 0
+				if start_key is not None:
+					_sparse_keys: list[int] = [_entry[0] for _entry in segment["sparse"]]
+					_position: int = bisect_left(_sparse_keys, start_key) - 1
+					if _position >= 0:
+						_start_offset = segment["sparse"][_position][1]
+
+				if (levels is not None) and levels.issubset(self.indexed_levels):
+					# レベル別オフセットを使って該当レコードのみ読む
+					_offsets_list: list[list[int]] = []
+					for _level in levels:
+						_offsets: list[int] = segment["levels"].get(_level, [])
+						_offsets_list.append(_offsets[bisect_right(_offsets, _start_offset - 1):])
+					_candidates: Iterator[int] = heapq.merge(*_offsets_list)
+				else:
+					_candidates = self.__iterate_record_offsets(mm=_mm, start_offset=_start_offset, limit=_limit)
+
+				for _offset in _candidates:
+					if _offset >= _limit:
+						break
+					_record: bytes = self.__read_record(mm=_mm, offset=_offset, limit=_limit)
+					_key: int | None = self.__parse_timestamp_key(_record)
+					if _key is None:
+						continue
+					if (start_key is not None) and (_key < start_key):
+						continue
+					if (end_key is not None) and (_key > end_key):
+						break
+					if (levels is not None) and (self.__parse_level(_record) not in levels):
+						continue
+					if (keyword is not None) and (keyword not in _record):
+						continue
+					yield _record.rstrip(b"\r\n")
+
+	# レコード先頭のオフセットを順に列挙
+	@classmethod
+	def __iterate_record_offsets(cls, mm: mmap.mmap, start_offset: int, limit: int) -> Iterator[int]:
+		_offset: int = start_offset
+		while _offset < limit:
+			_end: int = mm.find(b"\n", _offset, limit)
+			_end = limit if _end < 0 else _end + 1
+			if cls.__parse_timestamp_key(mm[_offset:_offset + cls.TIMESTAMP_LENGTH]) is not None:
+				yield _offset
+			_offset = _end
+
+	# オフセット位置から1レコード(複数行の例外トレースを含む)を読む
+	@classmethod
+	def __read_record(cls, mm: mmap.mmap, offset: int, limit: int) -> bytes:
+		_end: int = mm.find(b"\n", offset, limit)
+		_end = limit if _end < 0 else _end + 1
+		# 次のレコード先頭行までを継続行として含める
+		while _end < limit:
+			if cls.__parse_timestamp_key(mm[_end:_end + cls.TIMESTAMP_LENGTH]) is not None:
+				break
+			_next_end: int = mm.find(b"\n", _end, limit)
+			_end = limit if _next_end < 0 else _next_end + 1
+		return mm[offset:_end]
+
+	# ファイル識別子(リネームされても変わらないinodeを利用)
+	@staticmethod
+	def __get_segment_key(segment_path: str, stat: os.stat_result) -> str:
+		if stat.st_ino != 0:
+			return str(stat.st_ino)
+		# inodeが取得できない環境ではファイル名で代用
+		return os.path.basename(segment_path)
+
+	# inode再利用を検出するためのファイル先頭の指紋
+	@staticmethod
+	def __get_fingerprint(segment_path: str) -> str:
+		try:
+			with open(segment_path, "rb") as _file:
+				return _file.read(64).hex()
+		except OSError:
+			return ""
+
+	@staticmethod
+	def __get_empty_segment(fingerprint: str) -> dict:
+		return {
+			"path": "",
+			"fingerprint": fingerprint,
+			"size": 0,
+			"first": None,
+			"last": None,
+			"sparse": [],
+			"levels": {}
+		}
+
+	# ローテーション番号による並び順(古い順)
+	def __get_segment_order(self, segment_path: str) -> int:
+		return self.__segment_orders.get(segment_path, len(self.__segment_orders))
+
+	# インデックス読み込み
+	def __load_index(self) -> None:
+		if not (self.save_index and os.path.isfile(self.__index_file_path)):
+			return
+		try:
+			with open(self.__index_file_path, "r", encoding="utf-8") as _file:
+				_data: dict = json.load(_file)
+			if (
+					(_data.get("sparse_interval_bytes") == self.sparse_interval_bytes)
+					and (tuple(_data.get("indexed_levels", ())) == self.indexed_levels)
+			):
+				self.__segments = _data.get("segments", {})
+		except (OSError, ValueError):
+			# 壊れている場合は作り直す
+			self.__segments = {}
+
+	# インデックス保存(一時ファイルに書いてから置き換え)
+	def __save_index(self) -> None:
+		if not self.save_index:
+			return
+		try:
+			os.makedirs(os.path.dirname(self.__index_file_path), exist_ok=True)
+			_temporary_file_path: str = self.__index_file_path + ".tmp"
+			with open(_temporary_file_path, "w", encoding="utf-8") as _file:
+				json.dump(
+					{
+						"sparse_interval_bytes": self.sparse_interval_bytes,
+						"indexed_levels": list(self.indexed_levels),
+						"segments": self.__segments
+					},
+					_file
+				)
+			os.replace(_temporary_file_path, self.__index_file_path)
+		except OSError:
+			import traceback
+			traceback.print_exc()
@@ -0,0 +1,260 @@
+# LoggerWrapperのベンチマーク・負荷試験
+# 実行例:
+#   python Logging/LoggerBenchmark.py --records 100000 --output logger_benchmark.json
+#   python Logging/LoggerBenchmark.py --scenarios retention --retention-files 1000000
+
+from LoggerWrapper import LoggerWrapper
+from logging import INFO, WARNING, getLogger
+from datetime import date, datetime, timedelta
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+
+# 計測結果の集計
+def summarize_latencies(latencies_ns: list[int], elapsed_ns: int, records: int) -> dict:
+	_sorted: list[int] = sorted(latencies_ns)
+
+	def _percentile(percentile: float) -> int:
+		if len(_sorted) == 0:
+			return 0
+		_index: int = min(len(_sorted) - 1, int(len(_sorted) * percentile / 100.0))
+		return _sorted[_index]
+
+	return {
+		"records": records,
+		"seconds": elapsed_ns / 1_000_000_000,
+		"records_per_sec": records / (elapsed_ns / 1_000_000_000) if elapsed_ns > 0 else 0.0,
+		"latency_ns": {
+			"p50": _percentile(50),
+			"p90": _percentile(90),
+			"p99": _percentile(99),
+			"p999": _percentile(99.9),
+			"max": _sorted[-1] if len(_sorted) > 0 else 0
+		}
+	}
+
+
+# 1スレッドで指定回数ログ出力して呼び出し側の遅延を計測
+def measure_calls(log_function, records: int, message: str) -> tuple[list[int], int]:
+	_latencies_ns: list[int] = [0] * records
+	_perf_counter_ns = time.perf_counter_ns
+	_start_ns: int = _perf_counter_ns()
+	for _i in range(records):
+		_call_start_ns: int = _perf_counter_ns()
+		log_function(message)
+		_latencies_ns[_i] = _perf_counter_ns() - _call_start_ns
+	return _latencies_ns, _perf_counter_ns() - _start_ns
+
+
+# ハンドラ種別毎のスループット・遅延
+def run_handler_modes(work_directory: str, records: int, message: str) -> list[dict]:
+	_results: list[dict] = []
+	# (名前, オプション, 出力メソッド, ロガーのレベル)
+	# disabled_levelはロガーのレベル(WARNING)未満のinfoを出力し、レベル判定で破棄される場合の遅延を計測する
+	_modes: list[tuple[str, dict, str, int]] = [
+		("plain_file", {"log_rotate": False}, "info", INFO),
+		("rotating", {"log_rotate": True, "max_bytes": 10_000_000, "backup_count": 3}, "info", INFO),
+		("console", {"log_rotate": False, "console_output": True}, "info", INFO),
+		("disabled_level", {"log_rotate": False}, "info", WARNING)
+	]
+	for _name, _options, _method_name, _level in _modes:
+		_logger: LoggerWrapper = LoggerWrapper(
+			module_name="benchmark." + _name,
+			logfile_dir=os.path.join(work_directory, _name),
+			logfile_filename_header=_name,
+			**_options
+		)
+		# loglevelは初回のbasicConfig(ルートロガー)にしか反映されないため、ロガーに直接設定する
+		getLogger("benchmark." + _name).setLevel(_level)
+		with _logger:
+			_latencies_ns, _elapsed_ns = measure_calls(
+				log_function=getattr(_logger, _method_name),
+				records=records,
+				message=message
+			)
+		_result: dict = {"scenario": "handler_mode", "mode": _name}
+		_result.update(summarize_latencies(_latencies_ns, _elapsed_ns, records))
+		_results.append(_result)
+	return _results
+
+
+# ローテーション境界での停止時間
+def run_rotation_boundary(work_directory: str, records: int, message: str, max_bytes: int) -> list[dict]:
+	_logger: LoggerWrapper = LoggerWrapper(
+		module_name="benchmark.rotation",
+		logfile_dir=os.path.join(work_directory, "rotation"),
+		logfile_filename_header="rotation",
+		log_rotate=True,
+		max_bytes=max_bytes,
+		backup_count=5
+	)
+	with _logger:
+		_latencies_ns, _elapsed_ns = measure_calls(log_function=_logger.info, records=records, message=message)
+
+	_result: dict = {"scenario": "rotation_boundary", "max_bytes": max_bytes}
+	_result.update(summarize_latencies(_latencies_ns, _elapsed_ns, records))
+	# 中央値の10倍を超えた呼び出しを停止とみなす
+	_stall_threshold_ns: int = _result["latency_ns"]["p50"] * 10
+	_stalls: list[int] = [_latency for _latency in _latencies_ns if _latency > _stall_threshold_ns]
+	_result["stall_threshold_ns"] = _stall_threshold_ns
+	_result["stalls"] = len(_stalls)
+	_result["stall_total_ns"] = sum(_stalls)
+	return [_result]
+
+
+# 複数スレッドから同じロガーへ出力した場合の競合
+def run_contention(work_directory: str, records: int, message: str, thread_counts: list[int]) -> list[dict]:
+	_results: list[dict] = []
+	for _thread_count in thread_counts:
+		_logger: LoggerWrapper = LoggerWrapper(
+			module_name="benchmark.contention." + str(_thread_count),
+			logfile_dir=os.path.join(work_directory, "contention"),
+			logfile_filename_header="contention_" + str(_thread_count),
+			log_rotate=False
+		)
+		_records_per_thread: int = max(1, records // _thread_count)
+		_latencies_per_thread: list[list[int]] = [[] for _ in range(_thread_count)]
+		_barrier: threading.Barrier = threading.Barrier(_thread_count + 1)
+
+		def _worker(index: int) -> None:
+			_barrier.wait()
+			_latencies_per_thread[index], _ = measure_calls(
+				log_function=_logger.info,
+				records=_records_per_thread,
+				message=message
+			)
+
+		with _logger:
+			_threads: list[threading.Thread] = [
+				threading.Thread(target=_worker, args=(_index,)) for _index in range(_thread_count)
+			]
+			for _thread in _threads:
+				_thread.start()
+			_start_ns: int = time.perf_counter_ns()
+			_barrier.wait()
+			for _thread in _threads:
+				_thread.join()
+			_elapsed_ns: int = time.perf_counter_ns() - _start_ns
+
+		_latencies_ns: list[int] = [_latency for _latencies in _latencies_per_thread for _latency in _latencies]
+		_result: dict = {"scenario": "contention", "threads": _thread_count}
+		_result.update(summarize_latencies(_latencies_ns, _elapsed_ns, _records_per_thread * _thread_count))
+		_results.append(_result)
+	return _results
+
+
+# 保存期間切れファイルの整理(合成したディレクトリに対して実行)
+def run_retention(work_directory: str, file_counts: list[int], seed: int) -> list[dict]:
+	_results: list[dict] = []
+	_random: random.Random = random.Random(seed)
+	_logger: LoggerWrapper = LoggerWrapper(
+		module_name="benchmark.retention",
+		logfile_dir=os.path.join(work_directory, "retention_log"),
+		logfile_filename_header="retention",
+		log_rotate=False
+	)
+	with _logger:
+		for _file_count in file_counts:
+			_directory_path: str = os.path.join(work_directory, "retention_" + str(_file_count))
+			os.makedirs(_directory_path)
+
+			# 半数程度を60日前のファイルにする
+			_old_timestamp: float = (datetime.now() - timedelta(days=60)).timestamp()
+			_old_count: int = 0
+			for _i in range(_file_count):
+				_file_path: str = os.path.join(_directory_path, "%08d.log" % _i)
+				with open(_file_path, "wb"):
+					pass
+				if _random.random() < 0.5:
+					os.utime(_file_path, (_old_timestamp, _old_timestamp))
+					_old_count += 1
+
+			_start_ns: int = time.perf_counter_ns()
+			_logger.flush_old_files_by_date(
+				directory_path=_directory_path,
+				delete_date_to=date.today() - timedelta(days=30)
+			)
+			_flush_ns: int = time.perf_counter_ns() - _start_ns
+
+			_start_ns = time.perf_counter_ns()
+			_logger.delete_old_files_directory(directory_path=_directory_path)
+			_delete_ns: int = time.perf_counter_ns() - _start_ns
+
+			_results.append({
+				"scenario": "retention",
+				"files": _file_count,
+				"old_files": _old_count,
+				"flush_seconds": _flush_ns / 1_000_000_000,
+				"delete_seconds": _delete_ns / 1_000_000_000,
+				"files_per_sec": _file_count / (_flush_ns / 1_000_000_000) if _flush_ns > 0 else 0.0
+			})
+			shutil.rmtree(_directory_path, ignore_errors=True)
+	return _results
+
+
+def main(argv: list[str] | None = None) -> int:
+	_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="LoggerWrapper benchmark")
+	_parser.add_argument("--records", type=int, default=50000)
+	_parser.add_argument("--message-size", type=int, default=100)
+	_parser.add_argument(
+		"--scenarios",
+		nargs="+",
+		default=["handler_mode", "rotation", "contention", "retention"],
+		choices=["handler_mode", "rotation", "contention", "retention"]
+	)
+	_parser.add_argument("--rotation-max-bytes", type=int, default=256 * 1024)
+	_parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+	_parser.add_argument("--retention-files", type=int, nargs="+", default=[10000])
+	_parser.add_argument("--seed", type=int, default=0)
+	_parser.add_argument("--work-dir", type=str, default=None)
+	_parser.add_argument("--output", type=str, default="logger_benchmark.json")
+	_args: argparse.Namespace = _parser.parse_args(argv)
+
+	_message: str = ("x" * _args.message_size)
+	_work_directory: str = tempfile.mkdtemp(prefix="logger_benchmark_", dir=_args.work_dir)
+
+	# コンソール出力はベンチマーク結果の表示と混ざらないよう破棄
+	_original_stderr = sys.stderr
+	sys.stderr = open(os.devnull, "w")
+	_results: list[dict] = []
+	try:
+		if "handler_mode" in _args.scenarios:
+			_results += run_handler_modes(_work_directory, _args.records, _message)
+		if "rotation" in _args.scenarios:
+			_results += run_rotation_boundary(_work_directory, _args.records, _message, _args.rotation_max_bytes)
+		if "contention" in _args.scenarios:
+			_results += run_contention(_work_directory, _args.records, _message, _args.threads)
+		if "retention" in _args.scenarios:
+			_results += run_retention(_work_directory, _args.retention_files, _args.seed)
+	finally:
+		sys.stderr.close()
+		sys.stderr = _original_stderr
+		shutil.rmtree(_work_directory, ignore_errors=True)
+
+	_report: dict = {
+		"meta": {
+			"timestamp": datetime.now().isoformat(),
+			"python": sys.version,
+			"platform": platform.platform(),
+			"args": vars(_args)
+		},
+		"results": _results
+	}
+	with open(_args.output, "w", encoding="utf-8") as _file:
+		json.dump(_report, _file, indent=2)
+
+	for _result in _results:
+		print(json.dumps(_result, ensure_ascii=False))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
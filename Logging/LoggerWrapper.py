@@ -1,15 +1,455 @@
-from logging import basicConfig, getLogger, Formatter, StreamHandler, FileHandler, Logger
-# from logging import DEBUG
+from logging import basicConfig, getLogger, Formatter, StreamHandler, FileHandler, Handler, Logger
+from logging import DEBUG
 from logging import INFO
-# from logging import WARNING
-# from logging import ERROR
-# from logging import CRITICAL
+from logging import WARNING
+from logging import ERROR
+from logging import CRITICAL
 from logging.handlers import RotatingFileHandler
 # import logging
 import sys
 import os
+import time
+import threading
+import functools
+import hashlib
+import weakref
 from datetime import date, datetime, timedelta
 from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Iterator
+
+
+# 処理時間の集計用ヒストグラム(HDR風の対数バケット)
+class TimingHistogram(object):
+	# 2のべき乗区間を2^SUB_BUCKET_BITSに分割(相対誤差 約6%)
+	SUB_BUCKET_BITS: int = 3
+
+	def __init__(self):
+		self.count: int = 0
+		self.total_ns: int = 0
+		self.min_ns: int = 0
+		self.max_ns: int = 0
+		# バケット番号 -> 件数
+		self.__buckets: dict[int, int] = {}
+
+	# 計測値を記録
+	def record(self, value_ns: int) -> None:
+		if value_ns < 0:
+			value_ns = 0
+		_index: int = self.__get_bucket_index(value_ns)
+		self.__buckets[_index] = self.__buckets.get(_index, 0) + 1
+		if (self.count == 0) or (value_ns < self.min_ns):
+			self.min_ns = value_ns
+		if value_ns > self.max_ns:
+			self.max_ns = value_ns
+		self.count += 1
+		self.total_ns += value_ns
+
+	# パーセンタイル値(0～100)
+	def get_percentile(self, percentile: float) -> int:
+		if self.count == 0:
+			return 0
+		_threshold: float = self.count * min(max(percentile, 0.0), 100.0) / 100.0
+		_accumulated: int = 0
+		for _index in sorted(self.__buckets.keys()):
+			_accumulated += self.__buckets[_index]
+			if _accumulated >= _threshold:
+				# バケットの代表値(最小値～最大値の範囲に収める)
+				return min(max(self.__get_bucket_value(_index), self.min_ns), self.max_ns)
+		return self.max_ns
+
+	# 平均値
+	def get_mean(self) -> float:
+		if self.count == 0:
+			return 0.0
+		return self.total_ns / self.count
+
+	# 集計値を初期化
+	def reset(self) -> None:
+		self.count = 0
+		self.total_ns = 0
+		self.min_ns = 0
+		self.max_ns = 0
+		self.__buckets = {}
+
+	# 値 -> バケット番号
+	@classmethod
+	def __get_bucket_index(cls, value_ns: int) -> int:
+		if value_ns < (1 << (cls.SUB_BUCKET_BITS + 1)):
+			return value_ns
+		_shift: int = value_ns.bit_length() - (cls.SUB_BUCKET_BITS + 1)
+		return (_shift << cls.SUB_BUCKET_BITS) + (value_ns >> _shift)
+
+	# バケット番号 -> 代表値(区間の中央)
+	@classmethod
+	def __get_bucket_value(cls, index: int) -> int:
+		if index < (1 << (cls.SUB_BUCKET_BITS + 1)):
+			return index
+		_shift: int = (index >> cls.SUB_BUCKET_BITS) - 1
+		_mantissa: int = index - (_shift << cls.SUB_BUCKET_BITS)
+		return (_mantissa << _shift) + ((1 << _shift) >> 1)
+
+
+# スレッド毎に分割したカウンタ(加算時にロックを取らない)
+class ShardedCounter(object):
+	def __init__(self):
+		# スレッド毎のカウンタ(スレッド終了後も集計に含める)
+		self.__shards: list[dict[tuple, int]] = []
+		self.__local: threading.local = threading.local()
+		# 新しいキー・シャードの追加と集計時のみロック
+		self.__lock: threading.Lock = threading.Lock()
+
+	# 加算(既存キーは自スレッドのカウンタのみ更新するためロック不要)
+	def increment(self, key: tuple, value: int = 1) -> None:
+		try:
+			self.__local.shard[key] += value
+		except AttributeError:
+			with self.__lock:
+				self.__local.shard = {key: value}
+				self.__shards.append(self.__local.shard)
+		except KeyError:
+			# キーの追加は集計中の辞書サイズ変更を避けるためロック内で行う
+			with self.__lock:
+				self.__local.shard[key] = value
+
+	# 全スレッド分の合計
+	def get_snapshot(self) -> dict[tuple, int]:
+		_snapshot: dict[tuple, int] = {}
+		with self.__lock:
+			for _shard in self.__shards:
+				for _key, _value in list(_shard.items()):
+					_snapshot[_key] = _snapshot.get(_key, 0) + _value
+		return _snapshot
+
+
+# 処理時間計測(with文・デコレータの両方で利用可能)
+class TimingMeasurement(object):
+	def __init__(self, logger_wrapper: "LoggerWrapper", name: str):
+		self.__logger_wrapper: LoggerWrapper = logger_wrapper
+		self.name: str = name
+		# with文で利用する場合の計測開始時刻(入れ子に対応)
+		self.__starts: list[tuple[int, int]] = []
+
+	def __enter__(self) -> "TimingMeasurement":
+		self.__starts.append((time.perf_counter_ns(), time.thread_time_ns()))
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		_end_wall_ns: int = time.perf_counter_ns()
+		_end_cpu_ns: int = time.thread_time_ns()
+		_start_wall_ns, _start_cpu_ns = self.__starts.pop()
+		self.__logger_wrapper.record_timing(
+			name=self.name,
+			wall_ns=_end_wall_ns - _start_wall_ns,
+			cpu_ns=_end_cpu_ns - _start_cpu_ns
+		)
+		return False
+
+	# デコレータとして利用
+	def __call__(self, function: Callable) -> Callable:
+		@functools.wraps(function)
+		def _wrapper(*args, **kwargs):
+			_start_wall_ns: int = time.perf_counter_ns()
+			_start_cpu_ns: int = time.thread_time_ns()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				self.__logger_wrapper.record_timing(
+					name=self.name,
+					wall_ns=time.perf_counter_ns() - _start_wall_ns,
+					cpu_ns=time.thread_time_ns() - _start_cpu_ns
+				)
+		return _wrapper
+
+
+# 複数レコードをまとめて1つのFernetトークンとして書き込むストリーム
+# (1行毎に暗号化するとトークンのヘッダ・HMAC分が行数に比例して増えるため)
+# ファイルには1ブロック1行(Fernetトークン)で保存する
+# 書き込みが途絶えても、flush_interval秒を過ぎたバッファは全インスタンス共通の監視スレッドが書き出す
+class EncryptedBlockStream(object):
+	# 監視対象のストリーム(全インスタンス共通)
+	__streams: ClassVar[weakref.WeakSet] = weakref.WeakSet()
+	__streams_lock: ClassVar[threading.Lock] = threading.Lock()
+	__flusher_thread: ClassVar[threading.Thread | None] = None
+	# 監視間隔の上限・下限(秒)
+	__max_flusher_interval: ClassVar[float] = 1.0
+	__min_flusher_interval: ClassVar[float] = 0.05
+
+	def __init__(
+			self,
+			file_path: str,
+			fernet: Any,
+			block_size: int = 64 * 1024,
+			flush_interval: float = 5.0,
+			encoding: str = "utf-8"
+	):
+		# fernetはFernetWrapper(またはFernet)のインスタンス
+		self.__fernet: Any = fernet
+		self.__block_size: int = max(1, block_size)
+		self.__flush_interval_ns: int = int(flush_interval * 1_000_000_000)
+		self.__encoding: str = encoding
+		self.__file = open(file_path, "ab")
+
+		# 暗号化前のバッファ(ハンドラのロック外の監視スレッドからも書き出すため専用のロックで保護)
+		self.__buffer: list[bytes] = []
+		self.__buffer_bytes: int = 0
+		self.__buffer_started_ns: int = 0
+		self.__lock: threading.Lock = threading.Lock()
+
+		# 監視対象に追加
+		with self.__streams_lock:
+			self.__streams.add(self)
+		self.__start_flusher()
+
+	# 書き込み(ブロックサイズに達したら暗号化して書き出し)
+	def write(self, text: str) -> None:
+		_data: bytes = text.encode(self.__encoding)
+		with self.__lock:
+			if self.__buffer_bytes == 0:
+				self.__buffer_started_ns = time.monotonic_ns()
+			self.__buffer.append(_data)
+			self.__buffer_bytes += len(_data)
+			if self.__buffer_bytes >= self.__block_size:
+				self.__write_block()
+
+	# FileHandlerからはレコード毎に呼ばれるため、一定時間経過した場合のみ書き出す
+	def flush(self) -> None:
+		with self.__lock:
+			if (self.__buffer_bytes > 0) and (not self.__file.closed) and (
+					time.monotonic_ns() - self.__buffer_started_ns >= self.__flush_interval_ns
+			):
+				self.__write_block()
+
+	# バッファの内容を即座に書き出す
+	def sync(self) -> None:
+		with self.__lock:
+			if (self.__buffer_bytes > 0) and (not self.__file.closed):
+				self.__write_block()
+
+	def close(self) -> None:
+		with self.__streams_lock:
+			self.__streams.discard(self)
+		if self.__file.closed:
+			return
+		try:
+			self.sync()
+		finally:
+			with self.__lock:
+				self.__file.close()
+
+	# RotatingFileHandlerのサイズ判定用(未暗号化分はbase64化後のおおよそのサイズ)
+	def seek(self, offset: int, whence: int = 0) -> int:
+		return self.tell()
+
+	def tell(self) -> int:
+		with self.__lock:
+			return self.__file.tell() + self.__buffer_bytes * 4 // 3
+
+	@property
+	def closed(self) -> bool:
+		return self.__file.closed
+
+	# 監視スレッド開始(未起動の場合のみ)
+	@classmethod
+	def __start_flusher(cls) -> None:
+		with cls.__streams_lock:
+			if (cls.__flusher_thread is not None) and cls.__flusher_thread.is_alive():
+				return
+			cls.__flusher_thread = threading.Thread(
+				target=cls.__watch,
+				name="EncryptedBlockStream",
+				daemon=True
+			)
+			cls.__flusher_thread.start()
+
+	# flush_interval秒を過ぎたバッファを書き出す(監視間隔は最短のflush_intervalの半分)
+	@classmethod
+	def __watch(cls) -> None:
+		while True:
+			with cls.__streams_lock:
+				_streams: list[EncryptedBlockStream] = list(cls.__streams)
+			_interval: float = cls.__max_flusher_interval
+			for _stream in _streams:
+				_interval = min(_interval, _stream.__flush_interval_ns / 2_000_000_000)
+				try:
+					_stream.flush()
+				except Exception:
+					import traceback
+					traceback.print_exc()
+			time.sleep(max(cls.__min_flusher_interval, _interval))
+
+	# バッファを1つのトークンに暗号化して書き出し(ロックを取得して呼ぶ)
+	def __write_block(self) -> None:
+		_block: bytes = b"".join(self.__buffer)
+		self.__buffer = []
+		self.__buffer_bytes = 0
+		_token: bytes | str = self.__fernet.encrypt(_block)
+		if isinstance(_token, str):
+			_token = _token.encode("ascii")
+		self.__file.write(_token + b"\n")
+		self.__file.flush()
+
+	# 暗号化されたログファイルを1ブロックずつ復号して1行ずつ返す
+	@staticmethod
+	def read(file_path: str, fernet: Any, encoding: str = "utf-8") -> Iterator[str]:
+		with open(file_path, "rb") as _file:
+			for _token in _file:
+				_token = _token.strip()
+				if len(_token) == 0:
+					continue
+				# FernetWrapper.decryptはstr、Fernet.decryptはbytesを返す
+				_block: str | bytes = fernet.decrypt(_token)
+				if isinstance(_block, bytes):
+					_block = _block.decode(encoding)
+				for _line in _block.splitlines():
+					yield _line
+
+
+# 暗号化ブロック形式で書き込むRotatingFileHandler
+class EncryptedRotatingFileHandler(RotatingFileHandler):
+	def __init__(
+			self,
+			filename: str,
+			fernet: Any,
+			block_size: int = 64 * 1024,
+			flush_interval: float = 5.0,
+			encoding: str = "utf-8",
+			max_bytes: int = 0,
+			backup_count: int = 0
+	):
+		self.fernet: Any = fernet
+		self.block_size: int = block_size
+		self.flush_interval: float = flush_interval
+		super().__init__(filename=filename, encoding=encoding, maxBytes=max_bytes, backupCount=backup_count)
+
+	def _open(self) -> EncryptedBlockStream:
+		return EncryptedBlockStream(
+			file_path=self.baseFilename,
+			fernet=self.fernet,
+			block_size=self.block_size,
+			flush_interval=self.flush_interval,
+			encoding=self.encoding
+		)
+
+
+# 日付が変わるとファイル名(ヘッダ部)を切り替えるファイルハンドラ
+# 日付の確認はレコード毎ではなく、全ハンドラ共通の監視スレッドで行う
+class DateRollingFileHandler(RotatingFileHandler):
+	# 監視対象のハンドラ(全インスタンス共通)
+	__handlers: ClassVar[weakref.WeakSet] = weakref.WeakSet()
+	__handlers_lock: ClassVar[threading.Lock] = threading.Lock()
+	__watcher_thread: ClassVar[threading.Thread | None] = None
+	# 日付確認の最大間隔(秒) スリープや時刻変更によるずれを補正する
+	__max_watch_interval: ClassVar[float] = 300.0
+
+	def __init__(
+			self,
+			directory_path: str,
+			filename_footer: str = "",
+			filename_extension: str = ".log",
+			date_format: str = "%Y%m%d",
+			encoding: str = "utf-8",
+			max_bytes: int = 0,
+			backup_count: int = 0,
+			fernet: Any | None = None,
+			encryption_block_size: int = 64 * 1024,
+			encryption_flush_interval: float = 5.0
+	):
+		# 暗号化設定(fernetが指定された場合のみ暗号化ブロック形式で書き込み)
+		self.fernet: Any | None = fernet
+		self.encryption_block_size: int = encryption_block_size
+		self.encryption_flush_interval: float = encryption_flush_interval
+
+		# 日付以外の部分は生成時に確定
+		self.__directory_path: str = directory_path
+		self.__filename_footer: str = filename_footer
+		self.__filename_extension: str = filename_extension
+		self.__date_format: str = date_format
+		self.__current_date: date = date.today()
+
+		super().__init__(
+			filename=self.__get_logfile_path(self.__current_date),
+			encoding=encoding,
+			maxBytes=max_bytes,
+			backupCount=backup_count
+		)
+
+		# 監視対象に追加
+		with self.__handlers_lock:
+			self.__handlers.add(self)
+		self.__start_watcher()
+
+	def _open(self):
+		if self.fernet is None:
+			return super()._open()
+		return EncryptedBlockStream(
+			file_path=self.baseFilename,
+			fernet=self.fernet,
+			block_size=self.encryption_block_size,
+			flush_interval=self.encryption_flush_interval,
+			encoding=self.encoding
+		)
+
+	# 日付に対応するログファイルのパス
+	def __get_logfile_path(self, target_date: date) -> str:
+		return os.path.join(
+			self.__directory_path,
+			target_date.strftime(self.__date_format) + self.__filename_footer + self.__filename_extension
+		)
+
+	# 日付が変わっていればファイルを切り替え
+	def roll_date(self, today: date | None = None) -> bool:
+		if today is None:
+			today = date.today()
+		if today == self.__current_date:
+			return False
+
+		self.acquire()
+		try:
+			self.__current_date = today
+			if self.stream is not None:
+				self.stream.close()
+				self.stream = None
+			# 次の書き込み時に新しいファイルを開く
+			self.baseFilename = os.path.abspath(self.__get_logfile_path(today))
+		finally:
+			self.release()
+		return True
+
+	def close(self):
+		with self.__handlers_lock:
+			self.__handlers.discard(self)
+		super().close()
+
+	# 日付監視スレッド開始(未起動の場合のみ)
+	@classmethod
+	def __start_watcher(cls) -> None:
+		with cls.__handlers_lock:
+			if (cls.__watcher_thread is not None) and cls.__watcher_thread.is_alive():
+				return
+			cls.__watcher_thread = threading.Thread(
+				target=cls.__watch,
+				name="DateRollingFileHandler",
+				daemon=True
+			)
+			cls.__watcher_thread.start()
+
+	# 次の0時まで待機して全ハンドラの日付を切り替え
+	@classmethod
+	def __watch(cls) -> None:
+		while True:
+			_now: datetime = datetime.now()
+			_next_midnight: datetime = datetime.combine(_now.date() + timedelta(days=1), datetime.min.time())
+			time.sleep(max(0.0, min((_next_midnight - _now).total_seconds(), cls.__max_watch_interval)))
+
+			_today: date = date.today()
+			with cls.__handlers_lock:
+				_handlers: list[DateRollingFileHandler] = list(cls.__handlers)
+			for _handler in _handlers:
+				try:
+					_handler.roll_date(today=_today)
+				except Exception:
+					import traceback
+					traceback.print_exc()
 
 
 @dataclass
@@ -19,17 +459,40 @@ class LoggerWrapper(object):
 
 	# ログファイル保存先関連デフォルト値
 	__default_logfile_dir: str = "log"
-	__default_logfile_filename_header: str = datetime.now().strftime("%Y%m%d")
+	# ヘッダ未指定(None)の場合は日付(日付が変わるとファイルを切り替え)
+	__default_logfile_filename_header: str | None = None
+	__default_logfile_date_format: str = "%Y%m%d"
 	__default_logfile_filename_footer: str = ""
-	__default_logfile_full_filename: str = __default_logfile_filename_header + ".log"
-	__default_logfile_path: str = __default_logfile_dir + "\\" + __default_logfile_full_filename
+
+	# 実行ファイルのディレクトリ(初回のみ算出)
+	__exe_directory_path: ClassVar[str | None] = None
+	# 生成済みのFormatter(フォーマット文字列 -> Formatter)
+	__formatters: ClassVar[dict[str, Formatter]] = {}
+	# 作成済み(存在確認済み)のログ保存先ディレクトリ
+	__made_directories: ClassVar[set[str]] = set()
+	# basicConfig実行済みかどうか
+	__basic_configured: ClassVar[bool] = False
+
+	# 出力先毎の共有ハンドラ(キー -> [ハンドラ, 参照数])
+	__handler_pool: ClassVar[dict[tuple, list]] = {}
+	# ロガー毎のハンドラ追加数((ロガー名, キー) -> 参照数)
+	__handler_attach_counts: ClassVar[dict[tuple[str, tuple], int]] = {}
+	__handler_pool_lock: ClassVar[threading.RLock] = threading.RLock()
+
+	# ロガー名・ログレベル毎の出力件数((ロガー名, レベル名) -> 件数)
+	__record_counters: ClassVar[ShardedCounter] = ShardedCounter()
+	# メッセージテンプレート毎の出力件数((ロガー名, レベル名, メッセージ) -> 件数)
+	__template_counters: ClassVar[ShardedCounter] = ShardedCounter()
+	# Prometheus形式ファイルの定期出力
+	__metrics_export_thread: ClassVar[threading.Thread | None] = None
+	__metrics_export_stop_event: ClassVar[threading.Event] = threading.Event()
 
 	# コンストラクタ
 	def __init__(
 			self,
 			module_name: str = "Default Logger",
 			logfile_dir: str = __default_logfile_dir,
-			logfile_filename_header: str = __default_logfile_filename_header,
+			logfile_filename_header: str | None = __default_logfile_filename_header,
 			logfile_filename_footer: str = __default_logfile_filename_footer,
 			logfile_filename_extension: str = ".log",
 			encoding: str = "utf-8",
@@ -37,10 +500,35 @@ class LoggerWrapper(object):
 			console_output: bool = False,
 			log_rotate: bool = True,
 			max_bytes: int = 1000000,
-			backup_count: int = 10
+			backup_count: int = 10,
+			logfile_date_format: str = __default_logfile_date_format,
+			fernet: Any | None = None,
+			encryption_block_size: int = 64 * 1024,
+			encryption_flush_interval: float = 5.0,
+			timing_summary_interval: float = 60.0,
+			timing_summary_loglevel: int = INFO,
+			count_metrics: bool = True,
+			count_message_templates: bool = False
 	):
-		# モジュール個別のロガーを生成
-		self.__logger: Logger | None = self.__get_new_logger(
+		# ログレベル毎の件数集計
+		self.__count_metrics: bool = count_metrics
+		# メッセージテンプレート(%形式の引数を展開する前の文字列)毎の件数集計
+		self.__count_message_templates: bool = count_message_templates
+
+		# 処理時間計測の集計(名前 -> (経過時間, CPU時間))
+		self.__timings: dict[str, tuple[TimingHistogram, TimingHistogram]] = {}
+		self.__timings_lock: threading.Lock = threading.Lock()
+		# 集計結果をログ出力する間隔
+		self.__timing_summary_interval_ns: int = int(timing_summary_interval * 1_000_000_000)
+		self.__timing_summary_loglevel: int = timing_summary_loglevel
+		self.__next_timing_summary_ns: int = time.perf_counter_ns() + self.__timing_summary_interval_ns
+
+		# モジュール個別のロガーを生成(ハンドラは出力先毎に共有)
+		self.__logger: Logger | None
+		self.__handler_keys: list[tuple]
+		# add_handlerで追加されたハンドラ
+		self.__extra_handlers: list[Handler] = []
+		self.__logger, self.__handler_keys = self.__get_new_logger(
 			name=module_name,
 			logfile_dir=logfile_dir,
 			logfile_filename_header=logfile_filename_header,
@@ -51,13 +539,123 @@ class LoggerWrapper(object):
 			console_output=console_output,
 			log_rotate=log_rotate,
 			max_bytes=max_bytes,
-			backup_count=backup_count
+			backup_count=backup_count,
+			logfile_date_format=logfile_date_format,
+			fernet=fernet,
+			encryption_block_size=encryption_block_size,
+			encryption_flush_interval=encryption_flush_interval
 		)
 
 	# デストラクタ
 	def __del__(self):
-		for handler in self.__logger.handlers:
-			self.__logger.removeHandler(handler)
+		try:
+			self.close()
+		except Exception:
+			# インタプリタ終了時等は無視
+			pass
+
+	# with文対応
+	def __enter__(self) -> "LoggerWrapper":
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.close()
+		return False
+
+	# 共有ハンドラの参照を解放(他のインスタンスが使っていなければファイルを閉じる)
+	def close(self) -> None:
+		_logger: Logger | None = getattr(self, "_LoggerWrapper__logger", None)
+		if _logger is None:
+			return
+		for _key in self.__handler_keys:
+			self.__release_handler(logger=_logger, key=_key)
+		self.__handler_keys = []
+		# 追加されたハンドラはロガーから外すのみ(closeは追加した側で行う)
+		for _handler in self.__extra_handlers:
+			_logger.removeHandler(_handler)
+		self.__extra_handlers = []
+		self.__logger = None
+
+	# ハンドラ追加(AlertDigestHandler等)
+	def add_handler(self, handler: Handler) -> bool:
+		if self.__logger is None:
+			return False
+		self.__logger.addHandler(handler)
+		if handler not in self.__extra_handlers:
+			self.__extra_handlers.append(handler)
+		return True
+
+	# ハンドラ削除
+	def remove_handler(self, handler: Handler) -> bool:
+		if (self.__logger is None) or (handler not in self.__extra_handlers):
+			return False
+		self.__logger.removeHandler(handler)
+		self.__extra_handlers.remove(handler)
+		return True
+
+	# 共有ハンドラを取得してロガーに追加(未生成であればfactoryで生成)
+	# 共有中のハンドラと暗号化の鍵が異なる場合(暗号化の有無が異なる場合を含む)はValueError
+	@classmethod
+	def __acquire_handler(
+			cls,
+			logger: Logger,
+			key: tuple,
+			factory: Callable[[], Handler],
+			fernet: Any | None = None
+	) -> tuple:
+		with cls.__handler_pool_lock:
+			_entry: list | None = cls.__handler_pool.get(key)
+			if (_entry is not None) and (
+					cls.__get_fernet_id(getattr(_entry[0], "fernet", None)) != cls.__get_fernet_id(fernet)
+			):
+				raise ValueError("Log file is already used with a different encryption key: " + str(key))
+			if _entry is None:
+				_entry = [factory(), 0]
+				cls.__handler_pool[key] = _entry
+			_entry[1] += 1
+
+			# 同じロガーには同じハンドラを1度だけ追加
+			_attach_key: tuple[str, tuple] = (logger.name, key)
+			_attach_count: int = cls.__handler_attach_counts.get(_attach_key, 0)
+			if _attach_count == 0:
+				logger.addHandler(_entry[0])
+			cls.__handler_attach_counts[_attach_key] = _attach_count + 1
+		return key
+
+	# 暗号化の鍵の識別子(同じ鍵から生成したインスタンスは同じ値、暗号化なしはNone)
+	@staticmethod
+	def __get_fernet_id(fernet: Any | None) -> str | None:
+		if fernet is None:
+			return None
+		_signing_key: bytes | None = getattr(fernet, "_signing_key", None)
+		_encryption_key: bytes | None = getattr(fernet, "_encryption_key", None)
+		if isinstance(_signing_key, bytes) and isinstance(_encryption_key, bytes):
+			return hashlib.sha256(_signing_key + _encryption_key).hexdigest()
+		# 鍵を取得できない場合はインスタンス毎に別扱い
+		return "id:" + str(id(fernet))
+
+	# 共有ハンドラの参照を解放
+	@classmethod
+	def __release_handler(cls, logger: Logger, key: tuple) -> None:
+		with cls.__handler_pool_lock:
+			_entry: list | None = cls.__handler_pool.get(key)
+			if _entry is None:
+				return
+
+			# ロガーを使うインスタンスがなくなればロガーから外す
+			_attach_key: tuple[str, tuple] = (logger.name, key)
+			_attach_count: int = cls.__handler_attach_counts.get(_attach_key, 0) - 1
+			if _attach_count <= 0:
+				cls.__handler_attach_counts.pop(_attach_key, None)
+				logger.removeHandler(_entry[0])
+			else:
+				cls.__handler_attach_counts[_attach_key] = _attach_count
+
+			# 参照がなくなればハンドラを閉じる
+			_entry[1] -= 1
+			if _entry[1] <= 0:
+				del cls.__handler_pool[key]
+				_entry[0].close()
 
 	@classmethod
 	# ロガー生成
@@ -66,7 +664,7 @@ class LoggerWrapper(object):
 			name: str = __name__,
 			formatter_str: str = __default_formatter_str,
 			logfile_dir: str = __default_logfile_dir,
-			logfile_filename_header: str = __default_logfile_filename_header,
+			logfile_filename_header: str | None = __default_logfile_filename_header,
 			logfile_filename_footer: str = __default_logfile_filename_footer,
 			logfile_filename_extension: str = ".log",
 			encoding: str = "utf-8",
@@ -74,55 +672,121 @@ class LoggerWrapper(object):
 			console_output: bool = False,
 			log_rotate: bool = True,
 			max_bytes: int = 1000000,
-			backup_count: int = 10
-	) -> Logger | None:
+			backup_count: int = 10,
+			logfile_date_format: str = __default_logfile_date_format,
+			fernet: Any | None = None,
+			encryption_block_size: int = 64 * 1024,
+			encryption_flush_interval: float = 5.0
+	) -> tuple[Logger | None, list[tuple]]:
 		_logger: Logger | None = None
+		_handler_keys: list[tuple] = []
 		try:
 			# generate logger
 			_logger: Logger = getLogger(name)
 
-			# formatter
-			_formatter: Formatter = Formatter(formatter_str)
+			# formatter(同じフォーマットであれば使い回す)
+			_formatter: Formatter = cls.__get_formatter(formatter_str=formatter_str)
 
-			# StreamHandler
+			# StreamHandler(全ロガーで共有)
 			if console_output:
-				# create StreamHandler
-				_stream_handler: StreamHandler = StreamHandler()
-				# set StreamHandler to logger
-				_stream_handler.setFormatter(_formatter)
-				_logger.addHandler(_stream_handler)
+				def _create_stream_handler() -> Handler:
+					# create StreamHandler
+					_stream_handler: StreamHandler = StreamHandler()
+					_stream_handler.setFormatter(_formatter)
+					return _stream_handler
 
-			# ログ保存先
-			_logfile_path = logfile_dir + "\\" + logfile_filename_header + logfile_filename_footer + logfile_filename_extension
+				# set StreamHandler to logger
+				_handler_keys.append(
+					cls.__acquire_handler(
+						logger=_logger,
+						key=("console", formatter_str),
+						factory=_create_stream_handler
+					)
+				)
 
-			_exe_directory_path_with_slash: str = os.path.dirname(sys.argv[0])
-			_exe_directory_path: str = _exe_directory_path_with_slash.replace('/', '\\')
-			_logfile_path = _exe_directory_path + "\\" + _logfile_path
-			_log_directory_path = os.path.dirname(_logfile_path)
+			# ログ保存先(実行ファイルのディレクトリからの相対パス)
+			_log_directory_path: str = os.path.join(cls.__get_exe_directory_path(), logfile_dir)
 
-			# ログ保存先のディレクトリがなければ作成
-			cls.__make_directories(directory_path=_log_directory_path)
+			# ログ保存先のディレクトリがなければ作成(確認済みのディレクトリは省略)
+			if _log_directory_path not in cls.__made_directories:
+				if cls.__make_directories(directory_path=_log_directory_path):
+					cls.__made_directories.add(_log_directory_path)
 
 			# ファイル出力設定
 			if _logger is not None:
 				# FileHandler
+				# 同じファイルへの出力は1つのハンドラを共有(ローテーション設定等は最初の設定を利用)
 				try:
-					# ログファイルのローテーション
-					if log_rotate:
-						_file_handler = RotatingFileHandler(
-							filename=_logfile_path,
-							encoding=encoding,
-							maxBytes=max_bytes,
-							backupCount=backup_count
+					if logfile_filename_header is None:
+						# ファイル名が日付の場合は日付が変わるとファイルを切り替え
+						_key: tuple = (
+							"date", _log_directory_path, logfile_date_format,
+							logfile_filename_footer, logfile_filename_extension
 						)
+
+						def _create_file_handler() -> Handler:
+							return DateRollingFileHandler(
+								directory_path=_log_directory_path,
+								filename_footer=logfile_filename_footer,
+								filename_extension=logfile_filename_extension,
+								date_format=logfile_date_format,
+								encoding=encoding,
+								max_bytes=max_bytes if log_rotate else 0,
+								backup_count=backup_count if log_rotate else 0,
+								fernet=fernet,
+								encryption_block_size=encryption_block_size,
+								encryption_flush_interval=encryption_flush_interval
+							)
 					else:
-						_file_handler = FileHandler(
-							filename=_logfile_path,
-							encoding=encoding
+						_logfile_path: str = os.path.join(
+							_log_directory_path,
+							logfile_filename_header + logfile_filename_footer + logfile_filename_extension
+						)
+						_key = ("file", _logfile_path)
+
+						def _create_file_handler() -> Handler:
+							# 暗号化ブロック形式
+							if fernet is not None:
+								return EncryptedRotatingFileHandler(
+									filename=_logfile_path,
+									fernet=fernet,
+									block_size=encryption_block_size,
+									flush_interval=encryption_flush_interval,
+									encoding=encoding,
+									max_bytes=max_bytes if log_rotate else 0,
+									backup_count=backup_count if log_rotate else 0
+								)
+							# ログファイルのローテーション
+							if log_rotate:
+								return RotatingFileHandler(
+									filename=_logfile_path,
+									encoding=encoding,
+									maxBytes=max_bytes,
+									backupCount=backup_count
+								)
+							else:
+								return FileHandler(
+									filename=_logfile_path,
+									encoding=encoding
+								)
+
+					def _create_formatted_file_handler() -> Handler:
+						_file_handler: Handler = _create_file_handler()
+						_file_handler.setFormatter(_formatter)
+						return _file_handler
+
+					_handler_keys.append(
+						cls.__acquire_handler(
+							logger=_logger,
+							key=_key,
+							factory=_create_formatted_file_handler,
+							fernet=fernet
 						)
-					_file_handler.setFormatter(_formatter)
-					_logger.addHandler(_file_handler)
-					basicConfig(level=loglevel)
+					)
+					# basicConfigは初回のみ(2回目以降は何もしないため)
+					if not cls.__basic_configured:
+						basicConfig(level=loglevel)
+						cls.__basic_configured = True
 					_logger.debug("Logger初期化完了")
 				except Exception as ex:
 					_logger.exception(ex)
@@ -131,13 +795,30 @@ class LoggerWrapper(object):
 			traceback.print_exc()
 			_logger = None
 
-		return _logger
+		return _logger, _handler_keys
+
+	# 実行ファイルのディレクトリ(初回のみ算出)
+	@classmethod
+	def __get_exe_directory_path(cls) -> str:
+		if cls.__exe_directory_path is None:
+			cls.__exe_directory_path = os.path.abspath(os.path.dirname(sys.argv[0]))
+		return cls.__exe_directory_path
+
+	# Formatter取得(フォーマット文字列毎に使い回す)
+	@classmethod
+	def __get_formatter(cls, formatter_str: str) -> Formatter:
+		_formatter: Formatter | None = cls.__formatters.get(formatter_str)
+		if _formatter is None:
+			_formatter = Formatter(formatter_str)
+			cls.__formatters[formatter_str] = _formatter
+		return _formatter
 
 	# ラッパー関数
 	def debug(self, msg: str, *args, **kwargs) -> bool:
 		if self.__logger is not None:
 			# ロガーが初期化されている場合
-			self.__logger.debug(msg=msg, *args, **kwargs)
+			self.__count(level=DEBUG, level_name="DEBUG", msg=msg)
+			self.__logger.debug(msg, *args, **kwargs)
 			return True
 		else:
 			print("No logger is found. : " + msg)
@@ -145,7 +826,8 @@ class LoggerWrapper(object):
 
 	def info(self, msg: str, *args, **kwargs) -> bool:
 		if self.__logger is not None:
-			self.__logger.info(msg=msg, *args, **kwargs)
+			self.__count(level=INFO, level_name="INFO", msg=msg)
+			self.__logger.info(msg, *args, **kwargs)
 			return True
 		else:
 			print("No logger is found. : " + msg)
@@ -153,7 +835,8 @@ class LoggerWrapper(object):
 
 	def warning(self, msg: str, *args, **kwargs) -> bool:
 		if self.__logger is not None:
-			self.__logger.warning(msg=msg, *args, **kwargs)
+			self.__count(level=WARNING, level_name="WARNING", msg=msg)
+			self.__logger.warning(msg, *args, **kwargs)
 			return True
 		else:
 			print("No logger is found. : " + msg)
@@ -161,7 +844,8 @@ class LoggerWrapper(object):
 
 	def error(self, msg: str, *args, **kwargs) -> bool:
 		if self.__logger is not None:
-			self.__logger.error(msg=msg, *args, **kwargs)
+			self.__count(level=ERROR, level_name="ERROR", msg=msg)
+			self.__logger.error(msg, *args, **kwargs)
 			return True
 		else:
 			print("No logger is found. : " + msg)
@@ -169,7 +853,8 @@ class LoggerWrapper(object):
 
 	def critical(self, msg: str, *args, **kwargs) -> bool:
 		if self.__logger is not None:
-			self.__logger.critical(msg=msg, *args, **kwargs)
+			self.__count(level=CRITICAL, level_name="CRITICAL", msg=msg)
+			self.__logger.critical(msg, *args, **kwargs)
 			return True
 		else:
 			print("No logger is found. : " + msg)
@@ -177,12 +862,184 @@ class LoggerWrapper(object):
 
 	def exception(self, msg: str, *args, exc_info: bool = True, **kwargs) -> bool:
 		if self.__logger is not None:
-			self.__logger.exception(msg=msg, *args, exc_info=exc_info, **kwargs)
+			self.__count(level=ERROR, level_name="ERROR", msg=msg)
+			self.__logger.exception(msg, *args, exc_info=exc_info, **kwargs)
 			return True
 		else:
 			print("No logger is found. : " + msg)
 			return False
 
+	# 出力件数の集計(出力対象のレベルのみ)
+	def __count(self, level: int, level_name: str, msg: str) -> None:
+		if self.__count_metrics and self.__logger.isEnabledFor(level):
+			self.__record_counters.increment((self.__logger.name, level_name))
+			if self.__count_message_templates:
+				self.__template_counters.increment((self.__logger.name, level_name, str(msg)))
+
+	# ロガー名・ログレベル毎の出力件数(プロセス起動時からの累計)
+	@classmethod
+	def get_metrics_snapshot(cls) -> dict[str, dict[str, int]]:
+		_snapshot: dict[str, dict[str, int]] = {}
+		for (_logger_name, _level_name), _count in cls.__record_counters.get_snapshot().items():
+			_snapshot.setdefault(_logger_name, {})[_level_name] = _count
+		return _snapshot
+
+	# メッセージテンプレート毎の出力件数(count_message_templates=Trueのロガーのみ)
+	@classmethod
+	def get_message_template_counts(cls) -> dict[tuple[str, str, str], int]:
+		return cls.__template_counters.get_snapshot()
+
+	# Prometheusのテキスト形式で出力(一時ファイルに書いてから置き換え)
+	@classmethod
+	def write_prometheus_metrics(cls, file_path: str) -> bool:
+		_lines: list[str] = [
+			"# HELP logger_records_total Number of log records emitted through LoggerWrapper.",
+			"# TYPE logger_records_total counter"
+		]
+		for (_logger_name, _level_name), _count in sorted(cls.__record_counters.get_snapshot().items()):
+			_lines.append(
+				'logger_records_total{logger="%s",level="%s"} %d'
+				% (cls.__escape_label(_logger_name), _level_name, _count)
+			)
+
+		_template_counts: dict[tuple, int] = cls.__template_counters.get_snapshot()
+		if len(_template_counts) > 0:
+			_lines.append("# HELP logger_message_template_records_total Number of log records per message template.")
+			_lines.append("# TYPE logger_message_template_records_total counter")
+			for (_logger_name, _level_name, _template), _count in sorted(_template_counts.items()):
+				_lines.append(
+					'logger_message_template_records_total{logger="%s",level="%s",template="%s"} %d'
+					% (cls.__escape_label(_logger_name), _level_name, cls.__escape_label(_template), _count)
+				)
+
+		try:
+			_directory_path: str = os.path.dirname(os.path.abspath(file_path))
+			if not cls.__make_directories(directory_path=_directory_path):
+				return False
+			_temporary_file_path: str = file_path + ".tmp"
+			with open(_temporary_file_path, "w", encoding="utf-8") as _file:
+				_file.write("\n".join(_lines) + "\n")
+			os.replace(_temporary_file_path, file_path)
+		except OSError:
+			import traceback
+			traceback.print_exc()
+			return False
+		return True
+
+	# 一定間隔でPrometheus形式ファイルを出力(node_exporterのtextfile collector等で収集)
+	@classmethod
+	def start_metrics_export(cls, file_path: str, interval: float = 15.0) -> None:
+		cls.stop_metrics_export()
+		cls.__metrics_export_stop_event = threading.Event()
+		_stop_event: threading.Event = cls.__metrics_export_stop_event
+
+		def _export() -> None:
+			while not _stop_event.wait(timeout=interval):
+				cls.write_prometheus_metrics(file_path=file_path)
+			# 停止時に最終値を出力
+			cls.write_prometheus_metrics(file_path=file_path)
+
+		cls.__metrics_export_thread = threading.Thread(target=_export, name="LoggerWrapperMetrics", daemon=True)
+		cls.__metrics_export_thread.start()
+
+	# 定期出力の停止
+	@classmethod
+	def stop_metrics_export(cls) -> None:
+		_thread: threading.Thread | None = cls.__metrics_export_thread
+		if _thread is None:
+			return
+		cls.__metrics_export_stop_event.set()
+		_thread.join()
+		cls.__metrics_export_thread = None
+
+	# Prometheusのラベル値のエスケープ
+	@staticmethod
+	def __escape_label(value: str) -> str:
+		return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+	# 処理時間計測(with文・デコレータ)
+	# 例: with logger.measure("query"): ... / @logger.measure("query")
+	# with文で使う場合は計測毎に生成する(スレッド間で使い回さない)
+	def measure(self, name: str) -> TimingMeasurement:
+		return TimingMeasurement(logger_wrapper=self, name=name)
+
+	# 計測結果を記録(一定間隔毎に集計結果をログ出力)
+	def record_timing(self, name: str, wall_ns: int, cpu_ns: int) -> None:
+		_now_ns: int = time.perf_counter_ns()
+		with self.__timings_lock:
+			_histograms: tuple[TimingHistogram, TimingHistogram] | None = self.__timings.get(name)
+			if _histograms is None:
+				_histograms = (TimingHistogram(), TimingHistogram())
+				self.__timings[name] = _histograms
+			_histograms[0].record(wall_ns)
+			_histograms[1].record(cpu_ns)
+
+			# 出力間隔に達していなければ終了
+			if (self.__timing_summary_interval_ns <= 0) or (_now_ns < self.__next_timing_summary_ns):
+				return
+			self.__next_timing_summary_ns = _now_ns + self.__timing_summary_interval_ns
+
+		self.log_timing_summary()
+
+	# 集計結果を取得(単位: ミリ秒)
+	def get_timing_summary(self, reset: bool = False) -> dict[str, dict]:
+		_summary: dict[str, dict] = {}
+		with self.__timings_lock:
+			for _name, (_wall, _cpu) in self.__timings.items():
+				if _wall.count == 0:
+					continue
+				_summary[_name] = {
+					"count": _wall.count,
+					"wall": self.__get_histogram_summary(_wall),
+					"cpu": self.__get_histogram_summary(_cpu)
+				}
+				if reset:
+					_wall.reset()
+					_cpu.reset()
+		return _summary
+
+	# 集計結果をログ出力して初期化
+	def log_timing_summary(self) -> None:
+		if self.__logger is None:
+			return
+		for _name, _values in self.get_timing_summary(reset=True).items():
+			_wall: dict = _values["wall"]
+			_cpu: dict = _values["cpu"]
+			self.__logger.log(
+				self.__timing_summary_loglevel,
+				"timing [%s] count=%d wall(ms) mean=%.3f p50=%.3f p90=%.3f p99=%.3f max=%.3f "
+				"cpu(ms) mean=%.3f p99=%.3f",
+				_name, _values["count"],
+				_wall["mean"], _wall["p50"], _wall["p90"], _wall["p99"], _wall["max"],
+				_cpu["mean"], _cpu["p99"]
+			)
+
+	@staticmethod
+	def __get_histogram_summary(histogram: TimingHistogram) -> dict[str, float]:
+		return {
+			"mean": histogram.get_mean() / 1_000_000,
+			"min": histogram.min_ns / 1_000_000,
+			"p50": histogram.get_percentile(50) / 1_000_000,
+			"p90": histogram.get_percentile(90) / 1_000_000,
+			"p99": histogram.get_percentile(99) / 1_000_000,
+			"max": histogram.max_ns / 1_000_000
+		}
+
+	# 暗号化されたログファイルの読み込み(fernet: 書き込み時と同じ鍵のFernetWrapper)
+	@staticmethod
+	def read_encrypted_log(file_path: str, fernet: Any, encoding: str = "utf-8") -> Iterator[str]:
+		return EncryptedBlockStream.read(file_path=file_path, fernet=fernet, encoding=encoding)
+
+	# 出力先ログファイルのパス一覧(LogIndexer等で利用)
+	def get_logfile_paths(self) -> list[str]:
+		if self.__logger is None:
+			return []
+		return [
+			handler.baseFilename
+			for handler in self.__logger.handlers
+			if isinstance(handler, FileHandler)
+		]
+
 	# ディレクトリが無ければ作成
 	@classmethod
 	def __make_directories(cls, directory_path: str, output_trace: bool = True) -> bool:
@@ -210,13 +1067,13 @@ class LoggerWrapper(object):
 
 		# 古いファイルを移動する用のディレクトリ作成
 		_trash_directory_name = "trash"
-		_trash_directory_path = directory_path + "\\" + _trash_directory_name
+		_trash_directory_path = os.path.join(directory_path, _trash_directory_name)
 		if not self.__make_directories(_trash_directory_path):
 			return
 
 		for _old_filename in _old_filename_list:
-			_source_path = directory_path + "\\" + _old_filename
-			_destination_path = _trash_directory_path + "\\" + _old_filename
+			_source_path = os.path.join(directory_path, _old_filename)
+			_destination_path = os.path.join(_trash_directory_path, _old_filename)
 			# ファイルアクセス可能か(開かれていないか)確認
 			if not self.__is_file_open(_source_path):
 				try:
@@ -255,7 +1112,7 @@ class LoggerWrapper(object):
 		# ファイル一覧取得・チェック
 		_file_or_directory_name_list: list[str] = os.listdir(directory_path)
 		for _file_or_directory_name in _file_or_directory_name_list:
-			_file_or_directory_full_path: str = directory_path + "\\" + _file_or_directory_name
+			_file_or_directory_full_path: str = os.path.join(directory_path, _file_or_directory_name)
 
 			# ディレクトリでないことを確認
 			if not os.path.isfile(_file_or_directory_full_path):
@@ -277,7 +1134,7 @@ class LoggerWrapper(object):
 
 	# 古いファイル削除
 	def delete_old_files_directory(self, directory_path: str, trash_directory_name: str = "trash"):
-		_trash_directory_path = directory_path + "\\" + trash_directory_name
+		_trash_directory_path = os.path.join(directory_path, trash_directory_name)
 		if os.path.exists(_trash_directory_path):
 			try:
 				# ディレクトリごと削除
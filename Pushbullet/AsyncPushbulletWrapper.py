@@ -0,0 +1,341 @@
+# required packages:
+# pushbullet.py
+# aiohttp
+
+from pushbullet import PushbulletError, InvalidKeyError, PushError
+from pushbullet.filetype import get_file_type
+from typing import Any, BinaryIO
+import asyncio
+import traceback
+import aiohttp
+
+
+# PushbulletWrapperのasyncio版(イベントループをブロックしない)
+# デバイスはAPIのデバイス情報(dict)で扱う。only_target/catch_exception/output_traceの動作はPushbulletWrapperと同じ
+# 例:
+#   async with AsyncPushbulletWrapper(api_key="...", target_device_nicknames=["phone"]) as pushbullet:
+#       await pushbullet.push_note(title="...", body="...")
+class AsyncPushbulletWrapper(object):
+	# Pushbullet API URL
+	API_BASE_URL: str = "https://api.pushbullet.com/v2"
+
+	def __init__(
+			self,
+			api_key: str,
+			target_device_nicknames: list[str] | None = None,
+			# 以下オプション(同時送信数・コネクションプール・タイムアウト)
+			max_concurrency: int = 10,
+			pool_size: int = 100,
+			connect_timeout: float = 5.0,
+			total_timeout: float = 30.0,
+			upload_timeout: float = 600.0,
+			api_base_url: str | None = None
+	) -> None:
+		self.api_key: str = api_key
+		self.api_base_url: str = (api_base_url or self.API_BASE_URL).rstrip("/")
+		self.max_concurrency: int = max(1, max_concurrency)
+		self.pool_size: int = pool_size
+		self.timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+		# ファイル本体のアップロードは別のタイムアウト
+		self.upload_timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(
+			total=upload_timeout,
+			connect=connect_timeout
+		)
+
+		# デバイス一覧(初回の送信時またはload_devicesで取得)
+		self.devices: list[dict] | None = None
+		self.target_devices: list[dict] = []
+		self.target_device_nicknames: list[str] = []
+		self.__requested_nicknames: list[str] = list(target_device_nicknames or [])
+
+		# セッション・セマフォはイベントループ上で生成する
+		self.__session: aiohttp.ClientSession | None = None
+		self.__semaphore: asyncio.Semaphore | None = None
+
+	# async with文対応
+	async def __aenter__(self) -> "AsyncPushbulletWrapper":
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		await self.close()
+		return False
+
+	# セッション(プール中の接続)を閉じる
+	async def close(self) -> None:
+		if self.__session is not None:
+			await self.__session.close()
+			self.__session = None
+		self.__semaphore = None
+
+	# 有効なデバイス一覧を取得
+	async def load_devices(self) -> list[dict]:
+		_response: dict = await self.__request(method="GET", path="/devices")
+		self.devices = [_device for _device in _response.get("devices", []) if _device.get("active")]
+		return self.devices
+
+	# 特定のデバイスを抽出して保持
+	async def set_target_devices(
+			self,
+			target_device_nicknames: list[str] | None = None,
+			force_reset: bool = False
+	) -> None:
+		# 強制リセットのフラグが立っている場合 または デバイス名の指定がない場合
+		if force_reset or (target_device_nicknames is None) or (len(target_device_nicknames) == 0):
+			self.__requested_nicknames = []
+			self.target_device_nicknames = []
+			self.target_devices = []
+			return
+
+		self.__requested_nicknames = list(target_device_nicknames)
+		if self.devices is None:
+			await self.load_devices()
+
+		# 指定したnicknameに合致するデバイスのみ抽出
+		_nicknames: set[str] = set(target_device_nicknames)
+		self.target_devices = [_device for _device in self.devices if _device.get("nickname") in _nicknames]
+
+		# 抽出成功したデバイス名を改めて記録
+		self.target_device_nicknames = [_device.get("nickname") for _device in self.target_devices]
+
+	# メソッド拡張(push_note)
+	async def push_note(
+			self,
+			title: str,
+			body: str,
+			# 以下オプション
+			device: Any = None,
+			chat: Any = None,
+			email: str | None = None,
+			channel: Any = None,
+			# 独自追加
+			only_target: bool = True,
+			catch_exception: bool = False,
+			output_trace: bool = True
+	) -> list[dict[str, Any]]:
+		return await self.__push(
+			data={"type": "note", "title": title, "body": body},
+			recipient={"device": device, "chat": chat, "email": email, "channel": channel},
+			only_target=only_target,
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
+
+	# メソッド拡張(push_link)
+	async def push_link(
+			self,
+			title: str,
+			url: str,
+			# 以下オプション
+			body: str | None = None,
+			device: Any = None,
+			chat: Any = None,
+			email: str | None = None,
+			channel: Any = None,
+			# 独自追加
+			only_target: bool = True,
+			catch_exception: bool = False,
+			output_trace: bool = True
+	) -> list[dict[str, Any]]:
+		return await self.__push(
+			data={"type": "link", "title": title, "url": url, "body": body},
+			recipient={"device": device, "chat": chat, "email": email, "channel": channel},
+			only_target=only_target,
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
+
+	# メソッド拡張(upload_file)
+	async def upload_file(
+			self,
+			f: BinaryIO,
+			file_name: str,
+			# 以下オプション
+			file_type: str | None = None,
+			# 独自追加
+			catch_exception: bool = False,
+			output_trace: bool = True
+	) -> dict | None:
+		try:
+			if not file_type:
+				file_type = get_file_type(f, file_name)
+
+			# アップロード先の取得
+			_upload_request: dict = await self.__request(
+				method="POST",
+				path="/upload-request",
+				json_data={"file_name": file_name, "file_type": file_type}
+			)
+
+			# ファイル本体のアップロード(aiohttpがファイルを分割して読み込みながら送信、APIキーは送らない)
+			_form: aiohttp.FormData = aiohttp.FormData()
+			for _name, _value in (_upload_request.get("data") or {}).items():
+				_form.add_field(_name, str(_value))
+			_form.add_field("file", f, filename=file_name, content_type=file_type)
+			async with self.__get_semaphore():
+				async with self.__get_session().post(
+						url=_upload_request["upload_url"],
+						data=_form,
+						timeout=self.upload_timeout
+				) as _response:
+					await _response.read()
+					if _response.status >= 400:
+						raise PushbulletError("upload failed: " + str(_response.status))
+
+			return {"file_type": file_type, "file_url": _upload_request.get("file_url"), "file_name": file_name}
+		except Exception as e:
+			if catch_exception:
+				# 例外をcatchする場合
+				if output_trace:
+					# トレースを出力
+					traceback.print_exc()
+			else:
+				# 例外をcatchしない場合はそのままraise
+				raise e
+		return None
+
+	# メソッド拡張(push_file)
+	async def push_file(
+			self,
+			file_name: str,
+			file_url: str,
+			file_type: str,
+			# 以下オプション
+			body: str | None = None,
+			title: str | None = None,
+			device: Any = None,
+			chat: Any = None,
+			email: str | None = None,
+			channel: Any = None,
+			# 独自追加
+			only_target: bool = True,
+			catch_exception: bool = False,
+			output_trace: bool = True
+	) -> list[dict[str, Any]]:
+		_data: dict = {"type": "file", "file_type": file_type, "file_url": file_url, "file_name": file_name}
+		if body:
+			_data["body"] = body
+		if title:
+			_data["title"] = title
+		return await self.__push(
+			data=_data,
+			recipient={"device": device, "chat": chat, "email": email, "channel": channel},
+			only_target=only_target,
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
+
+	# 送信(抽出したデバイスが複数ある場合は同時に送信)
+	# 失敗したデバイスがあっても残りのデバイスには送信し、catch_exception=Falseの場合は最後に最初の例外をraise
+	async def __push(
+			self,
+			data: dict,
+			recipient: dict[str, Any],
+			only_target: bool,
+			catch_exception: bool,
+			output_trace: bool
+	) -> list[dict[str, Any]]:
+		_results: list[dict[str, Any]] = []
+		try:
+			# 初回はデバイス一覧を取得して通知対象を抽出
+			if only_target and (self.devices is None) and (len(self.__requested_nicknames) > 0):
+				await self.set_target_devices(target_device_nicknames=self.__requested_nicknames)
+
+			if only_target and len(self.target_devices) > 0:
+				# 抽出したデバイスにのみ送信
+				_payloads: list[tuple[Any, dict]] = [
+					(_device, dict(data, device_iden=_device.get("iden"))) for _device in self.target_devices
+				]
+			else:
+				# 全デバイスに送信
+				_payloads = [(recipient["device"], dict(data, **self.__get_recipient(**recipient)))]
+		except Exception as e:
+			_results.append({"device": None, "result": None, "error": e})
+		else:
+			_responses: list = await asyncio.gather(
+				*[self.__request(method="POST", path="/pushes", json_data=_payload) for _device, _payload in _payloads],
+				return_exceptions=True
+			)
+			for (_device, _payload), _response in zip(_payloads, _responses):
+				if isinstance(_response, BaseException):
+					_results.append({"device": _device, "result": None, "error": _response})
+				else:
+					_results.append({"device": _device, "result": _response, "error": None})
+
+		_errors: list[BaseException] = [_result["error"] for _result in _results if _result["error"] is not None]
+		if len(_errors) > 0:
+			if catch_exception:
+				# 例外をcatchする場合
+				if output_trace:
+					# トレースを出力
+					for _error in _errors:
+						traceback.print_exception(_error)
+			else:
+				# 例外をcatchしない場合は最初の例外をraise
+				raise _errors[0]
+
+		return _results
+
+	# APIリクエスト(レスポンスのJSONを返す、pushesの場合はレート制限の情報を追加)
+	async def __request(
+			self,
+			method: str,
+			path: str,
+			json_data: dict | None = None
+	) -> dict:
+		async with self.__get_semaphore():
+			async with self.__get_session().request(
+					method=method,
+					url=self.api_base_url + path,
+					json=json_data,
+					headers={"Access-Token": self.api_key}
+			) as _response:
+				_text: str = await _response.text()
+				if _response.status in (401, 403):
+					raise InvalidKeyError()
+				elif _response.status == 429:
+					raise PushbulletError("Too Many Requests, you have been ratelimited")
+				elif _response.status != 200:
+					raise PushError(_text) if path == "/pushes" else PushbulletError(_response.status)
+
+				_json: dict = await _response.json(content_type=None)
+				if path == "/pushes":
+					_json["rate_limit"] = {
+						"reset": _response.headers.get("X-Ratelimit-Reset"),
+						"limit": _response.headers.get("X-Ratelimit-Limit"),
+						"remaining": _response.headers.get("X-Ratelimit-Remaining")
+					}
+				return _json
+
+	# 送信先(pushbulletのDevice/Chat/Channelオブジェクトまたはdict/文字列)
+	@staticmethod
+	def __get_recipient(device: Any = None, chat: Any = None, email: str | None = None, channel: Any = None) -> dict:
+		if device:
+			if isinstance(device, dict):
+				return {"device_iden": device.get("iden")}
+			return {"device_iden": getattr(device, "device_iden", device)}
+		elif chat:
+			if isinstance(chat, dict):
+				return {"email": chat.get("with", {}).get("email")}
+			return {"email": getattr(chat, "email", chat)}
+		elif email:
+			return {"email": email}
+		elif channel:
+			if isinstance(channel, dict):
+				return {"channel_tag": channel.get("tag")}
+			return {"channel_tag": getattr(channel, "channel_tag", channel)}
+		return {}
+
+	# セッション取得(初回のみ生成)
+	def __get_session(self) -> aiohttp.ClientSession:
+		if (self.__session is None) or self.__session.closed:
+			self.__session = aiohttp.ClientSession(
+				connector=aiohttp.TCPConnector(limit=self.pool_size),
+				timeout=self.timeout
+			)
+		return self.__session
+
+	# セマフォ取得(初回のみ生成)
+	def __get_semaphore(self) -> asyncio.Semaphore:
+		if self.__semaphore is None:
+			self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+		return self.__semaphore
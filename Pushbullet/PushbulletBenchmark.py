@@ -0,0 +1,118 @@
+# Pushbulletの送信ベンチマーク(ローカルのスタブサーバに対して実行)
+# 1デバイスへの連続送信のスループットと、複数デバイスへの送信(ファンアウト)の遅延を順番送信・同時送信で比較する
+# 実行例:
+#   python Pushbullet/PushbulletBenchmark.py --requests 500 --devices 4 --latency 0.02 --output pushbullet_benchmark.json
+
+from PushbulletWrapper import PushbulletWrapper
+from PushbulletStubServer import PushbulletStubServer
+from datetime import datetime
+import argparse
+import json
+import platform
+import sys
+import time
+
+
+# 遅延の集計
+def summarize_latencies(latencies_ns: list[int]) -> dict:
+	_sorted: list[int] = sorted(latencies_ns)
+
+	def _percentile(percentile: float) -> float:
+		_index: int = min(len(_sorted) - 1, int(len(_sorted) * percentile / 100.0))
+		return _sorted[_index] / 1_000_000
+
+	_total_ns: int = sum(_sorted)
+	return {
+		"requests": len(_sorted),
+		"requests_per_sec": len(_sorted) / (_total_ns / 1_000_000_000) if _total_ns > 0 else 0.0,
+		"latency_ms": {
+			"mean": _total_ns / len(_sorted) / 1_000_000,
+			"p50": _percentile(50),
+			"p90": _percentile(90),
+			"p99": _percentile(99),
+			"max": _sorted[-1] / 1_000_000
+		}
+	}
+
+
+# 1デバイスへ連続送信(セッションの接続を使い回す)
+def run_single_device(pushbullet: PushbulletWrapper, count: int) -> list[int]:
+	_device = pushbullet.devices[0]
+	_latencies_ns: list[int] = []
+	for _index in range(count):
+		_start_ns: int = time.perf_counter_ns()
+		pushbullet.push_note(title="benchmark", body=str(_index), device=_device, only_target=False)
+		_latencies_ns.append(time.perf_counter_ns() - _start_ns)
+	return _latencies_ns
+
+
+# 通知対象の全デバイスへ送信(1回の呼び出しが全デバイスへの送信を終えるまでの時間)
+def run_fan_out(pushbullet: PushbulletWrapper, count: int) -> list[int]:
+	_latencies_ns: list[int] = []
+	for _index in range(count):
+		_start_ns: int = time.perf_counter_ns()
+		pushbullet.push_note(title="benchmark", body=str(_index))
+		_latencies_ns.append(time.perf_counter_ns() - _start_ns)
+	return _latencies_ns
+
+
+def main(argv: list[str] | None = None) -> int:
+	_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Pushbullet benchmark")
+	_parser.add_argument("--requests", type=int, default=500)
+	_parser.add_argument("--devices", type=int, default=4)
+	# スタブサーバの応答遅延(秒、ネットワーク越しのAPIを模擬)
+	_parser.add_argument("--latency", type=float, default=0.02)
+	_parser.add_argument("--output", type=str, default="pushbullet_benchmark.json")
+	_args: argparse.Namespace = _parser.parse_args(argv)
+
+	_nicknames: list[str] = ["benchmark-" + str(_index) for _index in range(max(1, _args.devices))]
+	_results: list[dict] = []
+	with PushbulletStubServer(device_nicknames=_nicknames, latency=_args.latency) as _server:
+		for _mode, _push_max_workers in (
+				("fan-out sequential (push_max_workers=1)", 1),
+				("fan-out concurrent (push_max_workers=" + str(len(_nicknames)) + ")", len(_nicknames))
+		):
+			_pushbullet: PushbulletWrapper = PushbulletWrapper(
+				api_key="benchmark-key",
+				target_device_nicknames=_nicknames,
+				use_device_cache=False,
+				push_max_workers=_push_max_workers,
+				api_base_url=_server.api_base_url
+			)
+			try:
+				# ウォームアップ
+				run_fan_out(_pushbullet, 5)
+
+				if _push_max_workers == 1:
+					_result: dict = {"mode": "single device"}
+					_result.update(summarize_latencies(run_single_device(_pushbullet, _args.requests)))
+					_results.append(_result)
+
+				_result = {"mode": _mode, "devices": len(_nicknames)}
+				_result.update(summarize_latencies(run_fan_out(_pushbullet, max(1, _args.requests // len(_nicknames)))))
+				_results.append(_result)
+			finally:
+				_pushbullet.close()
+
+		_status_counts: dict[int, int] = dict(_server.status_counts)
+
+	_report: dict = {
+		"meta": {
+			"timestamp": datetime.now().isoformat(),
+			"python": sys.version,
+			"platform": platform.platform(),
+			"args": vars(_args),
+			"status_counts": _status_counts
+		},
+		"results": _results
+	}
+	with open(_args.output, "w", encoding="utf-8") as _file:
+		json.dump(_report, _file, indent=2)
+
+	for _result in _results:
+		print(json.dumps(_result, ensure_ascii=False))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,285 @@
+from PushbulletWrapper import PushbulletWrapper
+from pushbullet import Pushbullet
+from requests import Response, RequestException
+from concurrent.futures import Future, InvalidStateError
+from typing import Any
+import heapq
+import queue
+import random
+import threading
+import time
+
+
+# PushbulletWrapperの送信をバックグラウンドで行うディスパッチャ
+# レスポンスヘッダー(X-Ratelimit-*)からアカウントの残り回数を把握し、上限に達したらリセット時刻まで送信を待つ
+# 429/5xx・通信エラーは指数バックオフ(ジッター付き)で再送する
+# 例:
+#   dispatcher = PushbulletDispatcher(pushbullet=PushbulletWrapper(api_key="...", target_device_nicknames=["phone"]))
+#   future = dispatcher.push_note(title="...", body="...")  # すぐに返る
+#   results = future.result()  # デバイス毎の{"device", "result", "error"}
+class PushbulletDispatcher(object):
+	# 再送対象のステータスコード
+	RETRY_STATUS_CODES: tuple[int, ...] = (429, 500, 502, 503, 504)
+	# キューが一杯の場合の動作
+	OVERFLOW_BLOCK: str = "block"
+	OVERFLOW_DROP: str = "drop"
+
+	def __init__(
+			self,
+			pushbullet: PushbulletWrapper,
+			workers: int = 2,
+			queue_size: int = 1000,
+			overflow_policy: str = "block",
+			# overflow_policy="block"の場合の待ち時間の上限(Noneの場合は空くまで待つ)
+			block_timeout: float | None = None,
+			max_retries: int = 5,
+			backoff_base: float = 1.0,
+			backoff_max: float = 60.0,
+			# 他の送信元のために残しておく回数
+			quota_reserve: int = 0
+	):
+		if overflow_policy not in (self.OVERFLOW_BLOCK, self.OVERFLOW_DROP):
+			raise ValueError("overflow_policy must be 'block' or 'drop'.")
+
+		self.pushbullet: PushbulletWrapper = pushbullet
+		self.queue_size: int = max(1, queue_size)
+		self.overflow_policy: str = overflow_policy
+		self.block_timeout: float | None = block_timeout
+		self.max_retries: int = max_retries
+		self.backoff_base: float = backoff_base
+		self.backoff_max: float = backoff_max
+		self.quota_reserve: int = max(0, quota_reserve)
+
+		self.__condition: threading.Condition = threading.Condition()
+		# 送信待ち((送信可能時刻, 連番, ジョブ))、ジョブは1リクエスト分
+		self.__heap: list[tuple[float, int, dict]] = []
+		self.__sequence: int = 0
+		# 送信待ち・送信中のジョブ数(キューの上限の判定用)
+		self.__pending_count: int = 0
+		# 残り回数がなくなった場合の送信再開時刻
+		self.__paused_until: float = 0.0
+		self.__quota: dict[str, int] = {}
+		# submittedは受け付けた送信予約の数、queued/sent/failed/droppedはジョブ(デバイス毎の1リクエスト)の数
+		# (queued = sent + failed + pending)
+		self.__stats: dict[str, int] = {
+			"submitted": 0, "queued": 0, "sent": 0, "failed": 0, "retries": 0, "dropped": 0, "throttled": 0
+		}
+		self.__closed: bool = False
+		# 直前のレスポンスのステータスコード(スレッド毎)
+		self.__local: threading.local = threading.local()
+
+		# セッションのレスポンスフックで全てのレスポンスヘッダーを確認する
+		self.pushbullet._session.hooks.setdefault("response", []).append(self.__on_response)
+
+		self.__threads: list[threading.Thread] = [
+			threading.Thread(target=self.__run, name="PushbulletDispatcher-" + str(_index), daemon=True)
+			for _index in range(max(1, workers))
+		]
+		for _thread in self.__threads:
+			_thread.start()
+
+	# with文対応
+	def __enter__(self) -> "PushbulletDispatcher":
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.close()
+		return False
+
+	# 送信予約(PushbulletWrapperの同名メソッドと同じ引数、結果はFutureで受け取る)
+	def push_note(self, title: str, body: str, **kwargs) -> Future:
+		return self.submit(method_name="push_note", arguments=dict(kwargs, title=title, body=body))
+
+	def push_link(self, title: str, url: str, **kwargs) -> Future:
+		return self.submit(method_name="push_link", arguments=dict(kwargs, title=title, url=url))
+
+	def push_file(self, file_name: str, file_url: str, file_type: str, **kwargs) -> Future:
+		return self.submit(
+			method_name="push_file",
+			arguments=dict(kwargs, file_name=file_name, file_url=file_url, file_type=file_type)
+		)
+
+	# 送信予約(抽出したデバイスが複数ある場合はデバイス毎のジョブに分ける)
+	# Futureの結果はデバイス毎の{"device", "result", "error"}のリスト
+	def submit(self, method_name: str, arguments: dict[str, Any]) -> Future:
+		_future: Future = Future()
+		_arguments: dict[str, Any] = dict(arguments)
+		_only_target: bool = _arguments.pop("only_target", True)
+		for _name in ("catch_exception", "output_trace"):
+			_arguments.pop(_name, None)
+
+		if _only_target and len(self.pushbullet.target_devices) > 0:
+			_devices: list = list(self.pushbullet.target_devices)
+		else:
+			_devices = [_arguments.get("device")]
+		_arguments.pop("device", None)
+
+		_results: list[dict[str, Any]] = [{"device": _device, "result": None, "error": None} for _device in _devices]
+		_group: dict[str, Any] = {"future": _future, "results": _results, "remaining": len(_results)}
+
+		with self.__condition:
+			if self.__closed:
+				_future.set_exception(RuntimeError("PushbulletDispatcher is closed."))
+				return _future
+
+			# キューが一杯の場合
+			_deadline: float | None = None
+			if self.block_timeout is not None:
+				_deadline = time.monotonic() + self.block_timeout
+			while self.__pending_count + len(_devices) > max(self.queue_size, len(_devices)):
+				_timeout: float | None = None
+				if _deadline is not None:
+					_timeout = _deadline - time.monotonic()
+				if (self.overflow_policy == self.OVERFLOW_DROP) or ((_timeout is not None) and (_timeout <= 0)):
+					self.__stats["dropped"] += len(_devices)
+					_future.set_exception(queue.Full("PushbulletDispatcher queue is full."))
+					return _future
+				self.__condition.wait(timeout=_timeout)
+				if self.__closed:
+					_future.set_exception(RuntimeError("PushbulletDispatcher is closed."))
+					return _future
+
+			_now: float = time.monotonic()
+			for _result in _results:
+				self.__push_job(
+					job={
+						"method_name": method_name,
+						"arguments": _arguments,
+						"result": _result,
+						"group": _group,
+						"attempts": 0
+					},
+					ready_time=_now
+				)
+			self.__pending_count += len(_results)
+			self.__stats["submitted"] += 1
+			self.__stats["queued"] += len(_results)
+			self.__condition.notify_all()
+		return _future
+
+	# 停止(wait=Trueの場合は送信待ちを全て処理してから停止)
+	def close(self, wait: bool = True) -> None:
+		with self.__condition:
+			self.__closed = True
+			if not wait:
+				for _ready_time, _, _job in self.__heap:
+					self.__finish(job=_job, error=RuntimeError("PushbulletDispatcher is closed."))
+				self.__pending_count -= len(self.__heap)
+				self.__stats["failed"] += len(self.__heap)
+				self.__heap = []
+			self.__condition.notify_all()
+		for _thread in self.__threads:
+			if _thread is not threading.current_thread():
+				_thread.join()
+		try:
+			self.pushbullet._session.hooks["response"].remove(self.__on_response)
+		except (KeyError, ValueError):
+			pass
+
+	# アカウントの残り回数(最後に受信したヘッダーの値)
+	def get_quota(self) -> dict[str, int]:
+		with self.__condition:
+			return dict(self.__quota)
+
+	# 送信件数等の統計(pendingは送信待ち・送信中のジョブ数)
+	def get_stats(self) -> dict[str, int]:
+		with self.__condition:
+			_stats: dict[str, int] = dict(self.__stats)
+			_stats["pending"] = self.__pending_count
+			return _stats
+
+	def __push_job(self, job: dict, ready_time: float) -> None:
+		self.__sequence += 1
+		heapq.heappush(self.__heap, (ready_time, self.__sequence, job))
+
+	# 送信スレッド
+	def __run(self) -> None:
+		while True:
+			with self.__condition:
+				while True:
+					if len(self.__heap) == 0:
+						if self.__closed:
+							return
+						self.__condition.wait()
+						continue
+					_ready_time: float = max(self.__heap[0][0], self.__paused_until)
+					_wait_time: float = _ready_time - time.monotonic()
+					if _wait_time > 0:
+						self.__condition.wait(timeout=_wait_time)
+						continue
+					_, _, _job = heapq.heappop(self.__heap)
+					break
+
+			self.__send(job=_job)
+
+	# 1リクエスト送信
+	def __send(self, job: dict) -> None:
+		_arguments: dict[str, Any] = dict(job["arguments"], device=job["result"]["device"])
+		self.__local.status_code = None
+		try:
+			# 抽出・再送はディスパッチャで行うため、ライブラリのメソッドを直接呼ぶ
+			_response: dict = getattr(Pushbullet, job["method_name"])(self.pushbullet, **_arguments)
+		except Exception as e:
+			_status_code: int | None = self.__local.status_code
+			_retry: bool = isinstance(e, RequestException) or (_status_code in self.RETRY_STATUS_CODES)
+			if _retry and (job["attempts"] < self.max_retries):
+				with self.__condition:
+					self.__stats["retries"] += 1
+					job["attempts"] += 1
+					self.__push_job(job=job, ready_time=time.monotonic() + self.__get_retry_delay(job["attempts"] - 1))
+					self.__condition.notify()
+				return
+			with self.__condition:
+				self.__stats["failed"] += 1
+				self.__pending_count -= 1
+				self.__condition.notify_all()
+			self.__finish(job=job, error=e)
+			return
+
+		with self.__condition:
+			self.__stats["sent"] += 1
+			self.__pending_count -= 1
+			self.__condition.notify_all()
+		self.__finish(job=job, response=_response)
+
+	# ジョブの結果を記録し、同じ送信予約のジョブが全て終わったらFutureに結果を設定
+	def __finish(self, job: dict, response: dict | None = None, error: BaseException | None = None) -> None:
+		job["result"]["result"] = response
+		job["result"]["error"] = error
+		_group: dict[str, Any] = job["group"]
+		with self.__condition:
+			_group["remaining"] -= 1
+			_done: bool = _group["remaining"] == 0
+		if _done:
+			try:
+				_group["future"].set_result(_group["results"])
+			except InvalidStateError:
+				pass
+
+	# 全てのレスポンスのヘッダーから残り回数を記録(requestsのレスポンスフック)
+	def __on_response(self, response: Response, *args, **kwargs) -> Response:
+		self.__local.status_code = response.status_code
+		_quota: dict[str, int] = {}
+		for _key, _header in (
+				("limit", "X-Ratelimit-Limit"),
+				("remaining", "X-Ratelimit-Remaining"),
+				("reset", "X-Ratelimit-Reset")
+		):
+			_value: str | None = response.headers.get(_header)
+			if (_value is not None) and _value.strip().isdigit():
+				_quota[_key] = int(_value)
+		if len(_quota) > 0:
+			with self.__condition:
+				self.__quota.update(_quota)
+				# 残り回数がなくなったらリセット時刻まで全体の送信を止める
+				if ("remaining" in self.__quota) and ("reset" in self.__quota) and (
+						(self.__quota["remaining"] <= self.quota_reserve) or (response.status_code == 429)
+				):
+					self.__stats["throttled"] += 1
+					self.__paused_until = time.monotonic() + max(0.0, self.__quota["reset"] - time.time())
+		return response
+
+	# 再送までの待ち時間(指数バックオフ + ジッター)
+	def __get_retry_delay(self, attempts: int) -> float:
+		_delay: float = min(self.backoff_max, self.backoff_base * (2 ** attempts))
+		return _delay * random.uniform(0.5, 1.0)
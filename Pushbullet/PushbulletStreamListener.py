@@ -0,0 +1,240 @@
+# required packages:
+# pushbullet.py
+# websocket-client
+
+from PushbulletWrapper import PushbulletWrapper
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+import json
+import random
+import threading
+import traceback
+import websocket
+
+
+# Pushbulletのリアルタイムストリーム(WebSocket)で新しいpushを受け取る(get_pushesのポーリングの代わり)
+# tickleを受け取ったらmodified_afterで前回以降の差分のみ取得し、コールバックはワーカースレッドで実行する
+# 切断・ハートビート(nop)の途絶は指数バックオフ(ジッター付き)で再接続し、再接続時に切断中の差分も取得する
+# 例:
+#   with PushbulletStreamListener(pushbullet=PushbulletWrapper(api_key="..."), on_push=print):
+#       time.sleep(3600)
+class PushbulletStreamListener(object):
+	# ストリームURL(末尾にAPIキー)
+	STREAM_URL: str = "wss://stream.pushbullet.com/websocket/"
+
+	def __init__(
+			self,
+			pushbullet: PushbulletWrapper,
+			# 新しいpush(dict)毎に呼ばれる
+			on_push: Callable[[dict], Any] | None = None,
+			# ephemeral(type=push のメッセージ、SMS・通知のミラー等)毎に呼ばれる
+			on_ephemeral: Callable[[dict], Any] | None = None,
+			# 接続・同期のエラー毎に呼ばれる
+			on_error: Callable[[BaseException], Any] | None = None,
+			workers: int = 4,
+			# nopは約30秒毎に届くため、この時間何も受信しなければ切断とみなす
+			heartbeat_timeout: float = 60.0,
+			backoff_base: float = 1.0,
+			backoff_max: float = 60.0,
+			# 取得済みとみなすmodified(Noneの場合は開始時点の最新のpush以降)
+			modified_after: float | None = None,
+			stream_url: str | None = None,
+			output_trace: bool = True
+	):
+		self.pushbullet: PushbulletWrapper = pushbullet
+		self.on_push: Callable[[dict], Any] | None = on_push
+		self.on_ephemeral: Callable[[dict], Any] | None = on_ephemeral
+		self.on_error: Callable[[BaseException], Any] | None = on_error
+		self.workers: int = max(1, workers)
+		self.heartbeat_timeout: float = heartbeat_timeout
+		self.backoff_base: float = backoff_base
+		self.backoff_max: float = backoff_max
+		self.stream_url: str = (stream_url or self.STREAM_URL) + self.pushbullet.api_key
+		self.output_trace: bool = output_trace
+
+		# 差分取得の位置
+		self.cursor: float | None = modified_after
+		# cursorと同じmodifiedで取得済みのpush(同時刻のpushの重複除外用)
+		self.__cursor_idens: set[str] = set()
+		self.connected: bool = False
+
+		self.__lock: threading.Lock = threading.Lock()
+		self.__stop_event: threading.Event = threading.Event()
+		self.__websocket: websocket.WebSocket | None = None
+		self.__executor: ThreadPoolExecutor | None = None
+		self.__thread: threading.Thread | None = None
+		self.__stats: dict[str, int] = {
+			"connects": 0, "disconnects": 0, "messages": 0, "tickles": 0, "syncs": 0, "pushes": 0, "ephemerals": 0
+		}
+
+	# with文対応
+	def __enter__(self) -> "PushbulletStreamListener":
+		self.start()
+		return self
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.stop()
+		return False
+
+	# 受信開始(バックグラウンドスレッド)
+	def start(self) -> None:
+		if (self.__thread is not None) and self.__thread.is_alive():
+			return
+		self.__stop_event.clear()
+		self.__executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="PushbulletStreamListener")
+		self.__thread = threading.Thread(target=self.__run, name="PushbulletStreamListener", daemon=True)
+		self.__thread.start()
+
+	# 受信停止(実行中のコールバックは終わるまで待つ)
+	def stop(self) -> None:
+		self.__stop_event.set()
+		# 受信スレッドの接続の代入と排他にする(接続直後・代入前に停止された場合は受信スレッド側で閉じる)
+		with self.__lock:
+			_websocket: websocket.WebSocket | None = self.__websocket
+		if _websocket is not None:
+			try:
+				_websocket.abort()
+			except Exception:
+				pass
+		if (self.__thread is not None) and (self.__thread is not threading.current_thread()):
+			self.__thread.join()
+		self.__thread = None
+		if self.__executor is not None:
+			self.__executor.shutdown(wait=True)
+			self.__executor = None
+
+	# 受信件数等の統計
+	def get_stats(self) -> dict[str, int]:
+		with self.__lock:
+			return dict(self.__stats)
+
+	# 受信スレッド(切断されたら再接続)
+	def __run(self) -> None:
+		_attempts: int = 0
+		while not self.__stop_event.is_set():
+			try:
+				# 取得位置が未定の場合は現時点の最新のpushから
+				if self.cursor is None:
+					self.__initialize_cursor()
+
+				_websocket: websocket.WebSocket = websocket.create_connection(
+					self.stream_url,
+					timeout=self.heartbeat_timeout
+				)
+				# 接続中にstop()された場合はabort()の対象にならないため、ここで閉じて終了する
+				with self.__lock:
+					if self.__stop_event.is_set():
+						_websocket.abort()
+						_websocket.close()
+						break
+					self.__websocket = _websocket
+				self.connected = True
+				self.__count("connects")
+				_attempts = 0
+
+				# 切断中に届いた分を取得
+				self.__sync()
+
+				while not self.__stop_event.is_set():
+					_message: str = self.__websocket.recv()
+					if not _message:
+						# サーバーから切断された
+						break
+					self.__handle_message(message=_message)
+			except Exception as e:
+				if self.__stop_event.is_set():
+					break
+				self.__report_error(error=e)
+			finally:
+				self.connected = False
+				with self.__lock:
+					_websocket = self.__websocket
+					self.__websocket = None
+				if _websocket is not None:
+					try:
+						_websocket.close()
+					except Exception:
+						pass
+
+			if self.__stop_event.is_set():
+				break
+			self.__count("disconnects")
+			# 再接続まで待つ(指数バックオフ + ジッター)
+			_delay: float = min(self.backoff_max, self.backoff_base * (2 ** _attempts)) * random.uniform(0.5, 1.0)
+			_attempts += 1
+			self.__stop_event.wait(timeout=_delay)
+
+	# 受信メッセージの処理
+	def __handle_message(self, message: str) -> None:
+		self.__count("messages")
+		_json: dict = json.loads(message)
+		_type: str | None = _json.get("type")
+		if _type == "nop":
+			# ハートビート(受信したことでタイムアウトが延長される)
+			return
+		elif _type == "tickle":
+			self.__count("tickles")
+			if _json.get("subtype") == "push":
+				self.__sync()
+			elif _json.get("subtype") == "device":
+				self.pushbullet.refresh_devices(wait=False)
+		elif _type == "push":
+			self.__count("ephemerals")
+			if self.on_ephemeral is not None:
+				self.__submit(callback=self.on_ephemeral, argument=_json.get("push") or {})
+
+	# 開始時点の最新のpushのmodifiedを取得位置にする(pushがない場合は最初から)
+	def __initialize_cursor(self) -> None:
+		_pushes: list[dict] = self.pushbullet.get_pushes(limit=1, filter_inactive=False)
+		if len(_pushes) > 0:
+			self.cursor = _pushes[0].get("modified")
+			self.__cursor_idens = {_pushes[0].get("iden")}
+		else:
+			# 手元の時刻とサーバーの時刻がずれていると、直後に届いたpushを取りこぼすため、0から取得する
+			self.cursor = 0.0
+
+	# 前回以降の差分を取得してコールバックへ渡す
+	def __sync(self) -> None:
+		self.__count("syncs")
+		_pushes: list[dict] = self.pushbullet.get_pushes(modified_after=self.cursor)
+		# 古い順に処理
+		_pushes.sort(key=lambda _push: _push.get("modified", 0))
+		for _push in _pushes:
+			_modified: float = _push.get("modified", 0)
+			if (_modified < self.cursor) or ((_modified == self.cursor) and (_push.get("iden") in self.__cursor_idens)):
+				continue
+			if _modified > self.cursor:
+				self.cursor = _modified
+				self.__cursor_idens = set()
+			self.__cursor_idens.add(_push.get("iden"))
+
+			self.__count("pushes")
+			if self.on_push is not None:
+				self.__submit(callback=self.on_push, argument=_push)
+
+	# コールバックをワーカースレッドで実行
+	def __submit(self, callback: Callable[[dict], Any], argument: dict) -> None:
+		if self.__executor is not None:
+			self.__executor.submit(self.__run_callback, callback, argument)
+
+	def __run_callback(self, callback: Callable[[dict], Any], argument: dict) -> None:
+		try:
+			callback(argument)
+		except Exception:
+			if self.output_trace:
+				# トレースを出力
+				traceback.print_exc()
+
+	def __report_error(self, error: BaseException) -> None:
+		if self.output_trace:
+			# トレースを出力
+			traceback.print_exception(error)
+		if self.on_error is not None:
+			try:
+				self.on_error(error)
+			except Exception:
+				traceback.print_exc()
+
+	def __count(self, name: str) -> None:
+		with self.__lock:
+			self.__stats[name] += 1
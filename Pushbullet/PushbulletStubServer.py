@@ -0,0 +1,329 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import base64
+import json
+import random
+import threading
+import time
+import uuid
+
+
+# Pushbullet APIを模したローカルサーバ(ベンチマーク・試験用)
+# デバイス・push・ファイルのアップロードのエンドポイントと、アカウント毎の送信回数の上限(X-Ratelimit-*ヘッダー)、
+# 各種エラー(401/400/429/500)を再現する
+# 例:
+#   with PushbulletStubServer(device_nicknames=["phone", "tablet"]) as server:
+#       pushbullet = PushbulletWrapper(api_key="stub", api_base_url=server.api_base_url, use_device_cache=False)
+class PushbulletStubServer(object):
+	# APIのパス
+	API_PATH: str = "/v2"
+	UPLOAD_PATH: str = "/upload"
+
+	# コンストラクタ(port=0で空きポートを自動割り当て)
+	def __init__(
+			self,
+			host: str = "127.0.0.1",
+			port: int = 0,
+			device_nicknames: list[str] | None = None,
+			# アカウント毎のpush回数の上限(rate_limit_window秒毎にリセット)
+			rate_limit: int = 10000,
+			rate_limit_window: float = 3600.0,
+			# 500エラーを返す確率
+			error_rate: float = 0.0,
+			# 応答までの遅延(秒)
+			latency: float = 0.0,
+			# 401を返すAPIキー(Noneなら全て有効)
+			valid_api_keys: set[str] | None = None,
+			# GET /pushesで返すために保持するpushの件数
+			max_stored_pushes: int = 1000
+	):
+		_stub: PushbulletStubServer = self
+
+		# リクエスト処理
+		class _RequestHandler(BaseHTTPRequestHandler):
+			# keep-aliveを有効にする
+			protocol_version: str = "HTTP/1.1"
+			# ヘッダーと本文の書き込みが分かれるため、Nagleによる遅延を避ける
+			disable_nagle_algorithm: bool = True
+
+			def do_GET(self) -> None:
+				_path: str = urlsplit(self.path).path
+				_api_key: str | None = self.__authenticate()
+				if _api_key is None:
+					return
+
+				if _path == _stub.API_PATH + "/devices":
+					_stub.count(status=200)
+					self.__send_json(status=200, body={"devices": _stub.devices})
+				elif _path == _stub.API_PATH + "/users/me":
+					_stub.count(status=200)
+					self.__send_json(
+						status=200,
+						body={"iden": "stub-user", "email": "stub@example.com", "name": "stub", "active": True}
+					)
+				elif _path == _stub.API_PATH + "/chats":
+					_stub.count(status=200)
+					self.__send_json(status=200, body={"chats": []})
+				elif _path == _stub.API_PATH + "/channels":
+					_stub.count(status=200)
+					self.__send_json(status=200, body={"channels": []})
+				elif _path == _stub.API_PATH + "/pushes":
+					_query: dict[str, list[str]] = parse_qs(urlsplit(self.path).query)
+					_stub.count(status=200)
+					self.__send_json(
+						status=200,
+						body={
+							"pushes": _stub.get_pushes(
+								modified_after=float((_query.get("modified_after") or ["0"])[0] or 0),
+								limit=int((_query.get("limit") or ["0"])[0] or 0)
+							)
+						}
+					)
+				else:
+					self.__send_error(status=404, message="Not Found")
+
+			def do_POST(self) -> None:
+				_path: str = urlsplit(self.path).path
+				_body: bytes = self.__read_body()
+
+				# アップロード先(APIキー不要)
+				if _path.startswith(_stub.UPLOAD_PATH + "/"):
+					if _stub.latency > 0:
+						time.sleep(_stub.latency)
+					_stub.count(status=204)
+					_stub.add_uploaded_bytes(len(_body))
+					self.send_response(204)
+					self.send_header("Content-Length", "0")
+					self.end_headers()
+					return
+
+				_api_key: str | None = self.__authenticate()
+				if _api_key is None:
+					return
+				try:
+					_data: dict = json.loads(_body.decode("utf-8") or "{}")
+				except ValueError:
+					_stub.count(status=400)
+					self.__send_error(status=400, message="Invalid JSON")
+					return
+
+				if _path == _stub.API_PATH + "/pushes":
+					self.__handle_push(api_key=_api_key, data=_data)
+				elif _path == _stub.API_PATH + "/upload-request":
+					if not _data.get("file_name"):
+						_stub.count(status=400)
+						self.__send_error(status=400, message="Missing file_name")
+						return
+					_id: str = uuid.uuid4().hex
+					_host, _port = self.server.server_address[:2]
+					_stub.count(status=200)
+					self.__send_json(
+						status=200,
+						body={
+							"file_name": _data["file_name"],
+							"file_type": _data.get("file_type") or "application/octet-stream",
+							"file_url": "http://%s:%d/files/%s/%s" % (_host, _port, _id, _data["file_name"]),
+							"upload_url": "http://%s:%d%s/%s" % (_host, _port, _stub.UPLOAD_PATH, _id),
+							"data": {}
+						}
+					)
+				else:
+					self.__send_error(status=404, message="Not Found")
+
+			# push(上限・エラーの判定)
+			def __handle_push(self, api_key: str, data: dict) -> None:
+				if data.get("type") not in ("note", "link", "file"):
+					_stub.count(status=400)
+					self.__send_error(status=400, message="Invalid push type")
+					return
+
+				_quota: dict[str, float] = _stub.consume(api_key=api_key)
+				_headers: dict[str, str] = {
+					"X-Ratelimit-Limit": str(_stub.rate_limit),
+					"X-Ratelimit-Remaining": str(int(_quota["remaining"])),
+					"X-Ratelimit-Reset": str(int(_quota["reset"]))
+				}
+				if not _quota["accepted"]:
+					_stub.count(status=429)
+					self.__send_error(status=429, message="Too Many Requests", headers=_headers)
+					return
+
+				if (_stub.error_rate > 0) and (random.random() < _stub.error_rate):
+					_stub.count(status=500)
+					self.__send_error(status=500, message="Internal Server Error", headers=_headers)
+					return
+
+				_stub.count(status=200)
+				self.__send_json(status=200, body=_stub.add_push(data=data), headers=_headers)
+
+			# 認証(Basic認証またはAccess-Tokenヘッダー、失敗した場合は401を返してNone)
+			def __authenticate(self) -> str | None:
+				if _stub.latency > 0:
+					time.sleep(_stub.latency)
+
+				_api_key: str = self.headers.get("Access-Token", "")
+				_authorization: str = self.headers.get("Authorization", "")
+				if (_api_key == "") and _authorization.startswith("Basic "):
+					try:
+						_api_key = base64.b64decode(_authorization[len("Basic "):]).decode("utf-8").split(":", 1)[0]
+					except ValueError:
+						_api_key = ""
+				if (_api_key == "") or ((_stub.valid_api_keys is not None) and (_api_key not in _stub.valid_api_keys)):
+					_stub.count(status=401)
+					self.__send_error(status=401, message="Access token is missing or invalid.")
+					return None
+				return _api_key
+
+			# 本文の読み込み(Content-Lengthまたはchunked)
+			def __read_body(self) -> bytes:
+				if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+					_chunks: list[bytes] = []
+					while True:
+						_size: int = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+						if _size == 0:
+							# 終端の空行(トレーラーは無視)
+							while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+								pass
+							break
+						_chunks.append(self.rfile.read(_size))
+						self.rfile.readline()
+					return b"".join(_chunks)
+				_length: int = int(self.headers.get("Content-Length", "0"))
+				return self.rfile.read(_length) if _length > 0 else b""
+
+			def __send_error(self, status: int, message: str, headers: dict[str, str] | None = None) -> None:
+				self.__send_json(status=status, body={"error": {"code": str(status), "message": message}}, headers=headers)
+
+			def __send_json(self, status: int, body: dict, headers: dict[str, str] | None = None) -> None:
+				_data: bytes = json.dumps(body).encode("utf-8")
+				self.send_response(status)
+				self.send_header("Content-Type", "application/json; charset=utf-8")
+				self.send_header("Content-Length", str(len(_data)))
+				for _name, _value in (headers or {}).items():
+					self.send_header(_name, _value)
+				self.end_headers()
+				self.wfile.write(_data)
+
+			# アクセスログは出力しない
+			def log_message(self, format: str, *args) -> None:
+				return
+
+		self.rate_limit: int = rate_limit
+		self.rate_limit_window: float = rate_limit_window
+		self.error_rate: float = error_rate
+		self.latency: float = latency
+		self.valid_api_keys: set[str] | None = valid_api_keys
+		self.max_stored_pushes: int = max_stored_pushes
+		_now: float = time.time()
+		self.devices: list[dict] = [
+			{
+				"iden": "stub-device-" + str(_index),
+				"nickname": _nickname,
+				"active": True,
+				"pushable": True,
+				"created": _now,
+				"modified": _now,
+				"manufacturer": "stub",
+				"model": "stub",
+				"icon": "phone"
+			}
+			for _index, _nickname in enumerate(device_nicknames or ["stub-device"])
+		]
+
+		self.__lock: threading.Lock = threading.Lock()
+		# 受信したリクエスト数(ステータスコード別)
+		self.request_count: int = 0
+		self.status_counts: dict[int, int] = {}
+		self.uploaded_bytes: int = 0
+		# APIキー -> [残り回数, リセット時刻]
+		self.__quotas: dict[str, list] = {}
+		# 受け付けたpush(新しい順)
+		self.__pushes: list[dict] = []
+
+		self.__server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), _RequestHandler)
+		self.__server.daemon_threads = True
+		self.__thread: threading.Thread | None = None
+
+	# APIのURL(PushbulletWrapper(api_base_url=...)に渡す)
+	@property
+	def api_base_url(self) -> str:
+		_host, _port = self.__server.server_address[:2]
+		return "http://%s:%d%s" % (_host, _port, self.API_PATH)
+
+	# バックグラウンドで起動
+	def start(self) -> "PushbulletStubServer":
+		self.__thread = threading.Thread(target=self.__server.serve_forever, name="PushbulletStubServer", daemon=True)
+		self.__thread.start()
+		return self
+
+	# 停止
+	def stop(self) -> None:
+		self.__server.shutdown()
+		self.__server.server_close()
+		if self.__thread is not None:
+			self.__thread.join()
+			self.__thread = None
+
+	# with文対応
+	def __enter__(self) -> "PushbulletStubServer":
+		return self.start()
+
+	def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+		self.stop()
+		return False
+
+	# ステータスコード別に集計
+	def count(self, status: int) -> None:
+		with self.__lock:
+			self.request_count += 1
+			self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+	def add_uploaded_bytes(self, size: int) -> None:
+		with self.__lock:
+			self.uploaded_bytes += size
+
+	# 送信回数を1回消費(上限に達していればaccepted=False)
+	def consume(self, api_key: str) -> dict[str, float]:
+		_now: float = time.time()
+		with self.__lock:
+			_quota: list | None = self.__quotas.get(api_key)
+			if (_quota is None) or (_quota[1] <= _now):
+				_quota = [self.rate_limit, _now + self.rate_limit_window]
+				self.__quotas[api_key] = _quota
+			_accepted: bool = _quota[0] > 0
+			if _accepted:
+				_quota[0] -= 1
+			return {"accepted": _accepted, "remaining": _quota[0], "reset": _quota[1]}
+
+	# pushを記録して、APIと同じ形式のpushを返す
+	def add_push(self, data: dict) -> dict:
+		_now: float = time.time()
+		_push: dict = dict(
+			data,
+			iden=uuid.uuid4().hex,
+			active=True,
+			dismissed=False,
+			direction="self",
+			sender_iden="stub-user",
+			created=_now,
+			modified=_now
+		)
+		with self.__lock:
+			self.__pushes.insert(0, _push)
+			del self.__pushes[self.max_stored_pushes:]
+		return _push
+
+	# 記録したpush(新しい順、modified_afterより後のもののみ)
+	def get_pushes(self, modified_after: float = 0.0, limit: int = 0) -> list[dict]:
+		with self.__lock:
+			_pushes: list[dict] = [_push for _push in self.__pushes if _push["modified"] > modified_after]
+		return _pushes[:limit] if limit > 0 else _pushes
+
+	# 集計と送信回数をリセット
+	def reset(self) -> None:
+		with self.__lock:
+			self.request_count = 0
+			self.status_counts = {}
+			self.uploaded_bytes = 0
+			self.__quotas = {}
+			self.__pushes = []
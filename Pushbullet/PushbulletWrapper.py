@@ -3,29 +3,212 @@
 
 from pushbullet import Pushbullet
 from pushbullet import Device
-from typing import BinaryIO
+from pushbullet import PushbulletError
+from pushbullet.filetype import get_file_type
+from requests import Session, RequestException
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, BinaryIO, Callable, ClassVar, Iterator
 import traceback
 from dataclasses import dataclass
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+
+
+# multipart/form-dataの本文をファイルから少しずつ読み出すストリーム
+# (ファイル全体をメモリに読み込まずにアップロードするため、requestsのdataに渡して使う)
+# LineNotify/LineNotify.pyのMultipartFileStreamと同じ形式(各ディレクトリを単体で使えるよう共有しない)
+# 本文の組み立て・read()を修正する場合は両方を合わせること
+class MultipartUploadStream(object):
+	def __init__(
+			self,
+			fields: dict[str, str],
+			f: BinaryIO,
+			file_name: str,
+			file_type: str,
+			chunk_size: int = 1024 * 1024,
+			# 進捗(送信済みのファイルのバイト数, ファイルサイズ)
+			progress_callback: Callable[[int, int], None] | None = None
+	):
+		self.boundary: str = uuid.uuid4().hex
+		self.content_type: str = "multipart/form-data; boundary=" + self.boundary
+		self.chunk_size: int = chunk_size
+		self.progress_callback: Callable[[int, int], None] | None = progress_callback
+
+		# ファイルの現在位置から末尾までを送信
+		self.__file: BinaryIO = f
+		self.__file_start: int = f.tell()
+		f.seek(0, os.SEEK_END)
+		self.file_size: int = f.tell() - self.__file_start
+		f.seek(self.__file_start)
+
+		_parts: list[bytes] = []
+		for _name, _value in fields.items():
+			_parts.append(
+				(
+					"--%s\r\n"
+					"Content-Disposition: form-data; name=\"%s\"\r\n\r\n"
+					"%s\r\n" % (self.boundary, _name, _value)
+				).encode("utf-8")
+			)
+		_parts.append(
+			(
+				"--%s\r\n"
+				"Content-Disposition: form-data; name=\"file\"; filename=\"%s\"\r\n"
+				"Content-Type: %s\r\n\r\n" % (self.boundary, file_name, file_type)
+			).encode("utf-8")
+		)
+		self.__head: bytes = b"".join(_parts)
+		self.__tail: bytes = ("\r\n--%s--\r\n" % self.boundary).encode("utf-8")
+		self.__sent: int = 0
+		self.__stage: int = 0
+		self.__buffer: bytes = b""
+
+	# Content-Lengthの計算用
+	def __len__(self) -> int:
+		return len(self.__head) + self.file_size + len(self.__tail)
+
+	def __iter__(self) -> Iterator[bytes]:
+		while True:
+			_chunk: bytes = self.read(self.chunk_size)
+			if len(_chunk) == 0:
+				return
+			yield _chunk
+
+	# 最初から送り直す(再送用)
+	def rewind(self) -> None:
+		self.__file.seek(self.__file_start)
+		self.__sent = 0
+		self.__stage = 0
+		self.__buffer = b""
+
+	# size分読み込み(ヘッダー→ファイル→終端の順)
+	def read(self, size: int = -1) -> bytes:
+		if (size is None) or (size < 0):
+			size = len(self)
+		_data: bytes = self.__buffer
+		self.__buffer = b""
+		while len(_data) < size:
+			_chunk: bytes = self.__next_chunk()
+			if len(_chunk) == 0:
+				break
+			_data += _chunk
+		if len(_data) > size:
+			self.__buffer = _data[size:]
+			_data = _data[:size]
+		return _data
+
+	def __next_chunk(self) -> bytes:
+		if self.__stage == 0:
+			self.__stage = 1
+			return self.__head
+		elif self.__stage == 1:
+			_chunk: bytes = self.__file.read(min(self.chunk_size, self.file_size - self.__sent))
+			if len(_chunk) > 0:
+				self.__sent += len(_chunk)
+				if self.progress_callback is not None:
+					self.progress_callback(self.__sent, self.file_size)
+				return _chunk
+			self.__stage = 2
+			return self.__tail
+		return b""
 
 
 @dataclass
 class PushbulletWrapper(Pushbullet):
+	# デバイス情報のうちキャッシュに保存する項目
+	__DEVICE_ATTRIBUTES: ClassVar[tuple[str, ...]] = (
+		"push_token", "app_version", "fingerprint", "created", "modified",
+		"active", "nickname", "generated_nickname", "manufacturer", "icon",
+		"model", "has_sms", "key_fingerprint"
+	)
+	# api_base_url指定時に差し替えるURL(親クラスの属性名 -> パス)
+	__API_PATHS: ClassVar[dict[str, str]] = {
+		"DEVICES_URL": "/devices",
+		"CHATS_URL": "/chats",
+		"CHANNELS_URL": "/channels",
+		"ME_URL": "/users/me",
+		"PUSH_URL": "/pushes",
+		"UPLOAD_REQUEST_URL": "/upload-request",
+		"EPHEMERALS_URL": "/ephemerals"
+	}
+
 	# コンストラクタ
 	def __init__(
 			self,
 			api_key: str,
-			target_device_nicknames: list[str] | None = None
+			target_device_nicknames: list[str] | None = None,
+			# デバイス一覧のキャッシュ(Noneの場合はユーザー毎のキャッシュディレクトリにAPIキーのハッシュ値で保存)
+			device_cache_path: str | None = None,
+			device_cache_ttl: float = 3600.0,
+			use_device_cache: bool = True,
+			# 通知対象の複数デバイスへの同時送信数(1の場合は順番に送信)・コネクションプールの大きさ
+			push_max_workers: int = 8,
+			pool_maxsize: int = 10,
+			# アップロード済みファイルのキャッシュ(ファイルのハッシュ値 -> file_url、Noneの場合はデバイス一覧と同じディレクトリ)
+			upload_cache_path: str | None = None,
+			# APIのURL(試験用のスタブサーバ等、Noneの場合は本番のAPI)
+			api_base_url: str | None = None
 	):
 		# 通知対象のデバイス名リストが指定されていない場合
 		if target_device_nicknames is None:
 			target_device_nicknames = []
 
-		# 親クラスのコンストラクタ実行
-		super().__init__(api_key=api_key)
+		# 親クラスのコンストラクタ内でAPIを呼ぶため、URLを先に差し替える
+		if api_base_url:
+			_base_url: str = api_base_url.rstrip("/")
+			for _name, _path in self.__API_PATHS.items():
+				setattr(self, _name, _base_url + _path)
+
+		# キャッシュはAPIキー(とAPIのURL)毎に分ける
+		_cache_key: str = hashlib.sha256((api_key + (api_base_url or "")).encode("utf-8")).hexdigest()[:16]
+
+		# 親クラスのコンストラクタ内で_load_devicesが呼ばれるため、先に初期化する
+		self.use_device_cache: bool = use_device_cache
+		self.device_cache_ttl: float = device_cache_ttl
+		self.device_cache_path: str = device_cache_path or os.path.join(
+			self.__get_cache_dir(),
+			"pushbullet_devices_" + _cache_key + ".json"
+		)
+		self.upload_cache_path: str = upload_cache_path or os.path.join(
+			self.__get_cache_dir(),
+			"pushbullet_uploads_" + _cache_key + ".json"
+		)
+		# ファイルのハッシュ値 -> アップロード結果(初回のsend_fileで読み込み)
+		self.__uploaded_files: dict[str, dict] | None = None
+		# 同じファイルの同時アップロードを防ぐためのハッシュ値毎のロック
+		self.__upload_locks: dict[str, threading.Lock] = {}
+		# nickname -> デバイス一覧
+		self.__devices_by_nickname: dict[str, list[Device]] = {}
+		self.__device_lock: threading.RLock = threading.RLock()
+		self.__refresh_thread: threading.Thread | None = None
+		# キャッシュから読み込んだ(APIで未確認の)デバイス一覧かどうか
+		self.__devices_from_cache: bool = False
+		self.__requested_nicknames: list[str] = []
 
 		# メンバ変数初期化
 		self.target_devices: list[Device] = []
 		self.target_device_nicknames: list[str] = []
+		self.push_max_workers: int = max(1, push_max_workers)
+		# 直前の送信結果(デバイス毎に{"device", "result", "error"})
+		self.last_push_results: list[dict[str, Any]] = []
+		self.__executor: ThreadPoolExecutor | None = None
+		self.__executor_lock: threading.Lock = threading.Lock()
+		self.__upload_session: Session | None = None
+
+		# 親クラスのコンストラクタ実行
+		super().__init__(api_key=api_key)
+
+		# 同時送信に備えてコネクションプールを広げる
+		_adapter: HTTPAdapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_maxsize, self.push_max_workers))
+		self._session.mount("https://", _adapter)
+		self._session.mount("http://", _adapter)
 
 		# 特定のデバイスを抽出
 		self.set_target_devices(target_device_nicknames=target_device_nicknames)
@@ -38,23 +221,182 @@ class PushbulletWrapper(Pushbullet):
 	):
 		# 強制リセットのフラグが立っている場合 または デバイス名の指定がない場合
 		if force_reset or (target_device_nicknames is None) or (len(target_device_nicknames) == 0):
+			self.__requested_nicknames = []
 			self.target_device_nicknames = []
 			self.target_devices = []
 			return
 
-		# 指定したnicknameに合致するデバイスのみ抽出
-		self.target_devices = list(
-			filter(
-				lambda device: device.nickname in self.target_device_nicknames,
-				self.devices
-			)
-		)
+		self.__requested_nicknames = list(target_device_nicknames)
+
+		# 指定したnicknameに合致するデバイスのみ抽出(nicknameの索引から取得)
+		_target_devices: list[Device] = []
+		_missing: bool = False
+		with self.__device_lock:
+			for _nickname in dict.fromkeys(target_device_nicknames):
+				_devices: list[Device] | None = self.__devices_by_nickname.get(_nickname)
+				if _devices is None:
+					_missing = True
+					continue
+				_target_devices.extend(_devices)
+		self.target_devices = _target_devices
 
 		# 抽出成功したデバイス名を改めて記録
 		self.target_device_nicknames = []
 		for target_device in self.target_devices:
 			self.target_device_nicknames.append(target_device.nickname)
 
+		# キャッシュにないデバイスは追加された可能性があるため、バックグラウンドで更新
+		if _missing and self.__devices_from_cache:
+			self.refresh_devices(wait=False)
+
+	# nicknameからデバイス取得(索引から取得)
+	def get_device(self, nickname: str) -> Device:
+		with self.__device_lock:
+			_devices: list[Device] | None = self.__devices_by_nickname.get(nickname)
+		if not _devices:
+			raise PushbulletError('No device found with nickname "{}"'.format(nickname))
+		return _devices[0]
+
+	# デバイス一覧をAPIから取得し直す(wait=Falseの場合はバックグラウンドで実行)
+	def refresh_devices(self, wait: bool = True) -> None:
+		if wait:
+			self.__fetch_devices()
+			return
+
+		with self.__device_lock:
+			if (self.__refresh_thread is not None) and self.__refresh_thread.is_alive():
+				return
+			self.__refresh_thread = threading.Thread(
+				target=self.__refresh_devices_in_background,
+				name="PushbulletWrapper-refresh-devices",
+				daemon=True
+			)
+			self.__refresh_thread.start()
+
+	# デバイス一覧の読み込み(親クラスのメソッドを上書き)
+	# 有効期限内のキャッシュがあればAPIを呼ばない。期限切れのキャッシュは使いつつバックグラウンドで更新
+	def _load_devices(self) -> None:
+		if self.use_device_cache:
+			_cache: dict | None = self.__read_device_cache()
+			if _cache is not None:
+				self.__set_devices(
+					devices=[Device(self, _device_info) for _device_info in _cache.get("devices", [])],
+					from_cache=True
+				)
+				if time.time() - _cache.get("saved_at", 0.0) > self.device_cache_ttl:
+					self.refresh_devices(wait=False)
+				return
+
+		self.__fetch_devices()
+
+	# デバイスの追加・編集・削除後は索引とキャッシュを更新
+	def new_device(self, nickname, manufacturer=None, model=None, icon="system"):
+		_device: Device = super().new_device(nickname, manufacturer=manufacturer, model=model, icon=icon)
+		self.__set_devices(devices=self.devices, from_cache=self.__devices_from_cache)
+		return _device
+
+	def edit_device(self, device, nickname=None, model=None, manufacturer=None, icon=None):
+		_device: Device = super().edit_device(
+			device, nickname=nickname, model=model, manufacturer=manufacturer, icon=icon
+		)
+		self.__set_devices(devices=self.devices, from_cache=self.__devices_from_cache)
+		return _device
+
+	def remove_device(self, device):
+		super().remove_device(device)
+		self.__set_devices(devices=self.devices, from_cache=self.__devices_from_cache)
+
+	# APIからデバイス一覧を取得してキャッシュに保存
+	def __fetch_devices(self) -> None:
+		_response: dict = self._get_data(self.DEVICES_URL)
+		_device_infos: list[dict] = [
+			_device_info for _device_info in _response.get("devices", []) if _device_info.get("active")
+		]
+		self.__set_devices(devices=[Device(self, _device_info) for _device_info in _device_infos], from_cache=False)
+
+	def __refresh_devices_in_background(self) -> None:
+		try:
+			self.__fetch_devices()
+		except Exception:
+			traceback.print_exc()
+			return
+		# 更新後のデバイス一覧で通知対象を抽出し直す
+		if len(self.__requested_nicknames) > 0:
+			self.set_target_devices(target_device_nicknames=self.__requested_nicknames)
+
+	# デバイス一覧と索引を差し替え
+	def __set_devices(self, devices: list[Device], from_cache: bool) -> None:
+		_devices_by_nickname: dict[str, list[Device]] = {}
+		for _device in devices:
+			_devices_by_nickname.setdefault(_device.nickname, []).append(_device)
+		with self.__device_lock:
+			self.devices = devices
+			self.__devices_by_nickname = _devices_by_nickname
+			self.__devices_from_cache = from_cache
+		if self.use_device_cache and (not from_cache):
+			self.__write_device_cache(devices=devices)
+
+	def __read_device_cache(self) -> dict | None:
+		try:
+			with open(self.device_cache_path, "r", encoding="utf-8") as _file:
+				_cache: dict = json.load(_file)
+		except (OSError, ValueError):
+			return None
+		if not isinstance(_cache, dict):
+			return None
+		return _cache
+
+	def __write_device_cache(self, devices: list[Device]) -> None:
+		_cache: dict = {
+			"saved_at": time.time(),
+			"devices": [
+				dict(
+					{"iden": _device.device_iden},
+					**{_name: getattr(_device, _name, None) for _name in self.__DEVICE_ATTRIBUTES}
+				)
+				for _device in devices
+			]
+		}
+		self.__write_cache_file(path=self.device_cache_path, data=_cache)
+
+	# キャッシュの保存先(ユーザー毎のディレクトリ、他のユーザーからは読めない)
+	@staticmethod
+	def __get_cache_dir() -> str:
+		_cache_dir: str = os.path.join(
+			os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+			"pushbullet"
+		)
+		try:
+			os.makedirs(_cache_dir, mode=0o700, exist_ok=True)
+		except OSError:
+			# ホームディレクトリに書き込めない場合は一時ディレクトリ(ファイル自体は0o600で作成)
+			return tempfile.gettempdir()
+		return _cache_dir
+
+	# 本人のみ読み書きできる一時ファイル(0o600、ランダムな名前)に書き込んでから置き換える
+	# (読み込み途中のファイルを参照させない・他のユーザーにキャッシュの内容を読ませない)
+	@staticmethod
+	def __write_cache_file(path: str, data: dict) -> None:
+		_temp_path: str | None = None
+		try:
+			_fd, _temp_path = tempfile.mkstemp(
+				prefix=os.path.basename(path) + ".",
+				suffix=".tmp",
+				dir=os.path.dirname(path) or "."
+			)
+			with os.fdopen(_fd, "w", encoding="utf-8") as _file:
+				json.dump(data, _file)
+			os.replace(_temp_path, path)
+			_temp_path = None
+		except OSError:
+			traceback.print_exc()
+		finally:
+			if _temp_path is not None:
+				try:
+					os.remove(_temp_path)
+				except OSError:
+					pass
+
 	# メソッド拡張(push_note)
 	def push_note(
 			self,
@@ -70,47 +412,14 @@ class PushbulletWrapper(Pushbullet):
 			catch_exception: bool = False,
 			output_trace: bool = True
 	):
-		if only_target and len(self.target_devices) > 0:
-			# 抽出したデバイスにのみ送信
-			for _target_device in self.target_devices:
-				try:
-					super().push_note(
-						title=title,
-						body=body,
-						device=_target_device,
-						chat=chat,
-						email=email,
-						channel=channel
-					)
-				except Exception as e:
-					if catch_exception:
-						# 例外をcatchする場合
-						if output_trace:
-							# トレースを出力
-							traceback.print_exc()
-					else:
-						# 例外をcatchしない場合はそのままraise
-						raise e
-		else:
-			# 全デバイスに送信
-			try:
-				super().push_note(
-					title=title,
-					body=body,
-					device=device,
-					chat=chat,
-					email=email,
-					channel=channel
-				)
-			except Exception as e:
-				if catch_exception:
-					# 例外をcatchする場合
-					if output_trace:
-						# トレースを出力
-						traceback.print_exc()
-				else:
-					# 例外をcatchしない場合はそのままraise
-					raise e
+		return self.__push(
+			push_function=super().push_note,
+			arguments={"title": title, "body": body, "chat": chat, "email": email, "channel": channel},
+			device=device,
+			only_target=only_target,
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
 
 	# メソッド拡張(push_link)
 	def push_link(
@@ -128,51 +437,19 @@ class PushbulletWrapper(Pushbullet):
 			catch_exception: bool = False,
 			output_trace: bool = True
 	):
-		if only_target and len(self.target_devices) > 0:
-			# 抽出したデバイスにのみ送信
-			for _target_device in self.target_devices:
-				try:
-					super().push_link(
-						title=title,
-						url=url,
-						body=body,
-						device=_target_device,
-						chat=chat,
-						email=email,
-						channel=channel
-					)
-				except Exception as e:
-					if catch_exception:
-						# 例外をcatchする場合
-						if output_trace:
-							# トレースを出力
-							traceback.print_exc()
-					else:
-						# 例外をcatchしない場合はそのままraise
-						raise e
-		else:
-			try:
-				# 全デバイスに送信
-				super().push_link(
-					title=title,
-					url=url,
-					body=body,
-					device=device,
-					chat=chat,
-					email=email,
-					channel=channel
-				)
-			except Exception as e:
-				if catch_exception:
-					# 例外をcatchする場合
-					if output_trace:
-						# トレースを出力
-						traceback.print_exc()
-				else:
-					# 例外をcatchしない場合はそのままraise
-					raise e
+		return self.__push(
+			push_function=super().push_link,
+			arguments={"title": title, "url": url, "body": body, "chat": chat, "email": email, "channel": channel},
+			device=device,
+			only_target=only_target,
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
 
 	# メソッド拡張(upload_file)
+	# ファイルはchunk_sizeずつ読み込みながら送信し(メモリ使用量はchunk_size程度)、進捗をprogress_callbackに通知する
+	# 通信エラー・5xxの場合は取得済みのアップロード先に最初から送り直す
+	# (アップロード先は途中からの再開に対応していないため、送信済みの位置からは再開できない)
 	def upload_file(
 			self,
 			f: BinaryIO,
@@ -181,10 +458,54 @@ class PushbulletWrapper(Pushbullet):
 			file_type: str | None = None,
 			# 独自追加
 			catch_exception: bool = False,
-			output_trace: bool = True
+			output_trace: bool = True,
+			progress_callback: Callable[[int, int], None] | None = None,
+			chunk_size: int = 1024 * 1024,
+			max_retries: int = 3,
+			upload_timeout: float = 600.0
 	):
 		try:
-			return super().upload_file(f=f, file_name=file_name, file_type=file_type)
+			if not file_type:
+				file_type = get_file_type(f, file_name)
+
+			# アップロード先の取得
+			_response = self._session.post(
+				self.UPLOAD_REQUEST_URL,
+				data=json.dumps({"file_name": file_name, "file_type": file_type})
+			)
+			if _response.status_code != 200:
+				raise PushbulletError(_response.text)
+			_upload_request: dict = _response.json()
+
+			_stream: MultipartUploadStream = MultipartUploadStream(
+				fields={_name: str(_value) for _name, _value in (_upload_request.get("data") or {}).items()},
+				f=f,
+				file_name=file_name,
+				file_type=file_type,
+				chunk_size=chunk_size,
+				progress_callback=progress_callback
+			)
+			for _attempt in range(max_retries + 1):
+				_stream.rewind()
+				try:
+					# アップロード先にはAPIキーを送らない(認証情報のない別セッション)
+					_upload_response = self.__get_upload_session().post(
+						_upload_request["upload_url"],
+						data=_stream,
+						headers={"Content-Type": _stream.content_type},
+						timeout=(10.0, upload_timeout)
+					)
+				except RequestException:
+					if _attempt >= max_retries:
+						raise
+				else:
+					if _upload_response.status_code < 400:
+						break
+					if (_upload_response.status_code < 500) or (_attempt >= max_retries):
+						raise PushbulletError("upload failed: " + str(_upload_response.status_code))
+				time.sleep(min(30.0, 2 ** _attempt) * random.uniform(0.5, 1.0))
+
+			return {"file_type": file_type, "file_url": _upload_request.get("file_url"), "file_name": file_name}
 		except Exception as e:
 			if catch_exception:
 				# 例外をcatchする場合
@@ -214,50 +535,272 @@ class PushbulletWrapper(Pushbullet):
 			catch_exception: bool = False,
 			output_trace: bool = True
 	):
-		if only_target and len(self.target_devices) > 0:
-			# 抽出したデバイスにのみ送信
-			for _target_device in self.target_devices:
-				try:
-					super().push_file(
-						file_name=file_name,
-						file_url=file_url,
-						file_type=file_type,
-						body=body,
-						title=title,
-						device=_target_device,
-						chat=chat,
-						email=email,
-						channel=channel
-					)
-				except Exception as e:
-					if catch_exception:
-						# 例外をcatchする場合
-						if output_trace:
-							# トレースを出力
-							traceback.print_exc()
-					else:
-						# 例外をcatchしない場合はそのままraise
-						raise e
-		else:
+		return self.__push(
+			push_function=super().push_file,
+			arguments={
+				"file_name": file_name,
+				"file_url": file_url,
+				"file_type": file_type,
+				"body": body,
+				"title": title,
+				"chat": chat,
+				"email": email,
+				"channel": channel
+			},
+			device=device,
+			only_target=only_target,
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
+
+	# ファイルを1度だけアップロードして複数の送信先に送信
+	# targetsはDevice・nickname・メールアドレス・Chat・Channel、またはpush_fileの送信先引数のdict
+	# (省略時は抽出したデバイス、抽出していなければ全デバイス)
+	# 同じ内容のファイルはハッシュ値でキャッシュしたfile_urlを使い回す
+	def send_file(
+			self,
+			file_path: str,
+			targets: list[Any] | None = None,
+			# 以下オプション
+			body: str | None = None,
+			title: str | None = None,
+			file_name: str | None = None,
+			file_type: str | None = None,
+			# 独自追加
+			catch_exception: bool = False,
+			output_trace: bool = True,
+			progress_callback: Callable[[int, int], None] | None = None
+	) -> list[dict[str, Any]]:
+		_file_name: str = file_name or os.path.basename(file_path)
+		_upload: dict | None = None
+		_upload_error: Exception | None = None
+		try:
+			_upload = self.__upload_file_once(
+				file_path=file_path,
+				file_name=_file_name,
+				file_type=file_type,
+				progress_callback=progress_callback
+			)
+		except Exception as e:
+			_upload_error = e
+
+		# 送信先
+		if targets is None:
+			targets = list(self.target_devices) if len(self.target_devices) > 0 else [None]
+		_recipients: list[dict[str, Any]] = []
+		_results: list[dict[str, Any]] = []
+		for _target in targets:
+			_result: dict[str, Any] = {"target": _target, "result": None, "error": _upload_error}
+			_results.append(_result)
+			if _upload_error is not None:
+				continue
 			try:
-				# 全デバイスに送信
-				super().push_file(
+				_recipients.append(self.__get_recipient(target=_target))
+			except Exception as e:
+				_result["error"] = e
+
+		# アップロード・送信先の解決に成功したものだけ送信
+		_pending: list[dict[str, Any]] = [_result for _result in _results if _result["error"] is None]
+		if len(_pending) > 0:
+			self.__run_pushes(
+				push_function=super().push_file,
+				arguments={
+					"file_name": _upload["file_name"],
+					"file_url": _upload["file_url"],
+					"file_type": _upload["file_type"],
+					"body": body,
+					"title": title
+				},
+				recipients=_recipients,
+				results=_pending,
+				catch_exception=True,
+				output_trace=False
+			)
+		self.last_push_results = _results
+
+		_errors: list[Exception] = [_result["error"] for _result in _results if _result["error"] is not None]
+		if len(_errors) > 0:
+			if catch_exception:
+				# 例外をcatchする場合
+				if output_trace:
+					# トレースを出力
+					for _error in dict.fromkeys(_errors):
+						traceback.print_exception(_error)
+			else:
+				# 例外をcatchしない場合は最初の例外をraise
+				raise _errors[0]
+
+		return _results
+
+	# アップロード(同じ内容のファイルはキャッシュから返す)
+	def __upload_file_once(
+			self,
+			file_path: str,
+			file_name: str,
+			file_type: str | None,
+			progress_callback: Callable[[int, int], None] | None
+	) -> dict:
+		# ファイルのハッシュ値
+		_hash = hashlib.sha256()
+		with open(file_path, "rb") as _file:
+			for _chunk in iter(lambda: _file.read(1024 * 1024), b""):
+				_hash.update(_chunk)
+		_key: str = _hash.hexdigest() + ":" + file_name
+
+		with self.__executor_lock:
+			if self.__uploaded_files is None:
+				self.__uploaded_files = self.__read_upload_cache()
+			_lock: threading.Lock = self.__upload_locks.setdefault(_key, threading.Lock())
+
+		with _lock:
+			_upload: dict | None = self.__uploaded_files.get(_key)
+			if (_upload is not None) and ((file_type is None) or (_upload.get("file_type") == file_type)):
+				return _upload
+
+			with open(file_path, "rb") as _file:
+				_upload = self.upload_file(
+					f=_file,
 					file_name=file_name,
-					file_url=file_url,
 					file_type=file_type,
-					body=body,
-					title=title,
-					device=device,
-					chat=chat,
-					email=email,
-					channel=channel
+					progress_callback=progress_callback
 				)
-			except Exception as e:
-				if catch_exception:
-					# 例外をcatchする場合
-					if output_trace:
-						# トレースを出力
-						traceback.print_exc()
-				else:
-					# 例外をcatchしない場合はそのままraise
-					raise e
+			with self.__executor_lock:
+				self.__uploaded_files[_key] = _upload
+				self.__write_upload_cache(uploaded_files=dict(self.__uploaded_files))
+			return _upload
+
+	# 送信先をpush_fileの引数に変換
+	def __get_recipient(self, target: Any) -> dict[str, Any]:
+		if (target is None) or isinstance(target, Device):
+			return {"device": target}
+		elif isinstance(target, dict):
+			return target
+		elif isinstance(target, str):
+			if "@" in target:
+				return {"email": target}
+			return {"device": self.get_device(nickname=target)}
+		elif hasattr(target, "channel_tag"):
+			return {"channel": target}
+		elif hasattr(target, "email"):
+			return {"chat": target}
+		raise PushbulletError("Invalid target: " + repr(target))
+
+	def __read_upload_cache(self) -> dict[str, dict]:
+		try:
+			with open(self.upload_cache_path, "r", encoding="utf-8") as _file:
+				_cache: dict = json.load(_file)
+		except (OSError, ValueError):
+			return {}
+		return _cache if isinstance(_cache, dict) else {}
+
+	# file_urlは知っていれば誰でも取得できるため、本人のみ読めるファイルに保存する
+	def __write_upload_cache(self, uploaded_files: dict[str, dict]) -> None:
+		self.__write_cache_file(path=self.upload_cache_path, data=uploaded_files)
+
+	# 同時送信用のスレッド・アップロード用のセッションを停止
+	def close(self) -> None:
+		with self.__executor_lock:
+			if self.__executor is not None:
+				self.__executor.shutdown(wait=True)
+				self.__executor = None
+			if self.__upload_session is not None:
+				self.__upload_session.close()
+				self.__upload_session = None
+
+	# 送信(抽出したデバイスが複数ある場合は同時に送信)
+	# 失敗したデバイスがあっても残りのデバイスには送信し、catch_exception=Falseの場合は最後に最初の例外をraise
+	def __push(
+			self,
+			push_function: Callable[..., dict],
+			arguments: dict[str, Any],
+			device: Device | None,
+			only_target: bool,
+			catch_exception: bool,
+			output_trace: bool
+	) -> list[dict[str, Any]]:
+		if only_target and len(self.target_devices) > 0:
+			# 抽出したデバイスにのみ送信
+			_devices: list[Device | None] = list(self.target_devices)
+		else:
+			# 全デバイスに送信
+			_devices = [device]
+
+		return self.__run_pushes(
+			push_function=push_function,
+			arguments=arguments,
+			recipients=[{"device": _device} for _device in _devices],
+			results=[{"device": _device, "result": None, "error": None} for _device in _devices],
+			catch_exception=catch_exception,
+			output_trace=output_trace
+		)
+
+	# 送信先毎に送信して結果をresultsに記録
+	def __run_pushes(
+			self,
+			push_function: Callable[..., dict],
+			arguments: dict[str, Any],
+			recipients: list[dict[str, Any]],
+			results: list[dict[str, Any]],
+			catch_exception: bool,
+			output_trace: bool
+	) -> list[dict[str, Any]]:
+		if (len(recipients) == 1) or (self.push_max_workers == 1):
+			for _recipient, _result in zip(recipients, results):
+				self.__push_one(push_function=push_function, arguments=arguments, recipient=_recipient, result=_result)
+		else:
+			_executor: ThreadPoolExecutor = self.__get_executor()
+			_futures: list[Future] = [
+				_executor.submit(
+					self.__push_one,
+					push_function=push_function,
+					arguments=arguments,
+					recipient=_recipient,
+					result=_result
+				)
+				for _recipient, _result in zip(recipients, results)
+			]
+			for _future in _futures:
+				_future.result()
+		self.last_push_results = results
+
+		_errors: list[Exception] = [_result["error"] for _result in results if _result["error"] is not None]
+		if len(_errors) > 0:
+			if catch_exception:
+				# 例外をcatchする場合
+				if output_trace:
+					# トレースを出力
+					for _error in _errors:
+						traceback.print_exception(_error)
+			else:
+				# 例外をcatchしない場合は最初の例外をraise
+				raise _errors[0]
+
+		return results
+
+	@staticmethod
+	def __push_one(
+			push_function: Callable[..., dict],
+			arguments: dict[str, Any],
+			recipient: dict[str, Any],
+			result: dict[str, Any]
+	) -> None:
+		try:
+			result["result"] = push_function(**recipient, **arguments)
+		except Exception as e:
+			result["error"] = e
+
+	# アップロード用のセッション取得(初回のみ生成)
+	def __get_upload_session(self) -> Session:
+		with self.__executor_lock:
+			if self.__upload_session is None:
+				self.__upload_session = Session()
+			return self.__upload_session
+
+	def __get_executor(self) -> ThreadPoolExecutor:
+		with self.__executor_lock:
+			if self.__executor is None:
+				self.__executor = ThreadPoolExecutor(
+					max_workers=self.push_max_workers,
+					thread_name_prefix="PushbulletWrapper-push"
+				)
+			return self.__executor